@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+Microbenchmark: word alignment (verify._align_words) on long phrases.
+Headless (no GUI / tesseract needed):
+    python benchmarks/bench_align.py
+"""
+import random
+import sys
+import time
+from difflib import SequenceMatcher
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from simpad_automation.core import verify  # noqa: E402
+
+WORDS = ("unable retrieve technical information device connect session participant "
+         "instructor heart rate volume message coughing battery error manual mode "
+         "standardized patient healthy activate quit").split()
+
+
+def _noisy(tokens, rnd):
+    """OCR-like damage: dropped letters, glued neighbours, a noise token."""
+    out = []
+    i = 0
+    while i < len(tokens):
+        w = tokens[i]
+        if len(w) > 4 and rnd.random() < 0.3:
+            k = rnd.randrange(1, len(w) - 1)
+            w = w[:k] + w[k + 1:]
+        if i + 1 < len(tokens) and rnd.random() < 0.1:
+            w += tokens[i + 1]
+            i += 1
+        out.append(w)
+        i += 1
+    out.insert(rnd.randrange(len(out) + 1), "x")
+    return out
+
+
+def _timeit(fn, n):
+    t0 = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - t0) / n * 1e6
+
+
+def main():
+    rnd = random.Random(7)
+    print("kernel: similarity of two words (us/call)")
+    a, b = "technicalinformation", "technical"
+    print(f"  SequenceMatcher.ratio   {_timeit(lambda: SequenceMatcher(None, a, b).ratio(), 20000):8.2f}")
+    print(f"  _lcs_len (uncached)      {_timeit(lambda: 2.0 * verify._lcs_len(a, b) / (len(a) + len(b)), 20000):8.2f}")
+    print(f"  _sim (cached)           {_timeit(lambda: verify._sim(a, b), 20000):8.2f}")
+
+    print("alignment (ms/call, cold cache per phrase length)")
+    for n_words in (5, 10, 20, 40, 80):
+        exp = [rnd.choice(WORDS) for _ in range(n_words)]
+        ocr = _noisy(exp, rnd)
+        verify._sim_lower.cache_clear()
+        cold = _timeit(lambda: verify._align_words(ocr, exp), 1) / 1000.0
+        warm = _timeit(lambda: verify._align_words(ocr, exp), 20) / 1000.0
+        ok, _ = verify._align_words(ocr, exp)
+        print(f"  {n_words:3d} words: cold {cold:8.2f}  warm {warm:8.2f}  ok={ok}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: OCR line -> phrase catalog lookup at 10k phrases.
+Trigram index + top-k alignment (core.catalog) vs. aligning the line against every phrase
+(what a compare_tokens loop does). Synthetic UI phrases with OCR-like noise
+(substituted glyphs, glued and broken words, stray tokens). Headless:
+    python benchmarks/bench_catalog.py [n_phrases]
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from simpad_automation.core.catalog import PhraseCatalog  # noqa: E402
+from simpad_automation.core.verify import (  # noqa: E402
+    _norm_word, _tokenize_expected, compare_tokens_batch,
+)
+
+WORDS = ("unable retrieve technical information device connect please heart rate blood pressure "
+         "oxygen saturation respiratory temperature session patient scenario manual mode healthy "
+         "standardized activate monitor settings network license battery charging update firmware "
+         "simulator volume voice sound breath pulse cardiac rhythm alarm limit default select confirm "
+         "cancel retry error warning failed connection timeout trend event log export import").split()
+STOP = ["to", "the", "of", "and", "is", "for"]
+
+
+def _phrases(n, rng):
+    out = {}
+    while len(out) < n:
+        k = rng.randint(2, 7)
+        words = [rng.choice(WORDS) if rng.random() > 0.25 else rng.choice(STOP) for _ in range(k)]
+        words[0] = rng.choice(WORDS)
+        out[f"p{len(out)}"] = " ".join(words).capitalize()
+    return out
+
+
+def _ocr_noise(phrase, rng):
+    toks = phrase.split()
+    noisy = []
+    for t in toks:
+        t = "".join(rng.choice("rnce") if (c.isalpha() and rng.random() < 0.06) else c for c in t)
+        noisy.append(t)
+    if len(noisy) > 2 and rng.random() < 0.3:            # glued words
+        i = rng.randrange(len(noisy) - 1)
+        noisy[i:i + 2] = [noisy[i] + noisy[i + 1]]
+    if rng.random() < 0.2:                               # broken word
+        i = rng.randrange(len(noisy))
+        if len(noisy[i]) > 5:
+            noisy[i:i + 1] = [noisy[i][:3], noisy[i][3:]]
+    if rng.random() < 0.2:                               # stray token
+        noisy.insert(0, rng.choice(["x", "ii", "-"]))
+    return " ".join(noisy)
+
+
+def _linear_best(text, cat):
+    """Same alignment and ranking as PhraseCatalog.match, but over every phrase (no index)."""
+    ocr = [w for w in (_norm_word(w) for w in _tokenize_expected(text)) if w]
+    hits = [cat._align(pid, ocr, 0.0, 0.62, 0.8) for pid in range(len(cat))]
+    best = max(hits, key=lambda h: (h.ok, round(h.score * h.coverage, 3)))
+    return best if best.ok else None
+
+
+def main(n=10_000, queries=300, linear_queries=10, seed=7):
+    rng = random.Random(seed)
+    phrases = _phrases(n, rng)
+    t0 = time.perf_counter()
+    cat = PhraseCatalog(phrases)
+    build_ms = (time.perf_counter() - t0) * 1000.0
+    keys = rng.sample(list(phrases), queries)
+    lines = [_ocr_noise(phrases[k], rng) for k in keys]
+
+    t0 = time.perf_counter()
+    hits = compare_tokens_batch(lines, cat, ok_ratio=0.8)
+    idx_ms = (time.perf_counter() - t0) * 1000.0 / queries
+    # a different phrase with the same text is as good as the source phrase
+    found = sum(1 for k, h in zip(keys, hits) if h is not None and cat.phrases[cat.keys.index(h.key)] == phrases[k])
+
+    t0 = time.perf_counter()
+    lin = [_linear_best(line, cat) for line in lines[:linear_queries]]
+    lin_ms = (time.perf_counter() - t0) * 1000.0 / linear_queries
+    agree = sum(1 for h, lh in zip(hits[:linear_queries], lin)
+                if (h is None and lh is None) or (h is not None and lh is not None and h.phrase == lh.phrase))
+
+    print(f"catalog: {len(cat)} phrases, index built in {build_ms:.0f} ms, {len(cat._postings)} trigrams")
+    print(f"indexed : {idx_ms:8.2f} ms/line  found {found}/{queries} ({100.0 * found / queries:.1f}%)")
+    print(f"linear  : {lin_ms:8.2f} ms/line  (first {linear_queries} lines; index agrees on {agree})")
+    print(f"speed-up: {lin_ms / max(1e-9, idx_ms):.0f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: import cost of the package (python -X importtime), one fresh interpreter per
+module, best of N runs. Fails (exit 1) if a module exceeds its budget (the facade:
+--budget-ms, the others: BUDGETS_MS x --slack) or pulls in a heavy dependency it is not
+allowed to - run on Linux CI, no GUI or tesseract needed:
+    python benchmarks/bench_import.py [--budget-ms 25] [--slack 1.0] [--runs 5]
+"""
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+FACADE = "simpad_automation"
+# module -> (budget ms, heavy modules it may load); about 2x a Linux CI measurement,
+# cv2 / numpy dominate where they are allowed. The facade's budget is --budget-ms.
+BUDGETS_MS = {
+    FACADE:                               (None, ()),
+    "simpad_automation.core.backend":     (40.0, ()),
+    "simpad_automation.core.workers":     (45.0, ()),
+    "simpad_automation.core.timeseries":  (220.0, ("numpy",)),
+    "simpad_automation.core.verify":      (330.0, ("cv2", "numpy")),
+    "simpad_automation.core.screens":     (300.0, ("cv2", "numpy")),
+    "simpad_automation.core.ocr":         (320.0, ("cv2", "numpy")),
+    "simpad_automation.core.reporter":    (90.0, ()),
+}
+MODULES = list(BUDGETS_MS)
+# never loaded by a module unless BUDGETS_MS allows it (never by `import simpad_automation`)
+HEAVY = ("cv2", "numpy", "pyautogui", "pytesseract", "win32gui", "PIL")
+
+
+def _importtime(stmt: str) -> Tuple[List[Tuple[int, str, int]], List[str]]:
+    """Run stmt in a fresh interpreter; returns ([(depth, module, cumulative us)], loaded heavy modules)."""
+    probe = f"{stmt}; import sys; print(','.join(m for m in {HEAVY!r} if m in sys.modules))"
+    env = dict(os.environ, PYTHONPATH=str(SRC))
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", probe],
+                         capture_output=True, text=True, env=env, check=True)
+    rows: List[Tuple[int, str, int]] = []
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self, total, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((depth, name.strip(), int(total)))
+    heavy = [m for m in out.stdout.strip().split(",") if m]
+    return rows, heavy
+
+
+def _children(rows: List[Tuple[int, str, int]], module: str) -> Tuple[int, List[Tuple[str, int]]]:
+    """Cumulative us of 'module' and its direct imports (importtime lists children first)."""
+    for i, (depth, name, total) in enumerate(rows):
+        if depth == 0 and name == module:
+            kids = []
+            for d, n, t in reversed(rows[:i]):
+                if d == 0:
+                    break
+                if d == 1:
+                    kids.append((n, t))
+            return total, kids
+    return 0, []
+
+
+def measure(module: str, runs: int) -> Tuple[float, List[Tuple[str, int]], List[str]]:
+    """Best-of-runs import time (ms), heaviest dependencies of that best run, heavy modules."""
+    best, deps, heavy = None, [], []
+    for _ in range(runs):
+        rows, heavy = _importtime(f"import {module}")
+        us, kids = _children(rows, module)
+        if best is None or us < best:
+            best, deps = us, sorted(kids, key=lambda x: -x[1])[:3]
+    return (best or 0) / 1000.0, deps, heavy
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--budget-ms", type=float, default=25.0, help="max import time of the facade")
+    ap.add_argument("--slack", type=float, default=1.0, help="multiplier for the per-module budgets (slow runners)")
+    ap.add_argument("--runs", type=int, default=5)
+    args = ap.parse_args(argv)
+
+    failed = False
+    print(f"{'module':40s} {'ms':>8s}  heaviest direct imports (ms)")
+    for mod in MODULES:
+        try:
+            ms, deps, heavy = measure(mod, args.runs)
+        except subprocess.CalledProcessError as e:
+            last = (e.stderr or "").strip().splitlines()[-1:] or ["?"]
+            print(f"{mod:40s} {'n/a':>8s}  not importable here: {last[0]}")
+            failed = failed or mod == FACADE
+            continue
+        print(f"{mod:40s} {ms:8.1f}  " + ", ".join(f"{n} {t / 1000:.1f}" for n, t in deps))
+        budget, allowed = BUDGETS_MS[mod]
+        budget = args.budget_ms if budget is None else budget * args.slack
+        if ms > budget:
+            print(f"[FAIL] {mod} import took {ms:.1f} ms > budget {budget:.1f} ms")
+            failed = True
+        extra = [m for m in heavy if m not in allowed]
+        if extra:
+            print(f"[FAIL] {mod} import loaded heavy modules: {', '.join(extra)}")
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
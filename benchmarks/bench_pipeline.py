@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: capture -> preprocess pipeline with and without the buffer pool (core.bufpool).
+Reports time, peak traced memory and output-buffer allocations per call, and the word
+count for the segmentation rows (rows are only comparable when they find the same words).
+Headless (synthetic ROI images, no tesseract):
+    python benchmarks/bench_pipeline.py
+"""
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from simpad_automation.core import bufpool, verify, wordseg  # noqa: E402
+from simpad_automation.core.inkbox import tighten  # noqa: E402
+
+try:  # digit pipeline needs the Windows GUI stack at import time on older trees
+    from simpad_automation.core import ocr  # noqa: E402
+except Exception as e:  # pragma: no cover
+    ocr = None
+    print(f"[INFO] ocr.py not importable here ({e.__class__.__name__}); digit pipeline skipped")
+
+
+def _roi(w, h, text, color=(80, 220, 80), scale=None, org=None):
+    img = np.full((h, w, 3), 30, np.uint8)
+    cv2.putText(img, text, org or (4, int(h * 0.75)), cv2.FONT_HERSHEY_SIMPLEX, scale or h / 40.0, color, 2)
+    return img
+
+# padded like the real ROIs in ui/controls.py (text uses part of the region only)
+_PHRASE = _roi(900, 110, "Unable to retrieve technical information", (255, 255, 255), 0.9, (140, 62))
+# segment_words() drops boxes under 20% of the ROI height: glyphs tall enough for the untightened ROI
+_WORDS = _roi(900, 110, "Unable to retrieve technical information", (255, 255, 255), 1.1, (140, 66))
+_HR = _roi(184, 100, "100", scale=1.2, org=(40, 66))
+
+
+def _words(img):
+    enhanced = wordseg.enhance(img)
+    boxes = wordseg.segment_words(wordseg.text_mask(enhanced), enhanced)
+    for box in boxes:
+        wordseg.word_crop(enhanced, box)
+    return len(boxes)
+
+
+def _digits(img):
+    ocr._scale_and_binarize(ocr._green_mask(img))
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY, dst=bufpool.scratch("dp.gray", img.shape[:2]))
+    ocr._scale_and_binarize(gray)
+
+
+CASES = [
+    ("tighten() alone (ERROR_HEAD_ROI)", lambda img: tighten(img), _PHRASE),
+    ("phrase variants (ERROR_HEAD_ROI)", lambda img: verify._prep_variants(img), _PHRASE),
+    ("phrase variants, tightened", lambda img: verify._prep_variants(tighten(img)[0]), _PHRASE),
+    ("word segment    (ERROR_HEAD_ROI)", lambda img: _words(img), _WORDS),
+    ("word segment, tightened", lambda img: _words(tighten(img)[0]), _WORDS),
+]
+if ocr is not None:
+    CASES.append(("digit passes    (HR_ROI)", _digits, _HR))
+    CASES.append(("digit passes, tightened", lambda img: _digits(ocr._tighten_digits(img)), _HR))
+
+
+def _measure(fn, img, n):
+    p = bufpool.pool()
+    p.clear()
+    out = fn(img)                # warm-up (pool fills here)
+    misses0 = p.misses
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    t0 = time.perf_counter()
+    for _ in range(n):
+        fn(img)
+    dt = (time.perf_counter() - t0) / n * 1000.0
+    peak = tracemalloc.get_traced_memory()[1] - base
+    tracemalloc.stop()
+    return dt, peak, (p.misses - misses0) / n, out
+
+
+def main(n=200):
+    print(f"{'case':36s} {'mode':7s} {'ms/call':>8s} {'peak KiB':>9s} {'allocs/call':>12s} {'words':>6s}")
+    for name, fn, img in CASES:
+        for enabled in (False, True):
+            bufpool.ENABLED = enabled
+            dt, peak, allocs, out = _measure(fn, img, n)
+            mode = "pooled" if enabled else "alloc"
+            words = str(out) if isinstance(out, int) else "-"
+            print(f"{name:36s} {mode:7s} {dt:8.3f} {peak / 1024:9.1f} {allocs:12.1f} {words:>6s}")
+    bufpool.ENABLED = True
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: flight recorder cost per frame (core.recorder.DeltaFrameRing) on synthetic
+UI-like frames at the default clip scale. Headless:
+    python benchmarks/bench_recorder.py
+"""
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from simpad_automation.core.recorder import DeltaFrameRing, DEFAULT_FPS, DEFAULT_SECONDS  # noqa: E402
+
+
+def _ui_frame(i, w=512, h=384):
+    """Flat panels + text + a value that changes every few frames (like the HR readout)."""
+    img = np.full((h, w, 3), (48, 40, 36), np.uint8)
+    cv2.rectangle(img, (20, 20), (w - 20, 80), (90, 90, 90), -1)
+    cv2.putText(img, "Manual mode - Healthy", (30, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
+    cv2.putText(img, str(80 + i // 4), (40, 200), cv2.FONT_HERSHEY_SIMPLEX, 2.0, (80, 220, 80), 3)
+    if i % 40 >= 30:   # a popup now and then
+        cv2.rectangle(img, (60, 120), (w - 60, h - 60), (230, 230, 230), -1)
+    return img
+
+
+def main(n=400):
+    ring = DeltaFrameRing(int(DEFAULT_SECONDS * DEFAULT_FPS), group_size=int(DEFAULT_FPS * 4))
+    frames = [_ui_frame(i) for i in range(n)]
+    sizes, peak = [], 0
+    c0, t0 = time.process_time(), time.perf_counter()
+    for i, f in enumerate(frames):
+        sizes.append(ring.push(i / DEFAULT_FPS, f))
+        peak = max(peak, ring.nbytes)
+    cpu_ms = (time.process_time() - c0) / n * 1000.0
+    wall_ms = (time.perf_counter() - t0) / n * 1000.0
+    raw_kb = frames[0].nbytes / 1024
+    t1 = time.perf_counter()
+    decoded = list(ring.frames())
+    dec_ms = (time.perf_counter() - t1) * 1000.0
+    print(f"frame {frames[0].shape[1]}x{frames[0].shape[0]} ({raw_kb:.0f} KiB raw), {n} frames")
+    print(f"push: {wall_ms:.2f} ms wall, {cpu_ms:.2f} ms cpu per frame "
+          f"-> {cpu_ms * DEFAULT_FPS / 10:.2f}% of one core at {DEFAULT_FPS:g} fps")
+    print(f"stored: mean {np.mean(sizes) / 1024:.1f} KiB/frame, ring peak {peak / 1024:.0f} KiB "
+          f"(raw ring would be {raw_kb * len(decoded):.0f} KiB)")
+    print(f"decode {len(decoded)} frames for a clip: {dec_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
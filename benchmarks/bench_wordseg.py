@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: word segmentation for the OCR word fallback.
+Native-resolution connected components + projections (core.wordseg) vs. the previous
+path (3.8x upscale, 31x3 close, findContours, merge loop, every crop upscaled 1.8x again).
+Reports time per ROI, pixels touched, and whether both find the same words (box IoU).
+Headless (synthetic ROIs, no tesseract):
+    python benchmarks/bench_wordseg.py
+"""
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from simpad_automation.core import wordseg  # noqa: E402
+from simpad_automation.core.bufpool import clahe, resize_by  # noqa: E402
+from simpad_automation.core.inkbox import tighten  # noqa: E402
+
+PHRASES = ["Unable to retrieve technical information", "Please connect the device",
+           "Heart rate alarm limit", "Standardized patient scenario", "Battery is charging"]
+
+
+def _roi(text, scale=0.9, w=900, h=110):
+    img = np.full((h, w, 3), 30, np.uint8)
+    cv2.putText(img, text, (40, int(h * 0.6)), cv2.FONT_HERSHEY_SIMPLEX, scale, (255, 255, 255), 2)
+    return img
+
+
+# ---------- previous implementation (verify._binarize_for_words / _find_word_boxes) ----------
+
+def _old_binarize(img_bgr):
+    gray = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2GRAY)
+    big = resize_by(gray, 3.8, "old.big")
+    g = clahe().apply(big)
+    cv2.GaussianBlur(g, (3, 3), 0, dst=g)
+    cv2.threshold(g, 185, 255, cv2.THRESH_BINARY, dst=g)
+    return g
+
+
+def _old_boxes(bin_img):
+    H, W = bin_img.shape
+    closed = cv2.morphologyEx(bin_img, cv2.MORPH_CLOSE, cv2.getStructuringElement(cv2.MORPH_RECT, (31, 3)))
+    cnts, _ = cv2.findContours(closed, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    boxes = []
+    for c in cnts:
+        x, y, w, h = cv2.boundingRect(c)
+        if w * h < 0.002 * W * H or h < 0.20 * H or w > 0.98 * W:
+            continue
+        x = max(0, x - 2); y = max(0, y - 2)
+        boxes.append((x, y, min(W - x, w + 4), min(H - y, h + 4)))
+    boxes.sort(key=lambda b: b[0])
+    merged = []
+    for b in boxes:
+        if merged and b[0] - (merged[-1][0] + merged[-1][2]) <= max(3, 0.25 * (merged[-1][3] + b[3]) / 2.0):
+            cx, cy, cw, ch = merged[-1]
+            x0, y0 = min(cx, b[0]), min(cy, b[1])
+            merged[-1] = (x0, y0, max(cx + cw, b[0] + b[2]) - x0, max(cy + ch, b[1] + b[3]) - y0)
+        else:
+            merged.append(b)
+    return merged
+
+
+def _old(img):
+    b = _old_binarize(img)
+    boxes = _old_boxes(b)
+    px = b.size * 4                                   # resize, clahe, blur, threshold
+    px += b.size * 3                                  # close (dilate + erode), contours
+    for x, y, w, h in boxes:
+        crop = cv2.resize(b[y:y + h, x:x + w], None, fx=1.8, fy=1.8, interpolation=cv2.INTER_CUBIC)
+        px += crop.size
+    return [tuple(v / 3.8 for v in bx) for bx in boxes], px
+
+
+def _new(img):
+    enhanced = wordseg.enhance(img)
+    boxes = wordseg.segment_words(wordseg.text_mask(enhanced), enhanced)
+    px = enhanced.size * 4                            # gray, clahe, threshold, components
+    for x, y, w, h in boxes:
+        px += int(w * h * wordseg.BIN_UPSCALE ** 2) * 3   # resize, blur, threshold
+        px += wordseg.word_crop(enhanced, wordseg.WordBox(x, y, w, h)).size
+    return boxes, px
+
+
+def _iou(a, b):
+    ax, ay, aw, ah = a; bx, by, bw, bh = b
+    iw = max(0.0, min(ax + aw, bx + bw) - max(ax, bx)); ih = max(0.0, min(ay + ah, by + bh) - max(ay, by))
+    inter = iw * ih
+    return inter / (aw * ah + bw * bh - inter)
+
+
+def _time(fn, img, n):
+    fn(img)
+    t0 = time.perf_counter()
+    for _ in range(n):
+        out = fn(img)
+    return (time.perf_counter() - t0) / n * 1000.0, out
+
+
+def main(n=50):
+    print(f"{'phrase':44s} {'old ms':>7s} {'new ms':>7s} {'old Mpx':>8s} {'new Mpx':>8s}  words old/new  IoU min")
+    for scale in (0.7, 0.9, 1.2):
+        for phrase in PHRASES:
+            img = tighten(_roi(phrase, scale))[0]       # what assert_phrase_in_roi segments
+            t_old, (b_old, px_old) = _time(_old, img, n)
+            t_new, (b_new, px_new) = _time(_new, img, n)
+            ious = [_iou(a, b) for a, b in zip(b_old, b_new)] if b_old and len(b_old) == len(b_new) else [0.0]
+            print(f"{phrase[:38] + f' x{scale}':44s} {t_old:7.2f} {t_new:7.2f} {px_old / 1e6:8.2f} {px_new / 1e6:8.2f}"
+                  f"  {len(b_old):5d}/{len(b_new):<5d}   {min(ious):.2f}")
+
+
+if __name__ == "__main__":
+    main()
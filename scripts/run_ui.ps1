@@ -1,5 +1,12 @@
 $ts = Get-Date -Format 'yyyyMMdd_HHmmss'
 $env:PYTEST_HTML_TAG = $ts
+# artifact retention (core/retention.py) for UI runs; set SIMPAD_RETENTION yourself to override
+if (-not $env:SIMPAD_RETENTION) { $env:SIMPAD_RETENTION = 'on' }
+# first run for this app version: record the screen library (core/screens.py) instead of checking it
+if (-not $env:SIMPAD_SCREENS -and -not (Test-Path 'src\simpad_automation\ui\screens.npz')) {
+  Write-Host "ui/screens.npz not found - recording screens on this run (SIMPAD_SCREENS=record)" -ForegroundColor Yellow
+  $env:SIMPAD_SCREENS = 'record'
+}
 $venv = '.\.venv\Scripts\Activate.ps1'
 . $venv
 pytest -m "ui or e2e" --html "reports/report_$ts.html" --self-contained-html -q
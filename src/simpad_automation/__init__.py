@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+SimPad automation toolkit - package facade.
+
+    from simpad_automation import launch_app, click_relative, read_hr_value, step
+
+Names are resolved on first access (PEP 562), so `import simpad_automation` costs
+milliseconds: OpenCV, numpy, pywin32, pyautogui and tesseract are only loaded by the
+module that actually needs them. pyautogui settings are applied once by init_backend()
+(or on the first GUI call). Check the budget with `python benchmarks/bench_import.py`.
+"""
+
+import importlib
+
+# public name -> submodule that defines it
+_EXPORTS = {
+    # backend / workers (stdlib only)
+    "init_backend": "core.backend",
+    "artifacts_root": "core.workers",
+    "worker_id": "core.workers",
+    "client_map": "core.dpi",
+    "ClientMap": "core.dpi",
+    # app + window + input (Windows)
+    "launch_app": "core.app",
+    "close_app": "core.app",
+    "get_client_rect": "core.window",
+    "click_relative": "core.window",
+    "drag_relative": "core.window",
+    "ensure_focus": "core.window",
+    "set_input_backend": "core.window",
+    "get_input_backend": "core.window",
+    "type_text": "core.input",
+    "press_enter": "core.input",
+    "press_backspace": "core.input",
+    "current_timing": "core.timing",
+    "use_timing": "core.timing",
+    "calibrate_timing": "core.timing",
+    # OCR / verification
+    "read_hr_value": "core.ocr",
+    "read_hr_value_conf": "core.ocr",
+    "read_digits_from_roi": "core.ocr",
+    "read_digits_conf": "core.ocr",
+    "read_vitals": "core.vitals",
+    "assert_phrase_in_roi": "core.verify",
+    "compare_tokens": "core.verify",
+    "normalize_text": "core.verify",
+    "screen_text_map": "core.textmap",
+    "RoiMonitor": "core.monitor",
+    "TimeSeriesRing": "core.timeseries",
+    # screens / navigation / reporting
+    "identify_screen": "core.screens",
+    "assert_screen": "core.screens",
+    "wait_for_screen": "core.screens",
+    "navigate": "core.nav",
+    "step": "core.reporter",
+    "save_client_screenshot": "core.reporter",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    mod = _EXPORTS.get(name)
+    if mod is None:
+        raise AttributeError(f"module 'simpad_automation' has no attribute '{name}'")
+    value = getattr(importlib.import_module(f"{__name__}.{mod}"), name)
+    globals()[name] = value   # cache: next access is a plain module attribute
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -10,7 +10,33 @@ def _shell_execute_open(path, cwd):
     if hinst <= 32:
         raise RuntimeError(f"ShellExecuteW failed: {hinst}")
 
-def launch_app(timeout: float = 20.0):
+def _simpad_windows() -> set:
+    """All visible top-level SimPad windows right now."""
+    found = set()
+    def enum_cb(h, _):
+        if not win32gui.IsWindowVisible(h):
+            return
+        title = win32gui.GetWindowText(h) or ""
+        if "SimPad rcgui" in title:
+            found.add(h)
+    win32gui.EnumWindows(enum_cb, None)
+    return found
+
+def launch_app(timeout: float = 20.0, foreground: bool = True, position=None,
+               new_window: bool | None = None, reuse_after: float = 3.0):
+    """
+    Start SimPad and return (None, hwnd).
+    new_window=True waits for a NEW window (instances that were already open are ignored,
+    so parallel workers each get their own); default: True under xdist only.
+    Otherwise an already open window is used when no new one shows up within
+    'reuse_after' seconds (SimPad left open, or a single-instance build).
+    foreground=False skips raising/focusing (background input backend);
+    position=(x, y) moves the window there (side-by-side instances).
+    """
+    if new_window is None:
+        new_window = bool(os.environ.get("PYTEST_XDIST_WORKER"))
+    existing = _simpad_windows()
+
     # 1) Launch app (double click simulation)
     _shell_execute_open(APP_PATH, APP_DIR)
 
@@ -18,32 +44,39 @@ def launch_app(timeout: float = 20.0):
     hwnd = None
     t0 = time.time()
     while time.time() - t0 < timeout:
-        def enum_cb(h, _):
-            nonlocal hwnd
-            if not win32gui.IsWindowVisible(h):
-                return
-            title = win32gui.GetWindowText(h) or ""
-            if "SimPad rcgui" in title:
-                hwnd = h
-        win32gui.EnumWindows(enum_cb, None)
-        if hwnd:
+        current = _simpad_windows()
+        fresh = current - existing
+        if fresh:
+            hwnd = min(fresh)
+            break
+        if not new_window and current and time.time() - t0 >= reuse_after:
+            hwnd = min(current)
+            print(f"[INFO] No new SimPad window, using the open one (hwnd={hwnd})")
             break
         time.sleep(0.2)
     if not hwnd:
         raise RuntimeError("SimPad window not found after ShellExecute.")
 
+    if position is not None:
+        try:
+            l, t, r, b = win32gui.GetWindowRect(hwnd)
+            win32gui.MoveWindow(hwnd, int(position[0]), int(position[1]), r - l, b - t, True)
+        except Exception as e:
+            print(f"[WARN] Could not move SimPad window to {position}: {e}")
+
     # 3) Bring it to the foreground and wait for the actual focus
-    try:
-        win32gui.ShowWindow(hwnd, win32con.SW_RESTORE)
-        win32gui.SetForegroundWindow(hwnd)
-    except Exception:
-        pass
+    if foreground:
+        try:
+            win32gui.ShowWindow(hwnd, win32con.SW_RESTORE)
+            win32gui.SetForegroundWindow(hwnd)
+        except Exception:
+            pass
 
-    t_focus = time.time()
-    while time.time() - t_focus < 10:
-        if win32gui.GetForegroundWindow() == hwnd:
-            break
-        time.sleep(0.1)
+        t_focus = time.time()
+        while time.time() - t_focus < 10:
+            if win32gui.GetForegroundWindow() == hwnd:
+                break
+            time.sleep(0.1)
 
     # 4) Waiter to give app full loading before the first click
     time.sleep(3.0)
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+Deferred GUI / OCR backends with one explicit initialization point.
+Importing simpad_automation modules does not load pyautogui or pytesseract and does not
+touch pyautogui globals; that happens once, in init_backend() (called by the test
+bootstrap) or lazily on the first screenshot / click / OCR call.
+Headless (stdlib only), safe to import on CI.
+"""
+
+import threading
+from typing import Optional
+
+FAILSAFE = False    # no exception when the cursor ends up in a screen corner
+# pyautogui.PAUSE comes from the active timing profile (core.timing, 0.02 s when "safe")
+
+_lock = threading.Lock()
+_gui = None
+_tess = None
+
+
+def init_backend(failsafe: bool = FAILSAFE, pause: Optional[float] = None):
+    """
+    Import pyautogui and apply its global settings. The import happens once;
+    calling again only re-applies the settings. Returns the pyautogui module.
+    pause=None takes pyautogui.PAUSE from the active timing profile.
+    """
+    global _gui
+    if pause is None:
+        from .timing import current_timing
+        pause = current_timing().pause
+    with _lock:
+        if _gui is None:
+            # DPI awareness first: pyautogui declares the process system-aware on import,
+            # and the awareness cannot be changed afterwards (core.dpi, SIMPAD_DPI)
+            from .dpi import enable
+            mode = enable()
+            if mode not in ("unavailable", "unknown"):
+                print(f"[INFO] DPI awareness: {mode}")
+            try:
+                import pyautogui
+            except Exception as e:
+                raise RuntimeError(f"pyautogui is not available in this environment: {e}")
+            _gui = pyautogui
+        _gui.FAILSAFE = failsafe
+        _gui.PAUSE = pause
+    return _gui
+
+
+def initialized() -> bool:
+    return _gui is not None
+
+
+def gui():
+    """Configured pyautogui (init_backend() with defaults on first use)."""
+    return _gui if _gui is not None else init_backend()
+
+
+def tesseract():
+    """pytesseract, imported on the first OCR call."""
+    global _tess
+    if _tess is None:
+        with _lock:
+            if _tess is None:
+                try:
+                    import pytesseract
+                except Exception as e:
+                    raise RuntimeError(f"pytesseract is not available in this environment: {e}")
+                _tess = pytesseract
+    return _tess
+
+
+def ocr_engine():
+    """
+    pytesseract-compatible OCR entry point: the local OCR server's client when one is
+    running (core.ocrservice, SIMPAD_OCR_SERVER), else pytesseract in this process.
+    """
+    from .ocrservice import engine
+    return engine()
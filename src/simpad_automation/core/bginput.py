@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+"""
+Focus-free background input: mouse/keyboard messages posted straight to the SimPad
+window (or the child control under the point), without SetForegroundWindow and without
+moving the global cursor. Several app instances can be driven side by side.
+
+Used by window.py / input.py when the input backend is "message" or "auto"
+(see window.set_input_backend). In "auto" mode the first pointer input on a window is
+preceded by a probe that cannot activate anything: a posted hover + press on the target,
+released outside the client area (a cancelled click). If the pixels around the target do
+not react (hover / pressed state), that window is switched to SendInput for the rest of
+its life; the real input is then sent once, by the chosen backend. The probe only looks
+at a box around the point, with the live vitals ROIs masked out.
+pywin32 is imported on first use (the probe geometry is testable headless).
+"""
+
+import time
+import zlib
+import ctypes
+from ctypes import wintypes
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .backend import gui
+from .dpi import client_map, rel_box
+from .timing import current_timing
+from simpad_automation.ui.controls import NUMERIC_ROIS
+
+# CWP_SKIPINVISIBLE | CWP_SKIPDISABLED | CWP_SKIPTRANSPARENT
+_CWP_FLAGS = 0x0001 | 0x0002 | 0x0004
+_WM_MOUSEMOVE, _WM_LBUTTONDOWN, _WM_LBUTTONUP, _WM_LBUTTONDBLCLK = 0x0200, 0x0201, 0x0202, 0x0203
+_WM_CHAR, _WM_KEYDOWN, _WM_KEYUP = 0x0102, 0x0100, 0x0101
+_MK_LBUTTON = 0x0001
+
+PROBE_RADIUS = 0.06     # half-size of the watched box around the probe point (client fractions)
+
+# hwnd -> "message" | "sendinput" (result of the auto probe)
+_MODE_BY_HWND: Dict[int, str] = {}
+
+
+# ---------- geometry ----------
+
+def _client_to_screen(hwnd, rx: float, ry: float) -> Tuple[int, int]:
+    cm = client_map(hwnd)
+    if cm is None:
+        raise RuntimeError(f"bginput: client area of hwnd={hwnd} is not available")
+    return cm.point(rx, ry)
+
+def hit_test(hwnd, sx: int, sy: int) -> Tuple[int, Tuple[int, int]]:
+    """
+    Deepest visible, enabled child of hwnd under the screen point (sx, sy).
+    Returns (target_hwnd, point in target's client coordinates).
+    """
+    import win32gui
+    target = hwnd
+    while True:
+        cx, cy = win32gui.ScreenToClient(target, (sx, sy))
+        child = win32gui.ChildWindowFromPointEx(target, (cx, cy), _CWP_FLAGS)
+        if not child or child == target:
+            return target, (cx, cy)
+        target = child
+
+def _lparam(x: int, y: int) -> int:
+    return (x & 0xFFFF) | ((y & 0xFFFF) << 16)
+
+def _post(target, msg: int, wparam: int, lparam: int) -> None:
+    import win32gui
+    win32gui.PostMessage(target, msg, wparam, lparam)
+
+
+# ---------- mouse ----------
+
+def post_click(hwnd, rx: float, ry: float, hold: Optional[float] = None) -> Tuple[int, int]:
+    """Left click at client fractions (rx, ry). Returns the screen point that was targeted."""
+    hold = current_timing().hold if hold is None else hold
+    sx, sy = _client_to_screen(hwnd, rx, ry)
+    target, (cx, cy) = hit_test(hwnd, sx, sy)
+    lp = _lparam(cx, cy)
+    _post(target, _WM_MOUSEMOVE, 0, lp)
+    _post(target, _WM_LBUTTONDOWN, _MK_LBUTTON, lp)
+    time.sleep(hold)
+    _post(target, _WM_LBUTTONUP, 0, lp)
+    return sx, sy
+
+def post_double_click(hwnd, rx: float, ry: float, gap: Optional[float] = None) -> None:
+    gap = current_timing().double_gap if gap is None else gap
+    sx, sy = _client_to_screen(hwnd, rx, ry)
+    target, (cx, cy) = hit_test(hwnd, sx, sy)
+    lp = _lparam(cx, cy)
+    _post(target, _WM_LBUTTONDOWN, _MK_LBUTTON, lp)
+    _post(target, _WM_LBUTTONUP, 0, lp)
+    time.sleep(gap)
+    _post(target, _WM_LBUTTONDBLCLK, _MK_LBUTTON, lp)
+    _post(target, _WM_LBUTTONUP, 0, lp)
+
+def post_drag(hwnd, rx_start: float, ry_start: float, rx_end: float, ry_end: float,
+              steps: int = 10, duration: float = 0.6) -> None:
+    """Press at start, WM_MOUSEMOVE with MK_LBUTTON along the line, release at end (all to one target)."""
+    sx0, sy0 = _client_to_screen(hwnd, rx_start, ry_start)
+    sx1, sy1 = _client_to_screen(hwnd, rx_end, ry_end)
+    target, (cx0, cy0) = hit_test(hwnd, sx0, sy0)
+    # the pressed control keeps receiving the drag (like mouse capture)
+    ox, oy = sx0 - cx0, sy0 - cy0
+    _post(target, _WM_MOUSEMOVE, 0, _lparam(cx0, cy0))
+    _post(target, _WM_LBUTTONDOWN, _MK_LBUTTON, _lparam(cx0, cy0))
+    cx, cy = cx0, cy0
+    try:
+        for i in range(1, steps + 1):
+            t = i / steps
+            cx = int(sx0 + (sx1 - sx0) * t) - ox
+            cy = int(sy0 + (sy1 - sy0) * t) - oy
+            _post(target, _WM_MOUSEMOVE, _MK_LBUTTON, _lparam(cx, cy))
+            time.sleep(max(0.0, duration / steps))
+    finally:
+        _post(target, _WM_LBUTTONUP, 0, _lparam(cx, cy))
+
+
+# ---------- keyboard ----------
+
+class GUITHREADINFO(ctypes.Structure):
+    _fields_ = [
+        ("cbSize", wintypes.DWORD),
+        ("flags", wintypes.DWORD),
+        ("hwndActive", wintypes.HWND),
+        ("hwndFocus", wintypes.HWND),
+        ("hwndCapture", wintypes.HWND),
+        ("hwndMenuOwner", wintypes.HWND),
+        ("hwndMoveSize", wintypes.HWND),
+        ("hwndCaret", wintypes.HWND),
+        ("rcCaret", wintypes.RECT),
+    ]
+
+def _focus_target(hwnd) -> int:
+    """Control with keyboard focus inside hwnd's GUI thread (falls back to hwnd)."""
+    try:
+        import win32process
+        tid, _pid = win32process.GetWindowThreadProcessId(hwnd)
+        info = GUITHREADINFO(cbSize=ctypes.sizeof(GUITHREADINFO))
+        if not ctypes.windll.user32.GetGUIThreadInfo(tid, ctypes.byref(info)):
+            return hwnd
+        return info.hwndFocus or hwnd
+    except Exception:
+        return hwnd
+
+def post_text(hwnd, text: str, interval: Optional[float] = None) -> None:
+    interval = current_timing().key_interval if interval is None else interval
+    target = _focus_target(hwnd)
+    for ch in text:
+        _post(target, _WM_CHAR, ord(ch), 0)
+        time.sleep(interval)
+
+def post_key(hwnd, vk: int) -> None:
+    target = _focus_target(hwnd)
+    _post(target, _WM_KEYDOWN, vk, 0)
+    _post(target, _WM_KEYUP, vk, 0xC0000000)
+
+
+# ---------- auto mode ----------
+
+def probe_digest(img: np.ndarray, rx: float, ry: float, radius: float = PROBE_RADIUS,
+                 exclude=tuple(NUMERIC_ROIS.values())) -> int:
+    """
+    CRC of the box around (rx, ry) in a full-client frame, with every 'exclude' ROI
+    (the live vitals) blanked, so only a reaction at the target changes the digest.
+    """
+    H, W = img.shape[:2]
+    x0, y0 = int(W * max(0.0, rx - radius)), int(H * max(0.0, ry - radius))
+    x1, y1 = int(W * min(1.0, rx + radius)), int(H * min(1.0, ry + radius))
+    box = np.array(img[y0:max(y1, y0 + 1), x0:max(x1, x0 + 1)], copy=True)
+    for roi in exclude:
+        ex, ey, ew, eh = rel_box(W, H, *roi)
+        bx0, by0 = max(ex, x0) - x0, max(ey, y0) - y0
+        bx1, by1 = min(ex + ew, x1) - x0, min(ey + eh, y1) - y0
+        if bx1 > bx0 and by1 > by0:
+            box[by0:by1, bx0:bx1] = 0
+    return zlib.crc32(box.tobytes())
+
+def _client_frame(hwnd) -> Optional[np.ndarray]:
+    from .framebus import active_bus
+    try:
+        bus = active_bus(hwnd)
+        if bus is not None:
+            return bus.fresh().img
+        cm = client_map(hwnd)
+        if cm is None:
+            return None
+        return np.asarray(gui().screenshot(region=cm.region(0.0, 0.0, 1.0, 1.0)))
+    except Exception:
+        return None
+
+def _target_digest(hwnd, rx: float, ry: float) -> Optional[int]:
+    img = _client_frame(hwnd)
+    return None if img is None else probe_digest(img, rx, ry)
+
+def _press(hwnd, rx: float, ry: float):
+    """Hover + button down on the target; returns what _cancel_press() needs."""
+    target, (cx, cy) = hit_test(hwnd, *_client_to_screen(hwnd, rx, ry))
+    _post(target, _WM_MOUSEMOVE, 0, _lparam(cx, cy))
+    _post(target, _WM_LBUTTONDOWN, _MK_LBUTTON, _lparam(cx, cy))
+    return target
+
+def _cancel_press(hwnd, target) -> None:
+    """Release outside the client area: a pressed button does not fire, nothing is dragged."""
+    _post(target, _WM_LBUTTONUP, 0, _lparam(-32, -32))
+
+def mode_for(hwnd) -> Optional[str]:
+    """Known backend for this window after a probe ('message' | 'sendinput'), else None."""
+    return _MODE_BY_HWND.get(hwnd)
+
+def forget(hwnd) -> None:
+    _MODE_BY_HWND.pop(hwnd, None)
+
+def probe_input(hwnd, rx: float, ry: float, timeout: float = 0.4) -> bool:
+    """
+    Decide the backend for hwnd with a cancelled click on (rx, ry) (see module doc).
+    True ('message' remembered) if the pixels around the point reacted to the posted
+    hover/press; False ('sendinput' remembered) otherwise, or when nothing can be captured.
+    Never activates the target: the caller sends its real input afterwards, once.
+    """
+    before = _target_digest(hwnd, rx, ry)
+    reacted = False
+    if before is not None:
+        target = _press(hwnd, rx, ry)
+        try:
+            t0 = time.time()
+            while time.time() - t0 < timeout:
+                time.sleep(0.05)
+                after = _target_digest(hwnd, rx, ry)
+                if after is not None and after != before:
+                    reacted = True
+                    break
+        finally:
+            _cancel_press(hwnd, target)
+    _MODE_BY_HWND[hwnd] = "message" if reacted else "sendinput"
+    if not reacted:
+        print(f"[INFO] hwnd={hwnd} shows no reaction to posted input -> SendInput fallback")
+    return reacted
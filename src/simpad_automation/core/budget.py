@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+Latency budgets: harness speed as a tested property.
+- step(..., budget_ms=500) and budget_ms= on read_hr_value / assert_phrase_in_roi record
+  (name, budget, actual, grade) on the enclosing step; the step card shows them
+  green (within budget) / amber (over by at most TOLERANCE) / red
+- SIMPAD_BUDGET_MODE:
+    report  (default) record and show only
+    soft    amber/red also raise a BudgetWarning (pytest lists them; -W error::... fails)
+    hard    red raises BudgetExceeded (the step fails); amber warns
+    off     not even recorded
+Budgets apply to the call's own duration; an exception from the body is never masked.
+Headless, safe to import on CI.
+"""
+
+import os
+import threading
+import time
+import warnings
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterator, List, Optional
+
+MODES = ("off", "report", "soft", "hard")
+MODE = os.environ.get("SIMPAD_BUDGET_MODE", "report").lower()
+if MODE not in MODES:
+    print(f"[WARN] SIMPAD_BUDGET_MODE={MODE!r} is not one of {MODES}, using 'report'")
+    MODE = "report"
+TOLERANCE = 0.25     # amber up to budget * (1 + TOLERANCE): noisy machines, not a regression yet
+
+
+class BudgetWarning(UserWarning):
+    """A call ran over its latency budget (soft mode)."""
+
+
+class BudgetExceeded(AssertionError):
+    """A call ran well over its latency budget (hard mode)."""
+
+
+@dataclass
+class BudgetRecord:
+    name: str
+    budget_ms: float
+    actual_ms: float
+    grade: str               # "green" | "amber" | "red"
+
+    def describe(self) -> str:
+        return f"{self.name}: {self.actual_ms:.0f} ms / budget {self.budget_ms:.0f} ms ({self.grade})"
+
+
+def grade(actual_ms: float, budget_ms: float, tolerance: float = TOLERANCE) -> str:
+    if actual_ms <= budget_ms:
+        return "green"
+    return "amber" if actual_ms <= budget_ms * (1.0 + tolerance) else "red"
+
+
+# ---------- collection per step (reporter.step opens a scope) ----------
+
+_local = threading.local()
+
+def _scopes() -> List[List[BudgetRecord]]:
+    if not hasattr(_local, "scopes"):
+        _local.scopes = []
+    return _local.scopes
+
+@contextmanager
+def collect() -> Iterator[List[BudgetRecord]]:
+    """Records of budgets checked in this thread while the block runs (innermost scope)."""
+    records: List[BudgetRecord] = []
+    scopes = _scopes()
+    scopes.append(records)
+    try:
+        yield records
+    finally:
+        # by identity: an inner scope's list compares equal to the outer one while both are empty
+        assert scopes[-1] is records, "budget scopes closed out of order"
+        scopes.pop()
+
+
+def check(name: str, actual_ms: float, budget_ms: float, mode: Optional[str] = None) -> Optional[BudgetRecord]:
+    """Grade one measured duration, record it on the current step, enforce the mode."""
+    mode = MODE if mode is None else mode
+    if mode == "off":
+        return None
+    rec = BudgetRecord(name, float(budget_ms), round(float(actual_ms), 1), grade(actual_ms, budget_ms))
+    scopes = _scopes()
+    if scopes:
+        scopes[-1].append(rec)
+    if rec.grade != "green":
+        print(f"[WARN] Over budget: {rec.describe()}")
+        if mode == "hard" and rec.grade == "red":
+            raise BudgetExceeded(rec.describe())
+        if mode in ("soft", "hard"):
+            warnings.warn(rec.describe(), BudgetWarning, stacklevel=3)
+    return rec
+
+
+@contextmanager
+def budget(name: str, budget_ms: Optional[float], mode: Optional[str] = None) -> Iterator[None]:
+    """Time the block against budget_ms (no-op when budget_ms is None)."""
+    if budget_ms is None:
+        yield
+        return
+    t0 = time.perf_counter()
+    yield                      # an exception here propagates unchecked
+    check(name, (time.perf_counter() - t0) * 1000.0, budget_ms, mode)
+
+
+def as_dicts(records: List[BudgetRecord]) -> List[Dict]:
+    return [asdict(r) for r in records]
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+Reusable, shape-keyed scratch buffers for the capture -> preprocess -> OCR pipeline.
+- one pool per thread (the ROI monitor thread never shares buffers with the test thread)
+- a buffer is keyed by (slot, shape, dtype): same ROI size -> same memory every call
+- scratch() returns None when pooling is disabled, so `dst=scratch(...)` falls back to
+  OpenCV's normal allocation
+
+A pooled result is only valid until the same slot is used again on this thread:
+copy it if you need to keep it (e.g. several ROIs side by side).
+Disable with SIMPAD_BUFPOOL=0 (benchmarks compare both modes).
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+ENABLED = os.environ.get("SIMPAD_BUFPOOL", "1") != "0"
+MAX_BUFFERS = 64      # per thread; least recently used shapes are dropped beyond this
+
+
+class BufferPool:
+    def __init__(self, max_buffers: int = MAX_BUFFERS):
+        self.max_buffers = max_buffers
+        self._bufs: "OrderedDict[Tuple, np.ndarray]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._clahe = None
+
+    def get(self, slot: str, shape: Tuple[int, ...], dtype=np.uint8) -> np.ndarray:
+        key = (slot, tuple(int(s) for s in shape), np.dtype(dtype).str)
+        buf = self._bufs.get(key)
+        if buf is None:
+            self.misses += 1
+            buf = np.empty(key[1], dtype=dtype)
+            self._bufs[key] = buf
+            if len(self._bufs) > self.max_buffers:
+                self._bufs.popitem(last=False)
+        else:
+            self.hits += 1
+            self._bufs.move_to_end(key)
+        return buf
+
+    def clahe(self):
+        """CLAHE object keeps internal state -> one per thread, created once."""
+        if self._clahe is None:
+            self._clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+        return self._clahe
+
+    def nbytes(self) -> int:
+        return sum(b.nbytes for b in self._bufs.values())
+
+    def clear(self) -> None:
+        self._bufs.clear()
+        self.hits = self.misses = 0
+
+
+_local = threading.local()
+
+def pool() -> BufferPool:
+    p = getattr(_local, "pool", None)
+    if p is None:
+        p = _local.pool = BufferPool()
+    return p
+
+
+def scratch(slot: str, shape: Tuple[int, ...], dtype=np.uint8) -> Optional[np.ndarray]:
+    """Pooled buffer for an OpenCV dst= argument, or None (allocate) when pooling is off."""
+    if ENABLED:
+        return pool().get(slot, shape, dtype)
+    pool().misses += 1   # OpenCV allocates a fresh output here; counted for benchmarks
+    return None
+
+
+def clahe():
+    return pool().clahe() if ENABLED else cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+
+
+def scaled_shape(shape: Tuple[int, ...], f: float) -> Tuple[int, int]:
+    """(h, w) OpenCV produces for resize(..., fx=f, fy=f)."""
+    return int(round(shape[0] * f)), int(round(shape[1] * f))
+
+
+def resize_by(src: np.ndarray, f: float, slot: str, interpolation=cv2.INTER_CUBIC) -> np.ndarray:
+    """cv2.resize(src, None, fx=f, fy=f) into a pooled buffer."""
+    h, w = scaled_shape(src.shape, f)
+    return cv2.resize(src, (w, h), dst=scratch(slot, (h, w) + src.shape[2:], src.dtype),
+                      interpolation=interpolation)
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+Phrase catalog: thousands of expected UI strings (several locales / app versions),
+queried with OCR lines.
+- index: character trigrams of the normalized phrase with spaces removed (so glued and
+  broken words still share grams) -> postings of phrase ids; very common grams are skipped
+- query: only phrases sharing grams with the OCR line are touched, ranked by Dice overlap;
+  the full DP alignment of verify.py runs on the top-k candidates only
+- same normalization and pass/fail rule as assert_phrase_in_roi / compare_tokens
+
+Example:
+    cat = PhraseCatalog.from_file("ui/phrases_en.json")     # {"key": "phrase", ...}
+    hit = cat.best("Unable to retreive technicalinformation")
+    hit.key, hit.ok, hit.score
+Headless, safe to import on CI.
+"""
+
+from __future__ import annotations
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from .verify import _align_dp, _pairs_ok, _norm_word, _tokenize_expected, _weighted_score
+
+NGRAM = 3
+MAX_DF = 0.2           # grams in more than this share of the phrases are not used for ranking
+TOP_K = 10
+
+
+@dataclass
+class CatalogHit:
+    key: str
+    phrase: str
+    ok: bool               # same rule as compare_tokens / assert_phrase_in_roi
+    score: float           # weighted alignment score 0..1
+    coverage: float        # share of OCR tokens the phrase accounts for (1.0 = no leftover noise)
+    candidate: float       # trigram Dice overlap used for ranking
+    pairs: List[Tuple[str, str, float]]
+
+
+def _gram_text(tokens: Iterable[str]) -> str:
+    """Letters only, glyph-normalized, no spaces: 'technical information' == 'technicalinformation'."""
+    return "".join(_norm_word(t).lower() for t in tokens)
+
+def _grams(text: str, n: int = NGRAM) -> set:
+    if len(text) < n:
+        return {text} if text else set()
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class PhraseCatalog:
+    def __init__(self, phrases: Mapping[str, str] | Iterable[str], n: int = NGRAM, max_df: float = MAX_DF):
+        items = list(phrases.items()) if isinstance(phrases, Mapping) else [(p, p) for p in phrases]
+        self.n = n
+        self.keys: List[str] = []
+        self.phrases: List[str] = []
+        self.tokens: List[List[str]] = []
+        sizes: List[int] = []
+        postings: Dict[str, List[int]] = {}
+        empty: List[str] = []
+        for key, phrase in items:
+            toks = _tokenize_expected(phrase)
+            if not toks:
+                empty.append(str(key))
+                continue
+            pid = len(self.keys)
+            self.keys.append(str(key))
+            self.phrases.append(phrase)
+            self.tokens.append(toks)
+            grams = _grams(_gram_text(toks), n)
+            sizes.append(len(grams))
+            for g in grams:
+                postings.setdefault(g, []).append(pid)
+        if empty:
+            print(f"[WARN] PhraseCatalog: {len(empty)} phrase(s) without letters skipped: {empty[:5]}")
+        self._sizes = np.asarray(sizes, dtype=np.float32)
+        self._postings = {g: np.asarray(ids, dtype=np.int32) for g, ids in postings.items()}
+        self._max_df = max(1, int(max_df * len(self.keys)))
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @classmethod
+    def from_file(cls, path: Path | str, **kw) -> "PhraseCatalog":
+        """.json ({key: phrase} or [phrase, ...]) or .txt (one phrase per line, '#' comments)."""
+        p = Path(path)
+        text = p.read_text(encoding="utf-8")
+        if p.suffix.lower() == ".json":
+            return cls(json.loads(text), **kw)
+        lines = [ln.strip() for ln in text.splitlines()]
+        return cls([ln for ln in lines if ln and not ln.startswith("#")], **kw)
+
+    # ---------- candidate generation ----------
+
+    def candidates(self, ocr_text: str, k: int = TOP_K) -> List[Tuple[int, float]]:
+        """Top-k (phrase id, Dice overlap) by shared trigrams; touches only phrases sharing grams."""
+        q = _grams(_gram_text(_tokenize_expected(ocr_text)), self.n)
+        lists = [self._postings[g] for g in q if g in self._postings]
+        if not lists:
+            return []
+        rare = [a for a in lists if len(a) <= self._max_df]
+        # a line made only of very common grams still gets ranked, just more expensively
+        ids, hits = np.unique(np.concatenate(rare or lists), return_counts=True)
+        dice = 2.0 * hits / (self._sizes[ids] + len(q))
+        top = np.argsort(-dice, kind="stable")[:k] if len(ids) > k else np.argsort(-dice, kind="stable")
+        return [(int(ids[i]), float(dice[i])) for i in top]
+
+    # ---------- full alignment on the candidates ----------
+
+    def _align(self, pid: int, ocr: List[str], cand: float,
+               min_ratio: float, avg_threshold: float) -> CatalogHit:
+        src: List[Tuple[int, ...]] = []
+        pairs = _align_dp(ocr, self.tokens[pid], min_ratio, src)
+        used = {i for s in src for i in s}
+        return CatalogHit(
+            key=self.keys[pid], phrase=self.phrases[pid],
+            ok=_pairs_ok(pairs, min_ratio, avg_threshold),
+            score=_weighted_score(pairs),
+            coverage=len(used) / max(1, len(ocr)),
+            candidate=cand, pairs=pairs,
+        )
+
+    def match(self, ocr_text: str, k: int = TOP_K, min_ratio: float = 0.62,
+              avg_threshold: float = 0.80) -> List[CatalogHit]:
+        """Aligned candidates, best first: passing ones, then by score x coverage."""
+        ocr = [w for w in (_norm_word(w) for w in _tokenize_expected(ocr_text)) if w]
+        if not ocr:
+            return []
+        hits = [self._align(pid, ocr, cand, min_ratio, avg_threshold)
+                for pid, cand in self.candidates(ocr_text, k)]
+        # a short catalog phrase can match part of the line perfectly: weigh by how much of it it explains
+        hits.sort(key=lambda h: (h.ok, round(h.score * h.coverage, 3), h.candidate), reverse=True)
+        return hits
+
+    def best(self, ocr_text: str, k: int = TOP_K, min_ratio: float = 0.62,
+             avg_threshold: float = 0.80) -> Optional[CatalogHit]:
+        hits = self.match(ocr_text, k, min_ratio, avg_threshold)
+        return hits[0] if hits else None
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""
+DPI awareness and the one client-coordinate transform used for clicks, drags and captures.
+- enable() declares the process DPI-aware once (SIMPAD_DPI, default per-monitor), before
+  pyautogui is imported. Without it, win32 client rects and cursor positions are in
+  scaled (logical) pixels on a 125-200 % display while the screen grab is physical or
+  OS-resampled, so ROIs drift and captures come out blurred.
+- ClientMap: client rect in physical pixels + the window DPI. point() / region() / box()
+  share one rounding rule (client px = int(size * fraction)), so a click, a screen region
+  and a crop of a full-client frame land on the same pixel.
+- upscale_for(): the OCR upscale constants were tuned on 96-dpi captures; a physical
+  capture at 150 % already has 1.5x larger glyphs, so the factor is divided by the display
+  scale of the last captured window (exactly the tuned constant at 96 dpi, never below 1).
+
+SIMPAD_DPI = per-monitor (default) | system | off (leave the process as it is)
+Stdlib only (win32gui / ctypes.windll on first use); headless, safe to import on CI.
+"""
+
+import ctypes
+import os
+import threading
+from typing import Dict, NamedTuple, Optional, Tuple
+
+MODES = ("per-monitor", "system", "off")
+BASE_DPI = 96
+
+# SetProcessDpiAwarenessContext handles / PROCESS_DPI_AWARENESS values
+_CONTEXT = {"per-monitor": -4, "system": -2}        # PER_MONITOR_AWARE_V2, SYSTEM_AWARE
+_SHCORE = {"per-monitor": 2, "system": 1}
+_AWARENESS_NAMES = {0: "unaware", 1: "system", 2: "per-monitor"}
+
+_lock = threading.Lock()
+_state: Optional[str] = None
+_capture_dpi = BASE_DPI     # DPI of the window last resolved by client_map() (one SimPad per process)
+
+
+def _user32():
+    return ctypes.WinDLL("user32", use_last_error=True)
+
+
+def _current_awareness() -> str:
+    """Awareness the process actually runs with (set by us, a manifest or another library)."""
+    try:
+        user32 = _user32()
+        user32.GetThreadDpiAwarenessContext.restype = ctypes.c_void_p
+        user32.GetAwarenessFromDpiAwarenessContext.argtypes = [ctypes.c_void_p]
+        ctx = user32.GetThreadDpiAwarenessContext()
+        return _AWARENESS_NAMES.get(user32.GetAwarenessFromDpiAwarenessContext(ctx), "unknown")
+    except (AttributeError, OSError):
+        return "unknown"
+
+
+def enable(mode: Optional[str] = None) -> str:
+    """
+    Declare DPI awareness for the whole process (first call only; later calls return the
+    result). Returns the effective awareness: 'per-monitor' | 'system' | 'unaware' |
+    'unknown', or 'unavailable' off Windows.
+    """
+    global _state
+    if _state is not None:
+        return _state
+    with _lock:
+        if _state is not None:
+            return _state
+        mode = (mode or os.environ.get("SIMPAD_DPI", "per-monitor")).lower()
+        if mode not in MODES:
+            print(f"[WARN] Unknown SIMPAD_DPI={mode!r}, using 'per-monitor'")
+            mode = "per-monitor"
+        if not hasattr(ctypes, "WinDLL"):
+            _state = "unavailable"
+            return _state
+        if mode != "off":
+            user32 = _user32()
+            done = False
+            try:   # Windows 10 1703+
+                user32.SetProcessDpiAwarenessContext.argtypes = [ctypes.c_void_p]
+                done = bool(user32.SetProcessDpiAwarenessContext(ctypes.c_void_p(_CONTEXT[mode])))
+            except AttributeError:
+                pass
+            if not done:
+                try:   # Windows 8.1+
+                    done = ctypes.WinDLL("shcore").SetProcessDpiAwareness(_SHCORE[mode]) == 0
+                except (AttributeError, OSError):
+                    pass
+            if not done:
+                try:
+                    user32.SetProcessDPIAware()
+                except AttributeError:
+                    pass
+        _state = _current_awareness()
+        if mode != "off" and _state != mode:
+            print(f"[WARN] DPI awareness is '{_state}' (wanted '{mode}'): already fixed for this process")
+        return _state
+
+
+def awareness() -> Optional[str]:
+    """Result of enable(), or None before it ran."""
+    return _state
+
+
+def window_dpi(hwnd) -> int:
+    """DPI of the monitor the window is on (BASE_DPI when it cannot be queried)."""
+    try:
+        dpi = _user32().GetDpiForWindow(hwnd)      # Windows 10 1607+
+        return int(dpi) if dpi else BASE_DPI
+    except (AttributeError, OSError):
+        return BASE_DPI
+
+
+# ---------- one coordinate transform ----------
+
+def rel_box(width: int, height: int, rx: float, ry: float, rw: float, rh: float) -> Tuple[int, int, int, int]:
+    """Relative ROI -> (x, y, w, h) in client pixels (the rounding every capture and crop uses)."""
+    x = int(width * rx); y = int(height * ry)
+    w = max(1, int(width * rw)); h = max(1, int(height * rh))
+    return x, y, w, h
+
+
+class ClientMap(NamedTuple):
+    left: int           # client origin in screen pixels (physical when DPI-aware)
+    top: int
+    width: int
+    height: int
+    dpi: int = BASE_DPI
+
+    @property
+    def scale(self) -> float:
+        """Display scaling of the window (1.0 = 100 %, 1.5 = 150 %)."""
+        return self.dpi / float(BASE_DPI)
+
+    @property
+    def rect(self) -> Dict[str, int]:
+        """The get_client_rect() dict."""
+        return {"left": self.left, "top": self.top, "right": self.left + self.width,
+                "bottom": self.top + self.height, "width": self.width, "height": self.height}
+
+    @classmethod
+    def from_rect(cls, rect: Dict[str, int], dpi: int = BASE_DPI) -> "ClientMap":
+        return cls(rect["left"], rect["top"], rect["width"], rect["height"], dpi)
+
+    def box(self, rx: float, ry: float, rw: float, rh: float) -> Tuple[int, int, int, int]:
+        """Relative ROI -> (x, y, w, h) in client pixels."""
+        return rel_box(self.width, self.height, rx, ry, rw, rh)
+
+    def region(self, rx: float, ry: float, rw: float, rh: float) -> Tuple[int, int, int, int]:
+        """Relative ROI -> screen region (x, y, w, h) for a screen grab."""
+        x, y, w, h = self.box(rx, ry, rw, rh)
+        return self.left + x, self.top + y, w, h
+
+    def client_point(self, rx: float, ry: float) -> Tuple[int, int]:
+        """Relative point -> client pixels (for window messages)."""
+        return int(self.width * rx), int(self.height * ry)
+
+    def point(self, rx: float, ry: float) -> Tuple[int, int]:
+        """Relative point -> screen pixels (for the cursor)."""
+        x, y = self.client_point(rx, ry)
+        return self.left + x, self.top + y
+
+
+def client_map(hwnd) -> Optional[ClientMap]:
+    """
+    ClientMap of the window's client area, None if the window is not available.
+    Its DPI becomes the capture DPI the OCR upscale factors follow (capture_scale()).
+    """
+    global _capture_dpi
+    enable()
+    import win32gui
+    try:
+        if not hwnd or not win32gui.IsWindow(hwnd):
+            return None
+        l, t, r, b = win32gui.GetClientRect(hwnd)
+        (left, top) = win32gui.ClientToScreen(hwnd, (l, t))
+        (right, bottom) = win32gui.ClientToScreen(hwnd, (r, b))
+        if right <= left or bottom <= top:
+            return None
+        cm = ClientMap(left, top, right - left, bottom - top, window_dpi(hwnd))
+        _capture_dpi = cm.dpi
+        return cm
+    except Exception:
+        return None
+
+
+# ---------- OCR scale ----------
+
+def capture_scale() -> float:
+    """Display scale of the window captured last (1.0 until a client_map() was resolved)."""
+    return _capture_dpi / float(BASE_DPI)
+
+
+def upscale_for(tuned: float, scale: Optional[float] = None) -> float:
+    """
+    Upscale factor for a capture at 'scale' (default: capture_scale()): the factor tuned
+    at 96 dpi divided by the scale, so every display hands tesseract the same glyph size.
+    """
+    scale = capture_scale() if scale is None else scale
+    return max(1.0, tuned / max(scale, 1e-3))
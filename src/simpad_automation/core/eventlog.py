@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+Streaming report sink: one JSON line per event, appended and flushed as it happens.
+- events: session_start, test_start, step, test_end, session_end
+- artifacts (screenshots, clips) are referenced by path relative to the log, never embedded
+- one file per process: reports/events_<tag>.jsonl, reports/events_<tag>_<worker>.jsonl under xdist
+- a crashed run still leaves every event written so far; read_events() drops a torn last line
+
+Live view: serve the repo root (python -m http.server) and open /reports/viewer.html.
+Headless (stdlib only), safe to import on CI.
+"""
+
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from .workers import worker_id
+
+VIEWER = Path(__file__).resolve().parent / "report_viewer.html"
+
+
+def events_path(report_dir: Path | str, tag: str, worker: Optional[str] = None) -> Path:
+    wid = worker or worker_id()
+    return Path(report_dir) / (f"events_{tag}_{wid}.jsonl" if wid else f"events_{tag}.jsonl")
+
+
+class ReportSink:
+    """Append-only JSONL writer (thread-safe; every event is flushed to disk immediately)."""
+
+    def __init__(self, path: Path | str, durable: bool = False):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.durable = durable          # fsync each event (survives a power cut, not just a crash)
+        self._fh = open(self.path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def rel(self, p) -> Optional[str]:
+        """Artifact path as stored in the log: relative to the log's folder when possible."""
+        if not p:
+            return None
+        p = Path(p).resolve()
+        try:
+            return Path(os.path.relpath(p, self.path.parent.resolve())).as_posix()
+        except ValueError:              # other drive on Windows
+            return p.as_posix()
+
+    def emit(self, event: str, **fields) -> None:
+        rec = {"event": event, "ts": round(time.time(), 3)}
+        rec.update(fields)
+        line = json.dumps(rec, default=str, ensure_ascii=False)
+        with self._lock:
+            if self._fh.closed:
+                return
+            self._fh.write(line + "\n")
+            self._fh.flush()
+            if self.durable:
+                os.fsync(self._fh.fileno())
+            self.count += 1
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._fh.closed:
+                self._fh.close()
+
+
+# ---------- process-wide sink (opened by conftest, used by reporter.step) ----------
+
+_sink: Optional[ReportSink] = None
+
+def open_sink(path: Path | str, durable: bool = False) -> ReportSink:
+    global _sink
+    close_sink()
+    _sink = ReportSink(path, durable)
+    install_viewer(_sink.path.parent)
+    return _sink
+
+def current_sink() -> Optional[ReportSink]:
+    return _sink
+
+def emit(event: str, **fields) -> None:
+    """Write an event if a sink is open (no-op otherwise, e.g. plain unit test runs)."""
+    if _sink is not None:
+        _sink.emit(event, **fields)
+
+def artifact(p) -> Optional[str]:
+    """Path of an artifact as the open sink would store it (unchanged string without a sink)."""
+    if _sink is not None:
+        return _sink.rel(p)
+    return str(p) if p else None
+
+def close_sink() -> None:
+    global _sink
+    if _sink is not None:
+        _sink.close()
+        _sink = None
+
+
+def install_viewer(report_dir: Path | str) -> Optional[Path]:
+    """Copy the static viewer next to the logs (once per report folder)."""
+    dst = Path(report_dir) / "viewer.html"
+    try:
+        if not dst.exists() or dst.stat().st_mtime < VIEWER.stat().st_mtime:
+            shutil.copyfile(VIEWER, dst)
+        return dst
+    except OSError as e:
+        print(f"[WARN] Could not install report viewer: {e}")
+        return None
+
+
+# ---------- reading ----------
+
+def read_events(path: Path | str) -> List[Dict]:
+    """All complete events of a log; a torn last line (crash mid-write) is skipped."""
+    out: List[Dict] = []
+    with open(path, "r", encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                out.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return out
+
+
+def summarize(events: Iterable[Dict]) -> Dict[str, Dict]:
+    """
+    nodeid -> {"outcome", "duration", "steps": [...]}. A test that started but never
+    ended (crash, hang, killed worker) is reported as "interrupted".
+    """
+    tests: Dict[str, Dict] = {}
+    for ev in events:
+        kind, nodeid = ev.get("event"), ev.get("test")
+        if not nodeid:
+            continue
+        t = tests.setdefault(nodeid, {"outcome": "interrupted", "duration": None, "steps": []})
+        if kind == "step":
+            t["steps"].append({k: ev.get(k) for k in ("idx", "name", "status", "duration_ms", "screenshot")})
+        elif kind == "test_end":
+            t["outcome"] = ev.get("outcome")
+            t["duration"] = ev.get("duration")
+    return tests
@@ -0,0 +1,275 @@
+# -*- coding: utf-8 -*-
+"""
+Frame bus: one producer thread captures the SimPad client area; every consumer
+(HR reads, phrase checks, monitors, the flight recorder, failure screenshots) reads
+the same frames instead of grabbing its own screenshot.
+- ring of the last N frames: (seq, t, img, rect), img is read-only and shared by all readers
+- accessors: latest(), fresh(since=t) (captured after t), newer_than(seq), at(t)
+- the capture rate follows demand: subscribers ask for a rate (subscribe(hz)); a reader
+  waiting for a fresher frame wakes the producer at once; with no demand nothing is captured;
+  captures are never closer than 1 / max_hz, so simultaneous readers share one capture
+- the producer reuses nothing the readers may still hold: every capture is a new array,
+  the ring only drops its reference to the oldest one
+
+Example:
+    with FrameBus(hwnd) as bus:
+        f = bus.fresh()                  # captured after this call
+        hr_img = crop_rel(f.img, *HR_ROI)
+    print(bus.stats())
+
+conftest.py runs one bus per SimPad window (SIMPAD_FRAMEBUS=0 disables); ocr._grab_roi_bgr /
+_grab_client_bgr, RoiMonitor and ClipRecorder use it when it is running.
+"""
+
+import bisect
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from .dpi import rel_box
+
+DEFAULT_CAPACITY = 32
+MAX_HZ = 30.0          # hard cap of the capture rate
+IDLE_POLL_S = 0.5      # producer wake-up interval with no demand (only checks for stop / subscribers)
+
+Grab = Callable[[], Tuple[np.ndarray, Dict[str, int]]]
+
+
+class Frame(NamedTuple):
+    seq: int
+    t: float                     # perf_counter() when the capture started (content is not older)
+    img: np.ndarray              # BGR, read-only (shared by every reader)
+    rect: Dict[str, int]         # client rect the frame was taken from
+
+
+def crop_rel(img: np.ndarray, rx: float, ry: float, rw: float, rh: float) -> np.ndarray:
+    """Relative ROI view of a client-area frame (same rounding as screen regions, core.dpi)."""
+    H, W = img.shape[:2]
+    x, y, w, h = rel_box(W, H, rx, ry, rw, rh)
+    return img[y:y + h, x:x + w]
+
+
+def _quiet_client_grab(hwnd) -> Grab:
+    """Client-area capture without get_client_rect's per-call logging."""
+    def grab():
+        from .dpi import client_map
+        from .ocr import _grab_region_bgr
+        cm = client_map(hwnd)
+        if cm is None:
+            raise RuntimeError(f"FrameBus: client area of hwnd={hwnd} is not available")
+        return _grab_region_bgr(cm.region(0.0, 0.0, 1.0, 1.0)), cm.rect
+    return grab
+
+
+# ---------- registry (one bus per window) ----------
+
+_ACTIVE: Dict[int, "FrameBus"] = {}
+
+def active_bus(hwnd) -> Optional["FrameBus"]:
+    """Running bus for this window, if any."""
+    bus = _ACTIVE.get(hwnd) if hwnd is not None else None
+    return bus if bus is not None and bus.running else None
+
+
+class FrameBus:
+    """Single capture thread + ring of recent frames with demand-driven rate."""
+
+    def __init__(self, hwnd=None, grab: Optional[Grab] = None, capacity: int = DEFAULT_CAPACITY,
+                 max_hz: float = MAX_HZ, idle_hz: float = 0.0):
+        if grab is None and hwnd is None:
+            raise ValueError("FrameBus needs a hwnd or a grab function")
+        if capacity < 1 or max_hz <= 0:
+            raise ValueError("capacity must be >= 1 and max_hz > 0")
+        self.hwnd = hwnd
+        self._grab = grab or _quiet_client_grab(hwnd)
+        self.capacity = capacity
+        self.max_hz = max_hz
+        self.idle_hz = idle_hz
+        self._frames: List[Frame] = []
+        self._times: List[float] = []
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+        self._subs: Dict[int, float] = {}
+        self._sub_ids = itertools.count()
+        # counters
+        self._captures = 0
+        self._capture_s = 0.0
+        self._served = 0
+        self._shared = 0
+        self._last_served_seq = -1
+        self._t_start = 0.0
+        self._t_end = 0.0
+
+    # ---------- lifecycle ----------
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and not self._stop.is_set()
+
+    def start(self) -> "FrameBus":
+        if self._thread is not None:
+            raise RuntimeError("FrameBus already started")
+        self._t_start = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="frame-bus", daemon=True)
+        self._thread.start()
+        if self.hwnd is not None:
+            _ACTIVE[self.hwnd] = self
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+        self._t_end = time.perf_counter()
+        if self.hwnd is not None and _ACTIVE.get(self.hwnd) is self:
+            del _ACTIVE[self.hwnd]
+        if self._error is not None:
+            print(f"[WARN] FrameBus stopped early: {self._error}")
+
+    def __enter__(self) -> "FrameBus":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # ---------- demand ----------
+
+    @contextmanager
+    def subscribe(self, hz: float) -> Iterator["FrameBus"]:
+        """Keep the capture rate at >= hz (capped at max_hz) while the block runs."""
+        sid = next(self._sub_ids)
+        self._subs[sid] = hz
+        self._wake.set()
+        try:
+            yield self
+        finally:
+            self._subs.pop(sid, None)
+
+    def _rate(self) -> float:
+        return min(self.max_hz, max(max(self._subs.values(), default=0.0), self.idle_hz))
+
+    def _request(self) -> None:
+        """A reader needs a frame newer than what the ring has: capture now."""
+        self._wake.set()
+
+    # ---------- producer ----------
+
+    def _run(self) -> None:
+        last = -1e9
+        try:
+            while not self._stop.is_set():
+                rate = self._rate()
+                period = 1.0 / rate if rate > 0 else None
+                # sleep until the next scheduled capture (if anyone subscribed) or a reader's request
+                timeout = IDLE_POLL_S if period is None else max(0.0, last + period - time.perf_counter())
+                requested = self._wake.wait(timeout)
+                if self._stop.is_set():
+                    break
+                if not requested and (period is None or time.perf_counter() < last + period):
+                    continue
+                gap = last + 1.0 / self.max_hz - time.perf_counter()
+                if gap > 0 and self._stop.wait(gap):        # never faster than max_hz
+                    break
+                self._wake.clear()
+                last = self._capture()
+        except BaseException as e:  # window closed etc.; readers get it from _check()
+            self._error = e
+            with self._cond:
+                self._cond.notify_all()
+
+    def _capture(self) -> float:
+        t0 = time.perf_counter()
+        img, rect = self._grab()
+        img.flags.writeable = False
+        with self._cond:
+            self._seq += 1
+            self._frames.append(Frame(self._seq, t0, img, rect))
+            self._times.append(t0)
+            if len(self._frames) > self.capacity:
+                del self._frames[0], self._times[0]
+            self._cond.notify_all()
+        self._captures += 1
+        self._capture_s += time.perf_counter() - t0
+        return t0
+
+    # ---------- consumers ----------
+
+    def _check(self) -> None:
+        if self._error is not None:
+            raise RuntimeError(f"FrameBus capture failed: {self._error}") from self._error
+        if not self.running:
+            raise RuntimeError("FrameBus is not running")
+
+    def _serve(self, f: Frame) -> Frame:
+        self._served += 1
+        if f.seq == self._last_served_seq:
+            self._shared += 1
+        self._last_served_seq = f.seq
+        return f
+
+    def latest(self) -> Optional[Frame]:
+        """Most recent frame without waiting (None before the first capture)."""
+        with self._cond:
+            return self._serve(self._frames[-1]) if self._frames else None
+
+    def newer_than(self, seq: int, timeout: float = 2.0) -> Frame:
+        """First frame with a sequence number above seq (waits for the producer)."""
+        deadline = time.perf_counter() + timeout
+        with self._cond:
+            while True:
+                if self._frames and self._frames[-1].seq > seq:
+                    i = bisect.bisect_right([f.seq for f in self._frames], seq)
+                    return self._serve(self._frames[i])
+                self._check()
+                left = deadline - time.perf_counter()
+                if left <= 0:
+                    raise RuntimeError(f"FrameBus: no frame newer than seq {seq} within {timeout:.1f} s")
+                self._request()
+                self._cond.wait(timeout=min(left, 0.1))
+
+    def fresh(self, since: Optional[float] = None, timeout: float = 2.0) -> Frame:
+        """A frame captured after 'since' (default: now) - what a synchronous grab would return."""
+        since = time.perf_counter() if since is None else since
+        deadline = time.perf_counter() + timeout
+        with self._cond:
+            while True:
+                if self._frames and self._frames[-1].t >= since:
+                    return self._serve(self._frames[-1])
+                self._check()
+                left = deadline - time.perf_counter()
+                if left <= 0:
+                    raise RuntimeError(f"FrameBus: no frame within {timeout:.1f} s")
+                self._request()
+                self._cond.wait(timeout=min(left, 0.1))
+
+    def at(self, t: float) -> Optional[Frame]:
+        """Frame that was on screen at time t: the last one captured at or before t (None if older than the ring)."""
+        with self._cond:
+            i = bisect.bisect_right(self._times, t)
+            return self._serve(self._frames[i - 1]) if i else None
+
+    # ---------- reporting ----------
+
+    def stats(self) -> Dict[str, float]:
+        end = self._t_end if self._stop.is_set() and self._t_end else time.perf_counter()
+        elapsed = max(1e-9, end - self._t_start) if self._t_start else 0.0
+        return {
+            "captures": self._captures,
+            "capture_hz": round(self._captures / elapsed, 2) if elapsed else 0.0,
+            "capture_ms": round(1000.0 * self._capture_s / max(1, self._captures), 2),
+            "served": self._served,
+            "shared": self._shared,
+            "buffered": len(self._frames),
+            "elapsed_s": round(elapsed, 3),
+        }
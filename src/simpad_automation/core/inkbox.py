@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+ROI tightening: find where the ink actually is inside a (deliberately generous) ROI,
+so only that crop is upscaled and OCRed.
+- ink = pixels far from the ROI background colour (median of the border pixels),
+  or a caller-supplied mask (e.g. the HR green mask)
+- bbox from row/column projection profiles at native resolution (no upscaling yet)
+- a guard margin proportional to the ink height keeps anti-aliased edges and gives
+  tesseract the blank border it expects
+The ROIs in ui/controls.py stay wide; this only trims what gets processed.
+Disable with SIMPAD_ROI_TIGHTEN=0.
+"""
+
+import os
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+from .bufpool import scratch
+
+ENABLED = os.environ.get("SIMPAD_ROI_TIGHTEN", "1") != "0"
+
+INK_DELTA = 48       # min colour distance (max over B, G, R) from the background to count as ink
+MIN_COUNT = 2        # a row/column needs this many ink pixels (ignores single noisy pixels)
+MARGIN = 0.35        # guard margin around the ink, as a fraction of the ink height
+MIN_MARGIN_PX = 4
+MIN_GAIN = 0.15      # keep the ROI as is if tightening would drop less than this share of pixels
+
+
+def contrast_mask(img_bgr: np.ndarray, delta: int = INK_DELTA) -> np.ndarray:
+    """
+    Mask (0/255, pooled) of pixels that differ from the ROI background colour
+    (dark-on-light or light-on-dark).
+    """
+    img = img_bgr if img_bgr.ndim == 3 else img_bgr[:, :, None]
+    border = np.concatenate([img[0], img[-1], img[:, 0], img[:, -1]])
+    bg = [float(v) for v in np.median(border, axis=0)]
+    diff = cv2.absdiff(img_bgr, tuple(bg + [0.0] * (4 - len(bg))), dst=scratch("ink.diff", img_bgr.shape))
+    if diff.ndim == 3:
+        diff = diff.max(axis=2, out=scratch("ink.max", diff.shape[:2]))
+    _, mask = cv2.threshold(diff, delta, 255, cv2.THRESH_BINARY, dst=scratch("ink.mask", diff.shape))
+    return mask
+
+
+def ink_bbox(img_bgr: np.ndarray, mask: Optional[np.ndarray] = None,
+             min_count: int = MIN_COUNT) -> Optional[Tuple[int, int, int, int]]:
+    """(x, y, w, h) of the ink in the ROI, or None if there is none."""
+    if mask is None:
+        mask = contrast_mask(img_bgr)
+    cols = np.flatnonzero(np.count_nonzero(mask, axis=0) >= min_count)
+    rows = np.flatnonzero(np.count_nonzero(mask, axis=1) >= min_count)
+    if cols.size == 0 or rows.size == 0:
+        return None
+    x0, x1, y0, y1 = int(cols[0]), int(cols[-1]), int(rows[0]), int(rows[-1])
+    return x0, y0, x1 - x0 + 1, y1 - y0 + 1
+
+
+def tighten(img_bgr: np.ndarray, mask: Optional[np.ndarray] = None,
+            margin: float = MARGIN, min_margin_px: int = MIN_MARGIN_PX
+            ) -> Tuple[np.ndarray, Tuple[int, int, int, int]]:
+    """
+    Crop (a view, no copy) of the ink + guard margin and its box (x, y, w, h) in the ROI.
+    Returns the ROI unchanged when disabled, when no ink is found, or when the gain is small.
+    """
+    H, W = img_bgr.shape[:2]
+    full = (0, 0, W, H)
+    if not ENABLED:
+        return img_bgr, full
+    box = ink_bbox(img_bgr, mask)
+    if box is None:
+        return img_bgr, full
+    x, y, w, h = box
+    m = max(min_margin_px, int(round(margin * h)))
+    x0, y0 = max(0, x - m), max(0, y - m)
+    x1, y1 = min(W, x + w + m), min(H, y + h + m)
+    if (x1 - x0) * (y1 - y0) > (1.0 - MIN_GAIN) * W * H:
+        return img_bgr, full
+    return img_bgr[y0:y1, x0:x1], (x0, y0, x1 - x0, y1 - y0)
@@ -1,22 +1,48 @@
 import time
-import pyautogui
 
-# Base settings of pyautogui for stability
-pyautogui.FAILSAFE = False          # fix exeption with position in the corner of the window
-pyautogui.PAUSE = 0.02              # small pause betwenn commands
+# pyautogui is configured once in core.backend (FAILSAFE off, PAUSE from the timing profile)
+from .backend import gui
+from .timing import current_timing
 
-def type_text(text: str, interval: float = 0.03):
+VK_RETURN = 0x0D
+VK_BACK = 0x08
+
+def _post_to(hwnd) -> bool:
+    """Keyboard goes to hwnd as window messages (background input backend), not global SendInput."""
+    if hwnd is None:
+        return False
+    from .window import _use_messages
+    return _use_messages(hwnd)
+
+def type_text(text: str, interval: float | None = None, hwnd=None):
     """
     Print text like a human
-    interval — delay between symbols
+    interval — delay between symbols (default: key_interval of the timing profile)
+    hwnd — target window for the background input backend (see window.set_input_backend)
     """
-    pyautogui.typewrite(text, interval=interval)
+    if interval is None:
+        interval = current_timing().key_interval
+    if _post_to(hwnd):
+        from .bginput import post_text
+        post_text(hwnd, text, interval=interval)
+        return
+    gui().typewrite(text, interval=interval)
 
-def press_enter():
-    pyautogui.press('enter')
+def press_enter(hwnd=None):
+    if _post_to(hwnd):
+        from .bginput import post_key
+        post_key(hwnd, VK_RETURN)
+        return
+    gui().press('enter')
 
-def press_backspace(n: int = 1, interval: float = 0.02):
-    """Press Backspace n times."""
+def press_backspace(n: int = 1, interval: float | None = None, hwnd=None):
+    """Press Backspace n times (interval default: key_repeat of the timing profile)."""
+    if interval is None:
+        interval = current_timing().key_repeat
     for _ in range(max(0, n)):
-        pyautogui.press('backspace')
-        time.sleep(interval)
\ No newline at end of file
+        if _post_to(hwnd):
+            from .bginput import post_key
+            post_key(hwnd, VK_BACK)
+        else:
+            gui().press('backspace')
+        time.sleep(interval)
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""
+Continuous ROI sampling (e.g. HR while dragging HR_SLIDER / after ACTIVATE_BUTTON).
+- background thread grabs the ROI at a fixed rate
+- recognition is skipped when the ROI pixels did not change since the last sample
+- samples go to a TimeSeriesRing (timestamp, value, confidence) for assertions
+
+Example:
+    with RoiMonitor(hwnd, rate_hz=10) as mon:
+        t0 = mon.mark()
+        click_relative(hwnd, *ui.ACTIVATE_BUTTON)
+        mon.series.assert_reaches(100, within_s=2.0, since=t0)
+    print(mon.stats())
+"""
+
+import threading
+import time
+from typing import Optional, Tuple, Callable, Dict
+
+import numpy as np
+
+from simpad_automation.ui.controls import HR_ROI
+from .ocr import _roi_region, _grab_region_bgr, _vote_frame, _Votes
+from .timeseries import TimeSeriesRing
+
+Reader = Callable[[np.ndarray], Tuple[Optional[int], Optional[float]]]
+
+
+def _default_reader(rw: float) -> Reader:
+    """Same voting logic as read_digits_conf, on one already grabbed frame."""
+    def read(img_bgr: np.ndarray) -> Tuple[Optional[int], Optional[float]]:
+        votes = _Votes()
+        val = _vote_frame(img_bgr, rw, votes)
+        if val is None:
+            val = votes.best()
+        return val, (votes.conf(val) if val is not None else None)
+    return read
+
+
+class RoiMonitor:
+    """Samples one ROI in a background thread into a fixed-size ring buffer."""
+
+    def __init__(self, hwnd, roi: Tuple[float, float, float, float] = HR_ROI,
+                 rate_hz: float = 10.0, capacity: int = 1024,
+                 reader: Optional[Reader] = None):
+        if rate_hz <= 0:
+            raise ValueError("rate_hz must be > 0")
+        self.hwnd = hwnd
+        self.roi = roi
+        self.period = 1.0 / rate_hz
+        self.series = TimeSeriesRing(capacity)
+        self._reader = reader or _default_reader(roi[2])
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+        # counters
+        self._ticks = 0
+        self._recognized = 0
+        self._unchanged = 0
+        self._dropped = 0
+        self._t_start = 0.0
+        self._t_end = 0.0
+
+    # ---------- lifecycle ----------
+
+    def start(self) -> "RoiMonitor":
+        if self._thread is not None:
+            raise RuntimeError("RoiMonitor already started")
+        from .framebus import active_bus
+        if active_bus(self.hwnd) is None:
+            # own grabs: resolved once, the window does not move while sampling
+            from .window import get_client_rect
+            rect = get_client_rect(self.hwnd)
+            if not rect:
+                raise RuntimeError("RoiMonitor: client rect is not available")
+            self._region = _roi_region(rect, *self.roi)
+        self._t_start = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="roi-monitor", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+        self._t_end = time.perf_counter()
+        if self._error is not None:
+            raise RuntimeError(f"RoiMonitor sampling failed: {self._error}") from self._error
+
+    def __enter__(self) -> "RoiMonitor":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.stop()
+            return
+        # the with-block already failed: its error is the one to report, not the monitor's
+        try:
+            self.stop()
+        except RuntimeError as e:
+            print(f"[WARN] {e}")
+
+    @staticmethod
+    def mark() -> float:
+        """Timestamp on the same clock as the samples (use as 'since' in assertions)."""
+        return time.perf_counter()
+
+    # ---------- sampling loop ----------
+
+    def _grab_loop(self):
+        """Yields (t, roi image) at the sampling rate: from the shared capture thread if one runs."""
+        from .framebus import active_bus, crop_rel
+        bus = active_bus(self.hwnd)
+        if bus is None:
+            while True:
+                t = time.perf_counter()
+                yield t, _grab_region_bgr(self._region)
+        seq = 0
+        with bus.subscribe(1.0 / self.period):
+            while True:
+                f = bus.newer_than(seq, timeout=max(2.0, 4 * self.period))
+                seq = f.seq
+                yield f.t, crop_rel(f.img, *self.roi)
+
+    def _run(self) -> None:
+        prev_img: Optional[np.ndarray] = None
+        prev_val: Optional[int] = None
+        prev_conf: Optional[float] = None
+        deadline = time.perf_counter()
+        frames = self._grab_loop()
+        try:
+            while not self._stop.is_set():
+                t, img = next(frames)
+                if prev_img is not None and img.shape == prev_img.shape and np.array_equal(img, prev_img):
+                    self._unchanged += 1
+                else:
+                    prev_val, prev_conf = self._reader(img)
+                    prev_img = img
+                    self._recognized += 1
+                self.series.append(t, prev_val, prev_conf)
+                self._ticks += 1
+
+                # fixed-rate schedule; ticks we could not keep up with are counted as dropped
+                deadline += self.period
+                now = time.perf_counter()
+                if now > deadline:
+                    missed = int((now - deadline) // self.period)
+                    self._dropped += missed
+                    deadline += missed * self.period
+                self._stop.wait(max(0.0, deadline - now))
+        except BaseException as e:  # surfaced by stop()
+            self._error = e
+        finally:
+            frames.close()
+
+    # ---------- reporting ----------
+
+    def stats(self) -> Dict[str, float]:
+        end = self._t_end if self._stop.is_set() and self._t_end else time.perf_counter()
+        elapsed = max(1e-9, end - self._t_start) if self._t_start else 0.0
+        return {
+            "target_hz": round(1.0 / self.period, 2),
+            "achieved_hz": round(self._ticks / elapsed, 2) if elapsed else 0.0,
+            "samples": self._ticks,
+            "recognized": self._recognized,
+            "skipped_unchanged": self._unchanged,
+            "dropped": self._dropped,
+            "elapsed_s": round(elapsed, 3),
+        }
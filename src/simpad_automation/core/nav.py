@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""
+Navigation planner: shortest path between SimPad screens over the ui.navigation graph,
+executed hop by hop with screen verification (core.screens) and re-planning on surprises.
+
+Example:
+    navigate(hwnd, "hr_slider")      # from wherever the app currently is
+"""
+
+from __future__ import annotations
+import heapq
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from simpad_automation.ui import controls as ui
+from simpad_automation.ui.navigation import NAV_EDGES, SCREENS, SESSION_FORM
+
+
+@dataclass(frozen=True)
+class Edge:
+    src: str
+    dst: str
+    action: str     # "click" | "drag" | "form"
+    control: str    # attribute name in ui.controls
+    settle: float   # seconds the screen needs after the action
+
+    def describe(self) -> str:
+        return f"{self.src} --{self.action} {self.control}--> {self.dst}"
+
+
+class NavGraph:
+    def __init__(self, edges: List[Edge]):
+        self.edges = list(edges)
+        self.out: Dict[str, List[Edge]] = {}
+        for e in self.edges:
+            self.out.setdefault(e.src, []).append(e)
+
+    @classmethod
+    def from_spec(cls, spec=NAV_EDGES, screens=SCREENS) -> "NavGraph":
+        for control, _text in SESSION_FORM:
+            if not hasattr(ui, control):
+                raise ValueError(f"navigation: controls.py has no '{control}'")
+        edges = []
+        for src, dst, action, control, settle in spec:
+            for s in (src, dst):
+                if s not in screens:
+                    raise ValueError(f"navigation: unknown screen '{s}'")
+            if not hasattr(ui, control):
+                raise ValueError(f"navigation: controls.py has no '{control}'")
+            if action not in ("click", "drag", "form"):
+                raise ValueError(f"navigation: unknown action '{action}'")
+            edges.append(Edge(src, dst, action, control, float(settle)))
+        return cls(edges)
+
+    def plan(self, src: str, dst: str) -> List[Edge]:
+        """Cheapest path by total settle time (Dijkstra); [] if already there."""
+        if src == dst:
+            return []
+        dist = {src: 0.0}
+        prev: Dict[str, Edge] = {}
+        heap = [(0.0, src)]
+        while heap:
+            d, node = heapq.heappop(heap)
+            if node == dst:
+                break
+            if d > dist.get(node, float("inf")):
+                continue
+            for e in self.out.get(node, []):
+                nd = d + e.settle + 0.05   # per-hop cost so equal-time paths prefer fewer clicks
+                if nd < dist.get(e.dst, float("inf")):
+                    dist[e.dst] = nd
+                    prev[e.dst] = e
+                    heapq.heappush(heap, (nd, e.dst))
+        if dst not in prev:
+            raise ValueError(f"navigation: no path from '{src}' to '{dst}'")
+        path = []
+        node = dst
+        while node != src:
+            e = prev[node]
+            path.append(e)
+            node = e.src
+        return path[::-1]
+
+    def round_trip(self, a: str, b: str) -> Tuple[Edge, Edge]:
+        """Single-click edges a -> b and b -> a (a reversible toggle); ValueError if the graph has none."""
+        there = [e for e in self.out.get(a, []) if e.dst == b and e.action == "click"]
+        back = [e for e in self.out.get(b, []) if e.dst == a and e.action == "click"]
+        if not there or not back:
+            raise ValueError(f"navigation: '{a}' <-> '{b}' is not a single-click round trip")
+        return there[0], back[0]
+
+
+_graph: Optional[NavGraph] = None
+
+def default_graph() -> NavGraph:
+    global _graph
+    if _graph is None:
+        _graph = NavGraph.from_spec()
+    return _graph
+
+
+def _fill_session_form(hwnd) -> None:
+    """Name session, instructor, participant: the entries the E2E scenario makes before the large OK."""
+    from .window import click_relative, ensure_focus
+    from .input import type_text
+    for control, text in SESSION_FORM:
+        click_relative(hwnd, *getattr(ui, control), delay=0.2)
+        click_relative(hwnd, *ui.CLEAR_BUTTON, delay=0.25)
+        ensure_focus(hwnd, *ui.OVERLAY_FOCUS); time.sleep(0.15)
+        type_text(text, interval=0.03, hwnd=hwnd); time.sleep(0.25)
+        click_relative(hwnd, *ui.OK_BUTTON_SMALL, delay=0.5)
+
+
+def _perform(hwnd, edge: Edge) -> None:
+    from .window import click_relative, drag_relative
+    target = getattr(ui, edge.control)
+    if edge.action == "form":
+        _fill_session_form(hwnd)
+        click_relative(hwnd, *target)
+    elif edge.action == "click":
+        click_relative(hwnd, *target)
+    else:
+        (start, end) = target
+        drag_relative(hwnd, *start, *end)
+
+
+def follow(hwnd, path: List[Edge]) -> None:
+    """Perform the edges open-loop, waiting each edge's settle time (no screen library needed)."""
+    for edge in path:
+        _perform(hwnd, edge)
+        time.sleep(edge.settle)
+
+
+def navigate(hwnd, target: str, graph: Optional[NavGraph] = None, library=None,
+             max_replans: int = 2, extra_wait: float = 1.5) -> List[Edge]:
+    """
+    Go from the detected current screen to 'target'. Each hop is verified with
+    wait_for_screen(edge.dst); on an unexpected screen the rest is re-planned from there.
+    Returns the edges actually executed.
+    """
+    from .screens import identify_screen, wait_for_screen
+
+    graph = graph or default_graph()
+    done: List[Edge] = []
+    replans = 0
+    current = identify_screen(hwnd, library).name
+    if current is None:
+        raise RuntimeError("navigate: current screen is unknown (not in the screen library; "
+                           "record it with SIMPAD_SCREENS=record, see core/screens.py)")
+    path = graph.plan(current, target)
+    print(f"[NAV] {current} -> {target}: " + (" | ".join(e.describe() for e in path) or "already there"))
+
+    while path:
+        edge = path.pop(0)
+        _perform(hwnd, edge)
+        done.append(edge)
+        try:
+            wait_for_screen(hwnd, edge.dst, timeout=edge.settle + extra_wait, library=library)
+        except AssertionError:
+            actual = identify_screen(hwnd, library).name
+            if actual is None or replans >= max_replans:
+                raise AssertionError(f"navigate: after '{edge.describe()}' expected '{edge.dst}', "
+                                     f"got '{actual}' (replans={replans})")
+            replans += 1
+            path = graph.plan(actual, target)
+            print(f"[NAV] landed on '{actual}', re-planned: " + " | ".join(e.describe() for e in path))
+    return done
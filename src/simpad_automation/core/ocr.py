@@ -2,79 +2,116 @@
 
 import time
 import re
-from typing import Optional, List
+from typing import Optional, List, Tuple, Dict, NamedTuple
 
 import numpy as np
 import cv2
-import pyautogui
-import pytesseract
 
-from .window import get_client_rect
+from .backend import gui, ocr_engine
+from .bufpool import scratch, resize_by
+from .inkbox import tighten
+from .dpi import ClientMap, rel_box, upscale_for
+from .budget import budget
+from .timing import current_timing
+from .framebus import active_bus, crop_rel
 from simpad_automation.ui.controls import HR_ROI
 
-pyautogui.FAILSAFE = False
-pyautogui.PAUSE = 0.02
-
 # ---------- base utils ----------
 
+DIGIT_UPSCALE = 3.0   # tuned on 96-dpi captures; divided by the display scale (core.dpi.upscale_for)
+
+def _roi_region(rect: Dict[str, int], rx: float, ry: float, rw: float, rh: float) -> Tuple[int, int, int, int]:
+    """Relative ROI -> absolute screen region (x, y, w, h) for a known client rect."""
+    return ClientMap.from_rect(rect).region(rx, ry, rw, rh)
+
+def _grab_region_bgr(region: Tuple[int, int, int, int]) -> np.ndarray:
+    # asarray: view on the PIL buffer, the BGR conversion is the only copy (the caller keeps it)
+    img_rgb = np.asarray(gui().screenshot(region=region))
+    return cv2.cvtColor(img_rgb, cv2.COLOR_RGB2BGR)
+
 def _grab_roi_bgr(hwnd, rx: float, ry: float, rw: float, rh: float) -> np.ndarray:
+    bus = active_bus(hwnd)
+    if bus is not None:   # shared capture (core.framebus): crop of a frame taken after this call
+        return crop_rel(bus.fresh().img, rx, ry, rw, rh).copy()
+    from .window import get_client_rect
     rect = get_client_rect(hwnd)
     if not rect:
         raise RuntimeError("get_client_rect failed in _grab_roi_bgr")
-    x = int(rect["left"] + rect["width"]  * rx)
-    y = int(rect["top"]  + rect["height"] * ry)
-    w = max(1, int(rect["width"]  * rw))
-    h = max(1, int(rect["height"] * rh))
-    img_rgb = np.array(pyautogui.screenshot(region=(x, y, w, h)))
-    return cv2.cvtColor(img_rgb, cv2.COLOR_RGB2BGR)
+    return _grab_region_bgr(_roi_region(rect, rx, ry, rw, rh))
+
+def _grab_client_bgr(hwnd) -> Tuple[np.ndarray, Dict[str, int]]:
+    """One screenshot of the whole client area (BGR) + the client rect it was taken from."""
+    bus = active_bus(hwnd)
+    if bus is not None:
+        f = bus.fresh()
+        return f.img.copy(), dict(f.rect)
+    from .window import get_client_rect
+    rect = get_client_rect(hwnd)
+    if not rect:
+        raise RuntimeError("get_client_rect failed in _grab_client_bgr")
+    region = (rect["left"], rect["top"], max(1, rect["width"]), max(1, rect["height"]))
+    return _grab_region_bgr(region), rect
+
+def _crop_rel(img: np.ndarray, rx: float, ry: float, rw: float, rh: float) -> np.ndarray:
+    """Cut a relative ROI out of a client-area image (same rounding as _grab_roi_bgr)."""
+    H, W = img.shape[:2]
+    x, y, w, h = rel_box(W, H, rx, ry, rw, rh)
+    return img[y:y + h, x:x + w]
 
 def _scale_and_binarize(gray: np.ndarray) -> np.ndarray:
-    # Improve size of screenshot, to make zeros bigger
-    big = cv2.resize(gray, None, fx=3, fy=3, interpolation=cv2.INTER_CUBIC)
-    # Soft adding contrast
-    big = cv2.GaussianBlur(big, (3, 3), 0)
-    _, thr = cv2.threshold(big, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-    return thr
-
-    # Launch tesseract in string mode (psm), and add only numbers to whitelist
-def _tess_digits(img_bin: np.ndarray, psm: int = 7) -> Optional[int]:
+    """Pooled result: valid until the next call on this thread (copy to keep it)."""
+    # Improve size of screenshot, to make zeros bigger (3x at 96 dpi, less on a high-DPI capture)
+    big = resize_by(gray, upscale_for(DIGIT_UPSCALE), "sb.big")
+    # Soft adding contrast (in place)
+    cv2.GaussianBlur(big, (3, 3), 0, dst=big)
+    cv2.threshold(big, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU, dst=big)
+    return big
+
+    # Launch tesseract in line mode (psm), and add only numbers to whitelist
+def _tess_digits(img_bin: np.ndarray, psm: int = 7) -> Tuple[Optional[int], float]:
+    """First number in the image + its tesseract confidence (0..100)."""
     cfg = f"--psm {psm} -c tessedit_char_whitelist=0123456789"
-    txt = pytesseract.image_to_string(img_bin, config=cfg)
-    m = re.search(r"(\d+)", txt)
-    if not m:
-        return None
-    try:
-        return int(m.group(1))
-    except Exception:
-        return None
+    pytesseract = ocr_engine()
+    data = pytesseract.image_to_data(img_bin, config=cfg, output_type=pytesseract.Output.DICT)
+    for text, conf in zip(data["text"], data["conf"]):
+        m = re.search(r"(\d+)", str(text))
+        if m:
+            return int(m.group(1)), max(0.0, float(conf))
+    return None, 0.0
 
 # ---------- main strategy ----------
 
-def _ocr_passes(img_bgr: np.ndarray) -> Optional[int]:
-    """Different ways how to check numbers."""
-    # 1) By green mask (HR green text). It's better to store RGB colours code in ui/controls file
-    hsv = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2HSV)
-    lower = np.array([35, 60, 60], dtype=np.uint8)
-    upper = np.array([90, 255, 255], dtype=np.uint8)
-    mask = cv2.inRange(hsv, lower, upper)
-    mask = cv2.morphologyEx(mask, cv2.MORPH_DILATE, np.ones((2,2), np.uint8))
-    val = _tess_digits(_scale_and_binarize(mask), psm=7)
-    if val is not None:
-        return val
+_GREEN_LO = np.array([35, 60, 60], dtype=np.uint8)
+_GREEN_HI = np.array([90, 255, 255], dtype=np.uint8)
+_K2 = np.ones((2, 2), np.uint8)
 
-    # 2) Binarize by brightness
-    gray = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2GRAY)
-    val = _tess_digits(_scale_and_binarize(gray), psm=7)
-    if val is not None:
-        return val
+def _green_mask(img_bgr: np.ndarray) -> np.ndarray:
+    """HR-style green digits as a white-on-black mask (pooled)."""
+    # It's better to store RGB colours code in ui/controls file
+    hsv = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2HSV, dst=scratch("gm.hsv", img_bgr.shape))
+    mask = cv2.inRange(hsv, _GREEN_LO, _GREEN_HI, dst=scratch("gm.mask", img_bgr.shape[:2]))
+    return cv2.morphologyEx(mask, cv2.MORPH_DILATE, _K2, dst=scratch("gm.dilate", img_bgr.shape[:2]))
 
+def _tighten_digits(img_bgr: np.ndarray) -> np.ndarray:
+    """Crop the ROI to the digits (+ guard margin) before any upscaling: green ink if present, else contrast."""
+    hsv = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2HSV, dst=scratch("td.hsv", img_bgr.shape))
+    green = cv2.inRange(hsv, _GREEN_LO, _GREEN_HI, dst=scratch("td.mask", img_bgr.shape[:2]))
+    crop, _box = tighten(img_bgr, green if cv2.countNonZero(green) >= 8 else None)
+    return crop
+
+def _digit_passes(img_bgr: np.ndarray):
+    """Different ways how to check numbers, lazily: yields (value, conf) per pass."""
+    # 1) By green mask (HR green text)
+    yield _tess_digits(_scale_and_binarize(_green_mask(img_bgr)), psm=7)
+    # 2) Binarize by brightness
+    gray = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2GRAY, dst=scratch("dp.gray", img_bgr.shape[:2]))
+    yield _tess_digits(_scale_and_binarize(gray), psm=7)
     # 3) Invert binarize
-    gray_inv = 255 - gray
-    val = _tess_digits(_scale_and_binarize(gray_inv), psm=7)
-    return val
+    inv = cv2.bitwise_not(gray, dst=scratch("dp.inv", gray.shape))
+    yield _tess_digits(_scale_and_binarize(inv), psm=7)
 
-def _segments_left_to_right(bin_img: np.ndarray) -> List[np.ndarray]:
-    """Prepare to cut HR value to the separate symbols"""
+def _segment_boxes(bin_img: np.ndarray) -> List[Tuple[int, int, int, int]]:
+    """Padded (x, y, w, h) boxes of the separate symbols, sorted left to right."""
     # Expand the strokes a little so that the contours are solid
     k = np.ones((3,3), np.uint8)
     proc = cv2.morphologyEx(bin_img, cv2.MORPH_CLOSE, k, iterations=1)
@@ -85,71 +122,250 @@ def _segments_left_to_right(bin_img: np.ndarray) -> List[np.ndarray]:
     boxes = [b for b in boxes if b[2] * b[3] >= 20]
     # Sort from left to right
     boxes.sort(key=lambda b: b[0])
-    # Cut symbols
-    crops = []
+    padded = []
     for (x, y, w, h) in boxes:
         pad = 2
         x0 = max(0, x - pad); y0 = max(0, y - pad)
         x1 = min(bin_img.shape[1], x + w + pad)
         y1 = min(bin_img.shape[0], y + h + pad)
-        crops.append(bin_img[y0:y1, x0:x1])
-    return crops
+        padded.append((x0, y0, x1 - x0, y1 - y0))
+    return padded
 
-def _ocr_by_components(img_bgr: np.ndarray) -> Optional[int]:
-    """Character recognition: psm=10, then gluing."""
-    gray = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2GRAY)
-    bin_img = _scale_and_binarize(gray)
+def _segments_left_to_right(bin_img: np.ndarray) -> List[np.ndarray]:
+    """Prepare to cut HR value to the separate symbols"""
+    return [bin_img[y:y+h, x:x+w] for (x, y, w, h) in _segment_boxes(bin_img)]
+
+# ---------- batched glyph recognition ----------
+
+GLYPH_H = 48        # every glyph is scaled to this height on the canvas
+GLYPH_GAP = 32      # fixed blank spacing between glyphs (keeps them separate words)
+GLYPH_MARGIN = 16   # blank border around the canvas
+
+class Glyph(NamedTuple):
+    idx: int                        # position in the left-to-right segmentation
+    box: Tuple[int, int, int, int]  # (x, y, w, h) in the binarized ROI
+    digit: str
+    conf: float                     # tesseract confidence 0..100
+
+def _stitch_glyphs(crops: List[np.ndarray], glyph_h: int = GLYPH_H, gap: int = GLYPH_GAP,
+                   margin: int = GLYPH_MARGIN) -> Tuple[np.ndarray, List[Tuple[int, int]]]:
+    """
+    Put all glyph crops on one canvas: same height, fixed spacing, same background.
+    Returns the canvas and the (x0, x1) span of every glyph on it.
+    """
+    # Background = majority value on the crop borders (Otsu may give white-on-black)
+    border = np.concatenate([np.concatenate([c[0], c[-1], c[:, 0], c[:, -1]]) for c in crops])
+    bg = 255 if np.mean(border) > 127 else 0
 
-    crops = _segments_left_to_right(bin_img)
-    if not crops:
-        return None
+    scaled = []
+    for c in crops:
+        w = max(1, int(round(c.shape[1] * glyph_h / max(1, c.shape[0]))))
+        g = cv2.resize(c, (w, glyph_h), interpolation=cv2.INTER_LINEAR)
+        _, g = cv2.threshold(g, 127, 255, cv2.THRESH_BINARY)
+        scaled.append(g)
 
-    digits = []
-    for crop in crops:
-        # PSM 10 — one symbol, whitelist only numbers
-        cfg = "--psm 10 -c tessedit_char_whitelist=0123456789"
-        txt = pytesseract.image_to_string(crop, config=cfg)
-        d = re.sub(r"\D", "", txt)
+    width = 2 * margin + sum(g.shape[1] for g in scaled) + gap * (len(scaled) - 1)
+    canvas = np.full((glyph_h + 2 * margin, width), bg, dtype=np.uint8)
+    spans = []
+    x = margin
+    for g in scaled:
+        canvas[margin:margin + glyph_h, x:x + g.shape[1]] = g
+        spans.append((x, x + g.shape[1]))
+        x += g.shape[1] + gap
+    return canvas, spans
+
+def _tess_glyph(crop: np.ndarray) -> Tuple[str, float]:
+    """One symbol via psm 10 (used only for glyphs the batched read missed)."""
+    cfg = "--psm 10 -c tessedit_char_whitelist=0123456789"
+    pytesseract = ocr_engine()
+    data = pytesseract.image_to_data(crop, config=cfg, output_type=pytesseract.Output.DICT)
+    best, best_conf = "", -1.0
+    for text, conf in zip(data["text"], data["conf"]):
+        d = re.sub(r"\D", "", str(text))
+        if d and float(conf) > best_conf:
+            best, best_conf = d[-1], float(conf)  # take only last number in case if return more
+    return best, max(0.0, best_conf)
+
+def _assign_glyph_words(words: List[Tuple[str, float, int, int]],
+                        spans: List[Tuple[int, int]]) -> Dict[int, Tuple[str, float]]:
+    """
+    Map recognized words (text, conf, left, width) on the canvas back to glyph slots.
+    A word covering several slots with one digit per slot is split between them,
+    otherwise its last digit goes to the slot under its center.
+    """
+    slots: Dict[int, Tuple[str, float]] = {}
+
+    def put(i: int, d: str, conf: float):
+        if i not in slots or conf > slots[i][1]:
+            slots[i] = (d, conf)
+
+    for text, conf, left, width in words:
+        d = re.sub(r"\D", "", str(text))
         if not d:
             continue
-        digits.append(d[-1])  # take only last number in case if return more
+        covered = [i for i, (x0, x1) in enumerate(spans) if x0 < left + width and x1 > left]
+        if len(covered) > 1 and len(covered) == len(d):
+            for i, ch in zip(covered, d):
+                put(i, ch, conf)
+            continue
+        cx = left + width / 2.0
+        i = min(range(len(spans)), key=lambda k: abs((spans[k][0] + spans[k][1]) / 2.0 - cx))
+        put(i, d[-1], conf)
+    return slots
+
+def _ocr_glyphs_batched(bin_img: np.ndarray) -> List[Glyph]:
+    """
+    Segment the symbols, stitch them onto one canvas and read them with a single
+    tesseract call. Returns recognized glyphs left to right with boxes and confidences.
+    """
+    boxes = _segment_boxes(bin_img)
+    if not boxes:
+        return []
+    crops = [bin_img[y:y+h, x:x+w] for (x, y, w, h) in boxes]
+    canvas, spans = _stitch_glyphs(crops)
+
+    cfg = "--psm 7 -c tessedit_char_whitelist=0123456789"
+    pytesseract = ocr_engine()
+    data = pytesseract.image_to_data(canvas, config=cfg, output_type=pytesseract.Output.DICT)
+    words = [(t, max(0.0, float(c)), l, w)
+             for t, c, l, w in zip(data["text"], data["conf"], data["left"], data["width"])]
+    slots = _assign_glyph_words(words, spans)
 
-    if not digits:
-        return None
+    glyphs = []
+    for i, box in enumerate(boxes):
+        if i in slots:
+            d, conf = slots[i]
+        else:
+            # the batched read dropped this glyph -> single-symbol retry
+            d, conf = _tess_glyph(crops[i])
+        if d:
+            glyphs.append(Glyph(i, box, d, conf))
+    return glyphs
+
+def _ocr_by_components(img_bgr: np.ndarray) -> Tuple[Optional[int], float]:
+    """Character recognition: all symbols in one batched call, then gluing. Conf = weakest glyph."""
+    gray = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2GRAY, dst=scratch("oc.gray", img_bgr.shape[:2]))
+    bin_img = _scale_and_binarize(gray)
+
+    glyphs = _ocr_glyphs_batched(bin_img)
+    if not glyphs:
+        return None, 0.0
     try:
-        return int("".join(digits))
+        return int("".join(g.digit for g in glyphs)), min(g.conf for g in glyphs)
     except Exception:
-        return None
+        return None, 0.0
 
-def read_digits_from_roi(hwnd, rx: float, ry: float, rw: float, rh: float,
-                         retries: int = 3, sleep: float = 0.08) -> Optional[int]:
+def _looks_truncated(val: int, rw: float) -> bool:
+    """Suspiciously short value (for example, 10 instead of 100)."""
+    return val < 30 or val in (8, 80) and rw < 0.16
+
+# ---------- confidence voting ----------
+
+CONF_ACCEPT = 80.0   # a single pass at/above this confidence is accepted right away
+VOTE_QUORUM = 2      # ... or this many passes / frames agreeing on the same value
+
+class DigitRead(NamedTuple):
+    value: Optional[int]
+    conf: float      # 0..100 (mean confidence of the passes that voted for 'value')
+    passes: int      # tesseract passes run
+    frames: int      # distinct frames recognized
+
+class _Votes:
+    def __init__(self):
+        self.by_value: Dict[int, List[float]] = {}
+        self.passes = 0
+
+    def add(self, val: Optional[int], conf: float) -> None:
+        self.passes += 1
+        if val is not None:
+            self.by_value.setdefault(val, []).append(conf)
+
+    def count(self, val: int) -> int:
+        return len(self.by_value.get(val, []))
+
+    def conf(self, val: int) -> float:
+        c = self.by_value.get(val, [])
+        return float(sum(c) / len(c)) if c else 0.0
+
+    def best(self) -> Optional[int]:
+        if not self.by_value:
+            return None
+        return max(self.by_value, key=lambda v: (sum(self.by_value[v]), len(self.by_value[v])))
+
+def _vote_frame(img_bgr: np.ndarray, rw: float, votes: _Votes,
+                conf_accept: float = CONF_ACCEPT, quorum: int = VOTE_QUORUM) -> Optional[int]:
     """
-    Multi-pass number recognition in ROI:
-    - try all three preprocessing steps;
-    - if uncertain/zero truncated -- character by character.
+    Run the passes on one frame, stopping as soon as a value is decided:
+    - one confident pass, or 'quorum' agreeing votes (votes from earlier frames count);
+    - values that look truncated (10 instead of 100) are never accepted from one pass:
+      the character-by-character read decides them, as does a frame with no value at all.
+    Returns the decided value or None (undecided frame).
     """
-    val_last = None
-    for _ in range(max(1, retries)):
-        img = _grab_roi_bgr(hwnd, rx, ry, rw, rh)
-        # Main runs
-        val = _ocr_passes(img)
-        if val is not None:
-        # If it's suspiciously short (for example, 10 instead of 100), try it character by character.
-            if val < 30 or val in (8, 80) and rw < 0.16:
-                comp_val = _ocr_by_components(img)
-                if comp_val is not None:
-                    return comp_val
+    img_bgr = _tighten_digits(img_bgr)
+    suspicious, any_val = False, False
+    for val, conf in _digit_passes(img_bgr):
+        votes.add(val, conf)
+        if val is None:
+            continue
+        any_val = True
+        if _looks_truncated(val, rw):
+            suspicious = True
+            continue
+        if conf >= conf_accept or votes.count(val) >= quorum:
             return val
-        # fallback character by character
-        comp_val = _ocr_by_components(img)
+    if suspicious or not any_val:
+        comp_val, comp_conf = _ocr_by_components(img_bgr)
+        votes.add(comp_val, comp_conf)
         if comp_val is not None:
             return comp_val
+    return None
 
-        val_last = val
-        time.sleep(sleep)
-    return val_last
+def read_digits_conf(hwnd, rx: float, ry: float, rw: float, rh: float,
+                     retries: int = 3, sleep: Optional[float] = None,
+                     conf_accept: float = CONF_ACCEPT, quorum: int = VOTE_QUORUM) -> DigitRead:
+    """
+    Multi-pass number recognition in ROI with confidence voting across passes and frames.
+    A new frame is recognized only if its pixels changed; otherwise the best vote so far wins.
+    sleep: wait between frames (default: ocr_retry of the timing profile).
+    """
+    if sleep is None:
+        sleep = current_timing().ocr_retry
+    votes = _Votes()
+    frames = 0
+    prev = None
+    for attempt in range(max(1, retries)):
+        img = _grab_roi_bgr(hwnd, rx, ry, rw, rh)
+        if prev is not None and img.shape == prev.shape and np.array_equal(img, prev):
+            # same pixels -> same answers; wait for the screen instead of re-running OCR
+            if attempt < retries - 1:
+                time.sleep(sleep)
+            continue
+        prev = img
+        frames += 1
+        val = _vote_frame(img, rw, votes, conf_accept, quorum)
+        if val is not None:
+            return DigitRead(val, votes.conf(val), votes.passes, frames)
+        if attempt < retries - 1:
+            time.sleep(sleep)
+    best = votes.best()
+    return DigitRead(best, votes.conf(best) if best is not None else 0.0, votes.passes, frames)
+
+def read_digits_from_roi(hwnd, rx: float, ry: float, rw: float, rh: float,
+                         retries: int = 3, sleep: Optional[float] = None) -> Optional[int]:
+    """
+    Multi-pass number recognition in ROI:
+    - try the preprocessing passes until one is confident or several agree;
+    - if uncertain/zero truncated -- character by character.
+    """
+    return read_digits_conf(hwnd, rx, ry, rw, rh, retries=retries, sleep=sleep).value
 
 HR_RX, HR_RY, HR_RW, HR_RH = HR_ROI
 
-def read_hr_value(hwnd, retries: int = 3) -> Optional[int]:
-    return read_digits_from_roi(hwnd, HR_RX, HR_RY, HR_RW, HR_RH, retries=retries)
+def read_hr_value(hwnd, retries: int = 3, budget_ms: Optional[float] = None) -> Optional[int]:
+    """HR value; budget_ms: latency budget of this call (core.budget, recorded on the current step)."""
+    with budget("read_hr_value", budget_ms):
+        return read_digits_from_roi(hwnd, HR_RX, HR_RY, HR_RW, HR_RH, retries=retries)
+
+def read_hr_value_conf(hwnd, retries: int = 3, budget_ms: Optional[float] = None) -> DigitRead:
+    with budget("read_hr_value_conf", budget_ms):
+        return read_digits_conf(hwnd, HR_RX, HR_RY, HR_RW, HR_RH, retries=retries)
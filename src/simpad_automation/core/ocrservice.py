@@ -0,0 +1,642 @@
+# -*- coding: utf-8 -*-
+"""
+Local OCR service: one process on the host runs Tesseract for every test process.
+- the server keeps warm engines (tesserocr: one initialised TessBaseAPI per worker and
+  language; without tesserocr it falls back to pytesseract's subprocess per call)
+- requests from all clients go through one queue; WORKERS threads (the global
+  concurrency limit, default: CPU count) take batches of queued requests with the same
+  (op, config, lang), configure the engine once per batch and answer identical images once
+- stats: queue depth, in flight, batch sizes, p50/p95 of queue wait and total latency
+
+Client side, backend.ocr_engine() returns a pytesseract-shaped OcrClient
+(image_to_data / image_to_string / Output.DICT) when the server answers, else pytesseract
+itself; a server that disappears mid-run is dropped and the call runs in-process.
+
+SIMPAD_OCR_SERVER = off (default) | auto (127.0.0.1:8765 if our server listens there) |
+host:port | unix:/path/to.sock
+Opt-in: nothing is probed unless it is set. The probe is a ping with a short timeout whose
+reply must identify this service; anything else listening there is left alone.
+
+    python -m simpad_automation.core.ocrservice serve [--address A] [--workers N]
+    python -m simpad_automation.core.ocrservice stats [--address A]
+
+Wire format: 8-byte header (JSON length, payload length) + JSON + raw image bytes.
+Stdlib only at import (numpy / tesserocr / pytesseract are loaded on use); headless,
+safe to import on CI.
+"""
+
+import hashlib
+import json
+import os
+import shlex
+import socket
+import socketserver
+import struct
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+DEFAULT_ADDRESS = "127.0.0.1:8765"
+CONNECT_TIMEOUT_S = 0.2
+PING_TIMEOUT_S = 1.0
+REQUEST_TIMEOUT_S = 60.0
+SERVICE = "simpad-ocr"  # ping reply marker: a foreign service on the port is not used
+MAX_HEADER = 1 << 20
+MAX_PAYLOAD = 1 << 28
+RETRY_S = 30.0          # after a failed probe, stay in-process this long before probing again
+BATCH_MAX = 16
+BATCH_WAIT_S = 0.002    # a worker waits this long for more same-config requests to join its batch
+
+Address = Union[Tuple[str, int], str]      # (host, port) or a Unix socket path
+_HEAD = struct.Struct(">II")
+
+
+def parse_address(spec: str) -> Address:
+    if spec.startswith("unix:"):
+        return spec[5:]
+    host, _, port = spec.rpartition(":")
+    if not host or not port.isdigit():
+        raise ValueError(f"OCR server address must be host:port or unix:/path, got {spec!r}")
+    return host, int(port)
+
+
+def server_address() -> Optional[Address]:
+    """Address from SIMPAD_OCR_SERVER, None when the service is switched off (default)."""
+    spec = os.environ.get("SIMPAD_OCR_SERVER", "off").strip()
+    if spec.lower() in ("", "off"):
+        return None
+    return parse_address(DEFAULT_ADDRESS if spec.lower() == "auto" else spec)
+
+
+# ---------- wire format ----------
+
+def _recv_exact(sock: socket.socket, n: int) -> bytes:
+    buf = bytearray(n)
+    view = memoryview(buf)
+    got = 0
+    while got < n:
+        k = sock.recv_into(view[got:], n - got)
+        if not k:
+            raise ConnectionError("OCR service connection closed")
+        got += k
+    return bytes(buf)
+
+
+def send_msg(sock: socket.socket, header: Dict, payload: bytes = b"") -> None:
+    head = json.dumps(header).encode("utf-8")
+    sock.sendall(_HEAD.pack(len(head), len(payload)) + head + payload)
+
+
+def recv_msg(sock: socket.socket) -> Tuple[Dict, bytes]:
+    n_head, n_payload = _HEAD.unpack(_recv_exact(sock, _HEAD.size))
+    if n_head > MAX_HEADER or n_payload > MAX_PAYLOAD:
+        raise ConnectionError(f"OCR service: bad message header ({n_head}, {n_payload})")
+    header = json.loads(_recv_exact(sock, n_head).decode("utf-8"))
+    return header, (_recv_exact(sock, n_payload) if n_payload else b"")
+
+
+def encode_image(img) -> Tuple[Dict, bytes]:
+    import numpy as np
+    arr = np.ascontiguousarray(np.asarray(img))
+    if arr.dtype != np.uint8:
+        raise ValueError(f"OCR service takes uint8 images, got {arr.dtype}")
+    return {"shape": list(arr.shape)}, arr.tobytes()
+
+
+def decode_image(header: Dict, payload: bytes):
+    import numpy as np
+    return np.frombuffer(payload, dtype=np.uint8).reshape(header["shape"])
+
+
+# ---------- engines (server side) ----------
+
+def _empty_data() -> Dict[str, List]:
+    keys = ("level", "page_num", "block_num", "par_num", "line_num", "word_num",
+            "left", "top", "width", "height", "conf", "text")
+    return {k: [] for k in keys}
+
+
+def parse_config(config: str) -> Tuple[Optional[int], Dict[str, str]]:
+    """(psm, -c variables) of a pytesseract config string; --oem is left to the engine default."""
+    psm, variables = None, {}
+    args = shlex.split(config or "")
+    i = 0
+    while i < len(args):
+        a = args[i]
+        if a == "--psm" and i + 1 < len(args):
+            psm = int(args[i + 1]); i += 1
+        elif a == "--oem" and i + 1 < len(args):
+            i += 1
+        elif a == "-c" and i + 1 < len(args):
+            k, _, v = args[i + 1].partition("=")
+            variables[k] = v; i += 1
+        i += 1
+    return psm, variables
+
+
+class PytesseractEngine:
+    """pytesseract as is: one tesseract process per image (no warm state, still rate-limited)."""
+
+    name = "pytesseract"
+
+    def run_batch(self, op: str, config: str, lang: str, images: List) -> List:
+        from .backend import tesseract
+        pt = tesseract()
+        if op == "data":
+            return [pt.image_to_data(im, config=config, lang=lang, output_type=pt.Output.DICT) for im in images]
+        return [pt.image_to_string(im, config=config, lang=lang) for im in images]
+
+
+class TesserocrEngine:
+    """Warm TessBaseAPI per worker thread and language; configured once per batch."""
+
+    name = "tesserocr"
+
+    def __init__(self):
+        import tesserocr            # optional; raises ImportError when missing
+        self._t = tesserocr
+        self._local = threading.local()
+
+    def _api(self, lang: str):
+        apis = self._local.__dict__.setdefault("apis", {})
+        api = apis.get(lang)
+        if api is None:
+            api = apis[lang] = self._t.PyTessBaseAPI(lang=lang)
+            self._local.__dict__.setdefault("defaults", {})[lang] = {}
+        return api
+
+    def _configure(self, api, lang: str, config: str) -> None:
+        psm, variables = parse_config(config)
+        defaults = self._local.defaults[lang]
+        for k in list(defaults):                 # undo the previous batch's variables
+            if k not in variables:
+                api.SetVariable(k, defaults.pop(k))
+        for k, v in variables.items():
+            if k not in defaults:
+                defaults[k] = api.GetVariableAsString(k) or ""
+            api.SetVariable(k, v)
+        api.SetPageSegMode(self._t.PSM.SINGLE_BLOCK if psm is None else psm)
+
+    def _set_image(self, api, img) -> None:
+        import numpy as np
+        if img.ndim == 3:
+            img = np.ascontiguousarray(img[..., 2::-1])  # BGR -> RGB
+        h, w = img.shape[:2]
+        bpp = 1 if img.ndim == 2 else img.shape[2]
+        api.SetImageBytes(img.tobytes(), w, h, bpp, w * bpp)
+
+    def _data(self, api) -> Dict[str, List]:
+        RIL = self._t.RIL
+        out = _empty_data()
+        api.Recognize()
+        it = api.GetIterator()
+        if it is None:
+            return out
+        block = par = line = word = 0
+        for r in self._t.iterate_level(it, RIL.WORD):
+            if r.IsAtBeginningOf(RIL.BLOCK):
+                block += 1; par = line = 0
+            if r.IsAtBeginningOf(RIL.PARA):
+                par += 1; line = 0
+            if r.IsAtBeginningOf(RIL.TEXTLINE):
+                line += 1; word = 0
+            word += 1
+            box = r.BoundingBox(RIL.WORD)
+            if box is None:
+                continue
+            x1, y1, x2, y2 = box
+            for k, v in (("level", 5), ("page_num", 1), ("block_num", block), ("par_num", par),
+                         ("line_num", line), ("word_num", word), ("left", x1), ("top", y1),
+                         ("width", x2 - x1), ("height", y2 - y1),
+                         ("conf", round(r.Confidence(RIL.WORD), 2)), ("text", r.GetUTF8Text(RIL.WORD) or "")):
+                out[k].append(v)
+        return out
+
+    def run_batch(self, op: str, config: str, lang: str, images: List) -> List:
+        api = self._api(lang)
+        self._configure(api, lang, config)
+        results = []
+        for img in images:
+            self._set_image(api, img)
+            results.append(self._data(api) if op == "data" else api.GetUTF8Text())
+        return results
+
+
+def default_engine():
+    try:
+        return TesserocrEngine()
+    except ImportError:
+        print("[INFO] tesserocr is not installed: OCR server runs pytesseract (no warm engines)")
+        return PytesseractEngine()
+
+
+# ---------- server ----------
+
+class _Job:
+    __slots__ = ("op", "config", "lang", "img", "digest", "t_in", "t_start", "done", "result", "error")
+
+    def __init__(self, op: str, config: str, lang: str, img, digest: bytes):
+        self.op, self.config, self.lang, self.img, self.digest = op, config, lang, img, digest
+        self.t_in = time.perf_counter()
+        self.t_start = 0.0
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[str] = None
+
+    @property
+    def key(self) -> Tuple[str, str, str]:
+        return self.op, self.config, self.lang
+
+
+def _pct(xs, q: float) -> float:
+    if not xs:
+        return 0.0
+    s = sorted(xs)
+    return round(1000.0 * s[min(len(s) - 1, int(round(q * (len(s) - 1))))], 2)
+
+
+class OcrServer:
+    """Queue + WORKERS engine threads behind a localhost socket (TCP or Unix)."""
+
+    def __init__(self, address: Address = None, workers: Optional[int] = None, engine=None,
+                 batch_max: int = BATCH_MAX, batch_wait_s: float = BATCH_WAIT_S):
+        self.address = parse_address(DEFAULT_ADDRESS) if address is None else address
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.engine = engine if engine is not None else default_engine()
+        self.batch_max = batch_max
+        self.batch_wait_s = batch_wait_s
+        self._queue: deque = deque()
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._server: Optional[socketserver.BaseServer] = None
+        # counters
+        self._in_flight = 0
+        self._max_depth = 0
+        self._served = 0
+        self._errors = 0
+        self._batches = 0
+        self._batched = 0
+        self._deduped = 0
+        self._clients = 0
+        self._waits: deque = deque(maxlen=2000)
+        self._latencies: deque = deque(maxlen=2000)
+        self._t_start = 0.0
+
+    # ---------- lifecycle ----------
+
+    def start(self) -> "OcrServer":
+        if self._server is not None:
+            raise RuntimeError("OcrServer already started")
+        self._server = self._make_server()
+        if isinstance(self.address, tuple):
+            self.address = self._server.server_address[:2]     # port 0 -> the bound port
+        self._t_start = time.perf_counter()
+        for i in range(self.workers):
+            t = threading.Thread(target=self._work, name=f"ocr-worker-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+        t = threading.Thread(target=self._server.serve_forever, kwargs={"poll_interval": 0.2},
+                             name="ocr-accept", daemon=True)
+        t.start()
+        self._threads.append(t)
+        print(f"[INFO] OCR server on {format_address(self.address)}: engine {self.engine.name}, "
+              f"{self.workers} workers")
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            if isinstance(self.address, str) and os.path.exists(self.address):
+                os.unlink(self.address)
+        for t in self._threads:
+            t.join(timeout=5.0)
+
+    def __enter__(self) -> "OcrServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def serve_forever(self) -> None:
+        self.start()
+        try:
+            while not self._stop.wait(1.0):
+                pass
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+    def _make_server(self) -> socketserver.BaseServer:
+        owner = self
+
+        class Handler(socketserver.BaseRequestHandler):
+            def handle(self):
+                owner._serve_client(self.request)
+
+        if isinstance(self.address, str):
+            if not hasattr(socketserver, "ThreadingUnixStreamServer"):
+                raise RuntimeError("Unix sockets are not available on this platform, use host:port")
+            if os.path.exists(self.address):
+                os.unlink(self.address)
+            srv = socketserver.ThreadingUnixStreamServer(self.address, Handler)
+        else:
+            srv = socketserver.ThreadingTCPServer(self.address, Handler, bind_and_activate=False)
+            srv.allow_reuse_address = True
+            srv.server_bind()
+            srv.server_activate()
+        srv.daemon_threads = True
+        return srv
+
+    # ---------- per connection ----------
+
+    def _serve_client(self, sock: socket.socket) -> None:
+        with self._cond:
+            self._clients += 1
+        try:
+            while not self._stop.is_set():
+                try:
+                    header, payload = recv_msg(sock)
+                except (ConnectionError, OSError):
+                    return
+                send_msg(sock, self._answer(header, payload))
+        finally:
+            with self._cond:
+                self._clients -= 1
+
+    def _answer(self, header: Dict, payload: bytes) -> Dict:
+        op = header.get("op")
+        if op == "ping":
+            return {"ok": True, "service": SERVICE, "engine": self.engine.name}
+        if op == "stats":
+            return {"ok": True, "stats": self.stats()}
+        if op not in ("data", "string"):
+            return {"ok": False, "error": f"unknown op {op!r}"}
+        job = self.submit(op, decode_image(header, payload), header.get("config", ""),
+                          header.get("lang") or "eng", digest=hashlib.blake2b(payload, digest_size=16).digest())
+        if not job.done.wait(REQUEST_TIMEOUT_S):
+            return {"ok": False, "error": f"OCR request timed out after {REQUEST_TIMEOUT_S:.0f} s"}
+        if job.error is not None:
+            return {"ok": False, "error": job.error}
+        return {"ok": True, "result": job.result}
+
+    def submit(self, op: str, img, config: str = "", lang: str = "eng", digest: Optional[bytes] = None) -> _Job:
+        """Queue one request (also usable in-process); wait on job.done for the result."""
+        if digest is None:
+            digest = hashlib.blake2b(encode_image(img)[1], digest_size=16).digest()
+        job = _Job(op, config, lang, img, digest + str(getattr(img, "shape", "")).encode())
+        with self._cond:
+            self._queue.append(job)
+            self._max_depth = max(self._max_depth, len(self._queue))
+            self._cond.notify()
+        return job
+
+    # ---------- workers ----------
+
+    def _take_batch(self) -> List[_Job]:
+        """First queued job plus queued jobs with the same key (waits briefly for late joiners)."""
+        with self._cond:
+            while not self._queue and not self._stop.is_set():
+                self._cond.wait(timeout=0.5)
+            if not self._queue:
+                return []
+            first = self._queue.popleft()
+            if self.batch_wait_s > 0 and not self._queue:
+                self._cond.wait(timeout=self.batch_wait_s)
+            batch = [first]
+            rest = deque()
+            while self._queue:
+                j = self._queue.popleft()
+                (batch if j.key == first.key and len(batch) < self.batch_max else rest).append(j)
+            self._queue = rest + self._queue
+            self._in_flight += len(batch)
+            return batch
+
+    def _work(self) -> None:
+        while not self._stop.is_set():
+            batch = self._take_batch()
+            if batch:
+                self._run(batch)
+
+    def _run(self, batch: List[_Job]) -> None:
+        first = batch[0]
+        unique: Dict[bytes, int] = {}
+        images = []
+        for j in batch:
+            if j.digest not in unique:
+                unique[j.digest] = len(images)
+                images.append(j.img)
+        t0 = time.perf_counter()
+        for j in batch:
+            j.t_start = t0
+        try:
+            results = self.engine.run_batch(first.op, first.config, first.lang, images)
+            error = None
+        except Exception as e:
+            results, error = [None] * len(images), f"{type(e).__name__}: {e}"
+        t1 = time.perf_counter()
+        with self._cond:
+            self._in_flight -= len(batch)
+            self._batches += 1
+            self._batched += len(batch)
+            self._deduped += len(batch) - len(images)
+            self._served += len(batch)
+            self._errors += len(batch) if error else 0
+            for j in batch:
+                self._waits.append(j.t_start - j.t_in)
+                self._latencies.append(t1 - j.t_in)
+        for j in batch:
+            j.result, j.error = results[unique[j.digest]], error
+            j.img = None
+            j.done.set()
+
+    # ---------- reporting ----------
+
+    def stats(self) -> Dict[str, float]:
+        with self._cond:
+            waits, lats = list(self._waits), list(self._latencies)
+            return {
+                "engine": self.engine.name,
+                "workers": self.workers,
+                "clients": self._clients,
+                "queue_depth": len(self._queue),
+                "max_queue_depth": self._max_depth,
+                "in_flight": self._in_flight,
+                "served": self._served,
+                "errors": self._errors,
+                "batches": self._batches,
+                "mean_batch": round(self._batched / max(1, self._batches), 2),
+                "deduped": self._deduped,
+                "wait_p50_ms": _pct(waits, 0.5),
+                "wait_p95_ms": _pct(waits, 0.95),
+                "latency_p50_ms": _pct(lats, 0.5),
+                "latency_p95_ms": _pct(lats, 0.95),
+                "uptime_s": round(time.perf_counter() - self._t_start, 1) if self._t_start else 0.0,
+            }
+
+
+def format_address(address: Address) -> str:
+    return f"unix:{address}" if isinstance(address, str) else f"{address[0]}:{address[1]}"
+
+
+# ---------- client ----------
+
+class _Output:
+    DICT = "dict"     # same value as pytesseract.Output.DICT
+
+
+class OcrClient:
+    """pytesseract-shaped proxy to an OcrServer; one connection per calling thread."""
+
+    Output = _Output
+
+    def __init__(self, address: Address, timeout: float = REQUEST_TIMEOUT_S):
+        self.address = address
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connect(self, timeout: float) -> socket.socket:
+        if isinstance(self.address, str):
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(timeout)
+            sock.connect(self.address)
+        else:
+            sock = socket.create_connection(self.address, timeout=timeout)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.settimeout(self.timeout)
+        return sock
+
+    def call(self, header: Dict, payload: bytes = b"", timeout: Optional[float] = None) -> Dict:
+        """
+        One request/response (timeout: this call only, default self.timeout); raises OSError
+        when the server is gone, RuntimeError on its errors or an unreadable reply.
+        """
+        sock = getattr(self._local, "sock", None)
+        if sock is None:
+            sock = self._local.sock = self._connect(CONNECT_TIMEOUT_S)
+        try:
+            sock.settimeout(self.timeout if timeout is None else timeout)
+            send_msg(sock, header, payload)
+            reply, _ = recv_msg(sock)
+        except OSError:
+            self.close()
+            raise
+        except ValueError as e:                  # not JSON: not our server
+            self.close()
+            raise RuntimeError(f"OCR server: unreadable reply ({e})")
+        if not isinstance(reply, dict):
+            self.close()
+            raise RuntimeError("OCR server: unexpected reply")
+        if not reply.get("ok"):
+            raise RuntimeError(f"OCR server: {reply.get('error')}")
+        return reply
+
+    def close(self) -> None:
+        sock = getattr(self._local, "sock", None)
+        self._local.sock = None
+        if sock is not None:
+            sock.close()
+
+    def ping(self) -> str:
+        """Engine name of the server; RuntimeError if whatever answers is not an OcrServer."""
+        reply = self.call({"op": "ping"}, timeout=PING_TIMEOUT_S)
+        if reply.get("service") != SERVICE or not isinstance(reply.get("engine"), str):
+            self.close()
+            raise RuntimeError(f"{format_address(self.address)} is not a SimPad OCR server")
+        return reply["engine"]
+
+    def stats(self) -> Dict[str, float]:
+        return self.call({"op": "stats"})["stats"]
+
+    def _ocr(self, op: str, image, config: str, lang: Optional[str]):
+        meta, payload = encode_image(image)
+        try:
+            return self.call(dict(meta, op=op, config=config or "", lang=lang or "eng"), payload)["result"]
+        except OSError as e:
+            _server_lost(self, e)                # transparent fallback: run this call in-process
+            pt = _in_process()
+            if op == "data":
+                return pt.image_to_data(image, config=config, lang=lang, output_type=pt.Output.DICT)
+            return pt.image_to_string(image, config=config, lang=lang)
+
+    def image_to_data(self, image, config: str = "", lang: Optional[str] = None,
+                      output_type: str = _Output.DICT) -> Dict[str, List]:
+        if output_type != _Output.DICT:
+            raise ValueError("OcrClient.image_to_data only returns Output.DICT")
+        return self._ocr("data", image, config, lang)
+
+    def image_to_string(self, image, config: str = "", lang: Optional[str] = None) -> str:
+        return self._ocr("string", image, config, lang)
+
+
+# ---------- engine selection (backend.ocr_engine) ----------
+
+_lock = threading.Lock()
+_client: Optional[OcrClient] = None
+_down_until = 0.0
+
+
+def _in_process():
+    from .backend import tesseract
+    return tesseract()
+
+
+def _server_lost(client: OcrClient, err: Exception) -> None:
+    global _client, _down_until
+    with _lock:
+        if _client is client:
+            print(f"[WARN] OCR server {format_address(client.address)} lost ({err}), OCR runs in-process")
+            _client = None
+            _down_until = time.monotonic() + RETRY_S
+
+
+def engine(probe: Optional[Callable[[OcrClient], str]] = None):
+    """OcrClient when the local OCR server answers, else pytesseract (probe cached for RETRY_S)."""
+    global _client, _down_until
+    c = _client
+    if c is not None:
+        return c
+    address = server_address()
+    if address is None or time.monotonic() < _down_until:
+        return _in_process()
+    with _lock:
+        if _client is None:
+            candidate = OcrClient(address)
+            try:
+                name = (probe or OcrClient.ping)(candidate)
+            except (OSError, RuntimeError):
+                candidate.close()
+                _down_until = time.monotonic() + RETRY_S
+                return _in_process()
+            print(f"[INFO] OCR via server {format_address(address)} ({name})")
+            _client = candidate
+        return _client
+
+
+def reset() -> None:
+    """Forget the selected engine (next call probes again)."""
+    global _client, _down_until
+    with _lock:
+        if _client is not None:
+            _client.close()
+        _client, _down_until = None, 0.0
+
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="Local OCR server shared by test processes")
+    ap.add_argument("command", choices=("serve", "stats"))
+    ap.add_argument("--address", default=None, help=f"host:port or unix:/path (default {DEFAULT_ADDRESS})")
+    ap.add_argument("--workers", type=int, default=None, help="concurrent OCR calls (default: CPU count)")
+    args = ap.parse_args()
+    addr = parse_address(args.address) if args.address else (server_address() or parse_address(DEFAULT_ADDRESS))
+    if args.command == "serve":
+        OcrServer(addr, workers=args.workers).serve_forever()
+    else:
+        print(json.dumps(OcrClient(addr).stats(), indent=2))
@@ -0,0 +1,297 @@
+# -*- coding: utf-8 -*-
+"""
+Sampling profiler for test steps: where does a slow step spend its wall time
+(OpenCV, pytesseract's subprocess, pyautogui pauses, our own loops)?
+- a daemon thread reads the test thread's Python stack every INTERVAL_MS
+  (sys._current_frames; nothing is traced, the test thread is never interrupted)
+- samples are wall-clock: waiting in time.sleep or on the tesseract process counts
+- stacks are kept as collapsed lines "a;b;c count" (flamegraph.pl / speedscope input);
+  the leaf frame carries its line number, so a C call (cv2.resize) shows as the line
+  that made it
+- every sample is also filed under a category (tesseract, pyautogui, opencv, ...) from
+  the innermost library frame or the source of the leaf line
+- reporter.step opens one bucket per step; write_flamegraph renders a self-contained SVG
+
+Enable with SIMPAD_PROFILE=1 (conftest.py profiles the call phase of every test);
+SIMPAD_PROFILE_INTERVAL_MS sets the interval (default 10 ms).
+Headless, safe to import on CI.
+"""
+
+import html
+import linecache
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+ENABLED = os.environ.get("SIMPAD_PROFILE", "0") == "1"
+INTERVAL_MS = float(os.environ.get("SIMPAD_PROFILE_INTERVAL_MS", "10"))
+MAX_DEPTH = 128
+
+# leading frames of these modules (the pytest runner) are cut from every stack
+_RUNNER = ("_pytest", "pluggy", "pytest", "runpy", "__main__", "threading")
+
+# (category, module prefixes); first match from the leaf upwards wins
+CATEGORIES: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("tesseract", ("pytesseract", "subprocess")),
+    ("pyautogui", ("pyautogui", "pyscreeze", "pymsgbox", "pytweening", "mouseinfo")),
+    ("opencv", ("cv2", "numpy")),
+    ("pillow", ("PIL",)),
+)
+# leaf line of our own code -> category of the C call it makes
+_LINE_HINTS = (("cv2.", "opencv"), ("np.", "opencv"), ("win32", "win32"), ("sleep(", "sleep"))
+
+
+class Profile:
+    """Collapsed stacks and per-category sample counts of one step / test."""
+
+    def __init__(self):
+        self.stacks: Counter = Counter()
+        self.categories: Counter = Counter()
+
+    @property
+    def samples(self) -> int:
+        return sum(self.stacks.values())
+
+    def add(self, stack: str, category: str, n: int = 1) -> None:
+        self.stacks[stack] += n
+        self.categories[category] += n
+
+    def shares(self) -> Dict[str, float]:
+        """Category -> percent of the samples, largest first."""
+        total = max(1, self.samples)
+        return {k: round(100.0 * v / total, 1) for k, v in self.categories.most_common()}
+
+    def write_folded(self, path: Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("".join(f"{s} {n}\n" for s, n in sorted(self.stacks.items())), encoding="utf-8")
+        return path
+
+
+# ---------- sampler ----------
+
+_ACTIVE: Dict[int, "StackSampler"] = {}
+
+def active_sampler(thread_id: Optional[int] = None) -> Optional["StackSampler"]:
+    """Running sampler for this thread (default: the calling one), if any (used by reporter.step)."""
+    return _ACTIVE.get(threading.get_ident() if thread_id is None else thread_id)
+
+
+class StackSampler:
+    """Samples one thread's stack into the open buckets (whole test + current step)."""
+
+    def __init__(self, thread_id: Optional[int] = None, interval_ms: float = INTERVAL_MS,
+                 max_depth: int = MAX_DEPTH):
+        if interval_ms <= 0:
+            raise ValueError("interval_ms must be > 0")
+        self.thread_id = threading.get_ident() if thread_id is None else thread_id
+        self.interval = interval_ms / 1000.0
+        self.max_depth = max_depth
+        self.total = Profile()
+        self._buckets: List[Profile] = [self.total]
+        self._labels: Dict[object, str] = {}        # code object -> "module.qualname"
+        self._leaves: Dict[Tuple[object, int], Tuple[str, Optional[str]]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._outer: Optional["StackSampler"] = None
+        self._cpu_s = 0.0
+        self._t_start = 0.0
+        self._t_end = 0.0
+
+    # ---------- lifecycle ----------
+
+    def start(self) -> "StackSampler":
+        if self._thread is not None:
+            raise RuntimeError("StackSampler already started")
+        self._t_start = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+        self._outer = _ACTIVE.get(self.thread_id)      # a sampler started inside another one
+        _ACTIVE[self.thread_id] = self
+        return self
+
+    def stop(self) -> Profile:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+        self._t_end = time.perf_counter()
+        if _ACTIVE.get(self.thread_id) is self:
+            if self._outer is not None:
+                _ACTIVE[self.thread_id] = self._outer
+            else:
+                del _ACTIVE[self.thread_id]
+        return self.total
+
+    def __enter__(self) -> "StackSampler":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # ---------- step buckets ----------
+
+    def open_bucket(self) -> Profile:
+        """Start collecting into a new bucket as well (nested steps count in every open bucket)."""
+        b = Profile()
+        with self._lock:
+            self._buckets.append(b)
+        return b
+
+    def close_bucket(self, bucket: Profile) -> Profile:
+        with self._lock:
+            if bucket in self._buckets[1:]:
+                self._buckets.remove(bucket)
+        return bucket
+
+    # ---------- sampling ----------
+
+    def _label(self, frame) -> str:
+        code = frame.f_code
+        lab = self._labels.get(code)
+        if lab is None:
+            mod = frame.f_globals.get("__name__") or Path(code.co_filename).stem
+            lab = self._labels[code] = f"{mod}.{getattr(code, 'co_qualname', code.co_name)}"
+        return lab
+
+    def _leaf(self, frame) -> Tuple[str, Optional[str]]:
+        """Leaf label with line number and the category hinted by that source line."""
+        key = (frame.f_code, frame.f_lineno)
+        leaf = self._leaves.get(key)
+        if leaf is None:
+            src = linecache.getline(frame.f_code.co_filename, frame.f_lineno)
+            hint = next((cat for needle, cat in _LINE_HINTS if needle in src), None)
+            leaf = self._leaves[key] = (f"{self._label(frame)}:{frame.f_lineno}", hint)
+        return leaf
+
+    def collapse(self, frame) -> Tuple[str, str]:
+        """(collapsed stack root-first, category) of a frame."""
+        modules: List[str] = []
+        labels: List[str] = []
+        leaf, hint = self._leaf(frame)
+        f = frame.f_back
+        while f is not None and len(labels) < self.max_depth:
+            labels.append(self._label(f))
+            modules.append(f.f_globals.get("__name__", ""))
+            f = f.f_back
+        labels.reverse()
+        modules.reverse()
+        cut = 0
+        while cut < len(modules) and modules[cut].split(".")[0] in _RUNNER:
+            cut += 1
+        category = None
+        for mod in [frame.f_globals.get("__name__", "")] + modules[::-1]:
+            top = mod.split(".")[0]
+            category = next((cat for cat, prefixes in CATEGORIES if top in prefixes), None)
+            if category:
+                break
+        return ";".join(labels[cut:] + [leaf]), category or hint or "python"
+
+    def sample(self) -> bool:
+        """Take one sample of the target thread; False if it has no Python frame."""
+        frame = sys._current_frames().get(self.thread_id)
+        if frame is None:
+            return False
+        stack, category = self.collapse(frame)
+        del frame
+        with self._lock:
+            for b in self._buckets:
+                b.add(stack, category)
+        return True
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            c0 = time.thread_time()
+            try:
+                self.sample()
+            except Exception as e:  # never take the test down
+                print(f"[WARN] StackSampler sample failed: {e}")
+            self._cpu_s += time.thread_time() - c0
+
+    def stats(self) -> Dict[str, float]:
+        end = self._t_end if self._stop.is_set() and self._t_end else time.perf_counter()
+        elapsed = max(1e-9, end - self._t_start) if self._t_start else 0.0
+        n = self.total.samples
+        return {
+            "samples": n,
+            "interval_ms": round(self.interval * 1000.0, 2),
+            "overhead_pct": round(100.0 * self._cpu_s / elapsed, 2) if elapsed else 0.0,
+            "sample_us": round(1e6 * self._cpu_s / max(1, n), 1),
+        }
+
+
+# ---------- flamegraph ----------
+
+_COLORS = {"tesseract": "#f59e0b", "pyautogui": "#a78bfa", "opencv": "#60a5fa", "pillow": "#f472b6",
+           "win32": "#94a3b8", "sleep": "#d1d5db", "python": "#4ade80"}
+
+
+def _category_of(label: str) -> str:
+    top = label.split(".")[0]
+    return next((cat for cat, prefixes in CATEGORIES if top in prefixes), "python")
+
+
+def _tree(stacks: Counter) -> dict:
+    root = {"n": 0, "kids": {}}
+    for stack, n in stacks.items():
+        root["n"] += n
+        node = root
+        for name in stack.split(";"):
+            node = node["kids"].setdefault(name, {"n": 0, "kids": {}})
+            node["n"] += n
+    return root
+
+
+def write_flamegraph(profile: Profile, path: Path, title: str = "", width: int = 1200,
+                     row: int = 17) -> Path:
+    """Self-contained SVG icicle graph (root on top); hover a frame for its sample count."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    root = _tree(profile.stacks)
+    total = max(1, root["n"])
+    rects: List[str] = []
+    depth_max = 0
+
+    def walk(node, x, depth):
+        nonlocal depth_max
+        depth_max = max(depth_max, depth)
+        for name, kid in sorted(node["kids"].items()):
+            w = kid["n"] * width / total
+            if w >= 0.5:
+                color = _COLORS[_category_of(name)]
+                tip = f"{name} - {kid['n']} samples ({100.0 * kid['n'] / total:.1f}%)"
+                text = html.escape(name if len(name) * 7 < w else name[:max(0, int(w / 7) - 2)] + "..")
+                rects.append(
+                    f'<g><title>{html.escape(tip)}</title>'
+                    f'<rect x="{x:.1f}" y="{30 + depth * row}" width="{w:.1f}" height="{row - 1}" fill="{color}"/>'
+                    + (f'<text x="{x + 3:.1f}" y="{30 + depth * row + row - 5}">{text}</text>' if w > 24 else "")
+                    + "</g>")
+                walk(kid, x, depth + 1)
+            x += w
+
+    walk(root, 0.0, 0)
+    legend = " · ".join(f"{k} {v}%" for k, v in profile.shares().items())
+    shares = "".join(f'<rect x="{8 + i * 110}" y="{40 + (depth_max + 1) * row}" width="10" height="10" fill="{_COLORS.get(k, "#e5e7eb")}"/>'
+                     f'<text x="{22 + i * 110}" y="{49 + (depth_max + 1) * row}">{html.escape(k)} {v}%</text>'
+                     for i, (k, v) in enumerate(profile.shares().items()))
+    height = 60 + (depth_max + 1) * row
+    svg = (f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+           f'font-family="monospace" font-size="11">'
+           f'<text x="4" y="16" font-size="13">{html.escape(title)} - {profile.samples} samples - '
+           f'{html.escape(legend)}</text>{"".join(rects)}{shares}</svg>\n')
+    path.write_text(svg, encoding="utf-8")
+    return path
+
+
+def save_profile(profile: Profile, dest_dir: Path, stem: str = "profile", title: str = ""
+                 ) -> Optional[Tuple[Path, Path]]:
+    """Write <stem>.folded and <stem>.svg into dest_dir; None if nothing was sampled."""
+    if not profile.samples:
+        return None
+    dest_dir = Path(dest_dir)
+    return (profile.write_folded(dest_dir / f"{stem}.folded"),
+            write_flamegraph(profile, dest_dir / f"{stem}.svg", title=title))
@@ -0,0 +1,284 @@
+# -*- coding: utf-8 -*-
+"""
+Flight recorder: the last N seconds of the client area, kept in memory at low FPS and
+written out as a clip when a step fails (so the transition that broke is visible,
+not just the final screenshot).
+- frames are downscaled, then delta-compressed: a PNG keyframe per group, the other
+  frames as zlib(XOR with the previous frame) - a static screen costs a few bytes per frame
+- the ring is bounded by frames (seconds * fps) and by bytes; whole groups are evicted
+- the recorder measures its own CPU time and memory (stats()) so it can stay enabled
+
+Example:
+    with ClipRecorder(hwnd, seconds=10, fps=4) as rec:
+        ...
+        rec.dump(Path("artifacts/step_3/failed.mp4"))
+    print(rec.stats())
+
+Enabled for every UI test with SIMPAD_RECORDER=1 (see conftest.py); reporter.step dumps
+the clip of the active recorder next to the failure screenshot.
+"""
+
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+DEFAULT_SECONDS = 10.0
+DEFAULT_FPS = 4.0
+DEFAULT_SCALE = 0.5           # clip resolution relative to the client area
+MAX_BYTES = 32 * 1024 * 1024  # hard cap of the compressed ring
+GROUP_SIZE = 16               # frames per keyframe group (eviction granularity)
+
+
+class DeltaFrameRing:
+    """Bounded ring of delta-compressed frames; groups of (keyframe + deltas)."""
+
+    def __init__(self, max_frames: int, max_bytes: int = MAX_BYTES, group_size: int = GROUP_SIZE):
+        if max_frames <= 0:
+            raise ValueError("max_frames must be > 0")
+        self.max_frames = max_frames
+        self.max_bytes = max_bytes
+        self.group_size = max(1, group_size)
+        # each group: [shape, [(t, kind, payload), ...]]  kind: "key" | "delta" | "same"
+        self._groups: List[list] = []
+        self._prev: Optional[np.ndarray] = None
+        self._frames = 0
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._frames
+
+    @property
+    def nbytes(self) -> int:
+        """Compressed payload bytes plus the one raw reference frame."""
+        return self._bytes + (self._prev.nbytes if self._prev is not None else 0)
+
+    def push(self, t: float, img: np.ndarray) -> int:
+        """Add a frame (uint8, HxW or HxWx3). Returns its stored size in bytes."""
+        prev = self._prev
+        with self._lock:
+            g = self._groups[-1] if self._groups else None
+            if g is None or len(g[1]) >= self.group_size or prev is None or prev.shape != img.shape:
+                ok, buf = cv2.imencode(".png", img, [cv2.IMWRITE_PNG_COMPRESSION, 1])
+                if not ok:
+                    raise RuntimeError("DeltaFrameRing: PNG encoding failed")
+                g = [img.shape, []]
+                self._groups.append(g)
+                rec = (t, "key", buf.tobytes())
+            elif np.array_equal(img, prev):
+                rec = (t, "same", b"")
+            else:
+                rec = (t, "delta", zlib.compress(np.bitwise_xor(img, prev).tobytes(), 1))
+            g[1].append(rec)
+            self._frames += 1
+            self._bytes += len(rec[2])
+            if prev is None or prev.shape != img.shape:
+                self._prev = img.copy()
+            else:
+                np.copyto(prev, img)     # reference frame reused, no allocation per push
+            self._evict()
+        return len(rec[2])
+
+    def _evict(self) -> None:
+        # drop whole oldest groups (never the one being written)
+        while len(self._groups) > 1 and (self._frames - len(self._groups[0][1]) >= self.max_frames
+                                         or self._bytes > self.max_bytes):
+            _shape, recs = self._groups.pop(0)
+            self._frames -= len(recs)
+            self._bytes -= sum(len(r[2]) for r in recs)
+
+    def frames(self, since: Optional[float] = None) -> Iterator[Tuple[float, np.ndarray]]:
+        """Decoded (t, frame) oldest first; each yielded array is a fresh copy."""
+        with self._lock:
+            groups = [(shape, list(recs)) for shape, recs in self._groups]
+        for shape, recs in groups:
+            cur: Optional[np.ndarray] = None
+            for t, kind, payload in recs:
+                if kind == "key":
+                    flag = cv2.IMREAD_COLOR if len(shape) == 3 else cv2.IMREAD_GRAYSCALE
+                    cur = cv2.imdecode(np.frombuffer(payload, np.uint8), flag)
+                elif kind == "delta":
+                    cur = np.bitwise_xor(cur, np.frombuffer(zlib.decompress(payload), np.uint8).reshape(shape))
+                if since is None or t >= since:
+                    yield t, cur.copy()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._groups.clear()
+            self._prev = None
+            self._frames = self._bytes = 0
+
+
+# ---------- clip encoding ----------
+
+def write_clip(frames: List[Tuple[float, np.ndarray]], path: Path, fps: float = DEFAULT_FPS) -> Optional[Path]:
+    """
+    Encode frames to 'path' (.mp4 via OpenCV, .png as animated PNG via Pillow).
+    An .mp4 that OpenCV cannot open a writer for falls back to .png. Returns the file or None.
+    """
+    if not frames:
+        return None
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    h, w = frames[-1][1].shape[:2]
+    if path.suffix.lower() == ".mp4":
+        vw = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"mp4v"), fps, (w, h))
+        if vw.isOpened():
+            try:
+                for _t, f in frames:
+                    if f.shape[:2] != (h, w):
+                        f = cv2.resize(f, (w, h), interpolation=cv2.INTER_AREA)
+                    vw.write(f if f.ndim == 3 else cv2.cvtColor(f, cv2.COLOR_GRAY2BGR))
+            finally:
+                vw.release()
+            return path
+        print(f"[WARN] No mp4 encoder available, writing animated PNG instead of {path.name}")
+        path = path.with_suffix(".png")
+    from PIL import Image
+    imgs = [Image.fromarray(cv2.cvtColor(f, cv2.COLOR_BGR2RGB) if f.ndim == 3 else f) for _t, f in frames]
+    # real capture timing, so pauses in the UI stay visible
+    durations = [max(20, int((frames[i + 1][0] - frames[i][0]) * 1000)) for i in range(len(frames) - 1)]
+    durations.append(int(1000 / fps))
+    imgs[0].save(path, format="PNG", save_all=True, append_images=imgs[1:], duration=durations, loop=0)
+    return path
+
+
+# ---------- live recorder (Windows) ----------
+
+_ACTIVE: Dict[int, "ClipRecorder"] = {}
+
+def active_recorder(hwnd) -> Optional["ClipRecorder"]:
+    """Running recorder for this window, if any (used by reporter.step on failure)."""
+    return _ACTIVE.get(hwnd) if hwnd is not None else None
+
+
+class ClipRecorder:
+    """Background capture of the client area into a DeltaFrameRing."""
+
+    def __init__(self, hwnd, seconds: float = DEFAULT_SECONDS, fps: float = DEFAULT_FPS,
+                 scale: float = DEFAULT_SCALE, max_bytes: int = MAX_BYTES):
+        if fps <= 0 or seconds <= 0:
+            raise ValueError("fps and seconds must be > 0")
+        self.hwnd = hwnd
+        self.fps = fps
+        self.scale = scale
+        self.period = 1.0 / fps
+        self.ring = DeltaFrameRing(max(1, int(round(seconds * fps))), max_bytes,
+                                   group_size=max(1, int(fps * 4)))
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+        # cost accounting (measured inside the recorder thread)
+        self._frames = 0
+        self._cpu_s = 0.0
+        self._capture_s = 0.0
+        self._peak_bytes = 0
+        self._t_start = 0.0
+        self._t_end = 0.0
+
+    # ---------- lifecycle ----------
+
+    def start(self) -> "ClipRecorder":
+        if self._thread is not None:
+            raise RuntimeError("ClipRecorder already started")
+        self._t_start = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="clip-recorder", daemon=True)
+        self._thread.start()
+        _ACTIVE[self.hwnd] = self
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+        self._t_end = time.perf_counter()
+        if _ACTIVE.get(self.hwnd) is self:
+            del _ACTIVE[self.hwnd]
+        if self._error is not None:
+            print(f"[WARN] ClipRecorder stopped early: {self._error}")
+
+    def __enter__(self) -> "ClipRecorder":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # ---------- capture loop ----------
+
+    def _run(self) -> None:
+        from .framebus import active_bus
+        bus = active_bus(self.hwnd)
+        if bus is not None:
+            self._run_on_bus(bus)
+            return
+        from .ocr import _grab_client_bgr
+        deadline = time.perf_counter()
+        try:
+            while not self._stop.is_set():
+                c0 = time.thread_time()
+                t = time.perf_counter()
+                img, _rect = _grab_client_bgr(self.hwnd)
+                self._capture_s += time.perf_counter() - t
+                if self.scale != 1.0:
+                    img = cv2.resize(img, None, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_AREA)
+                self.ring.push(t, img)
+                self._frames += 1
+                self._peak_bytes = max(self._peak_bytes, self.ring.nbytes)
+                self._cpu_s += time.thread_time() - c0
+
+                deadline += self.period
+                now = time.perf_counter()
+                if now > deadline:
+                    deadline = now       # low FPS: just skip ahead, nothing to catch up on
+                self._stop.wait(max(0.0, deadline - now))
+        except BaseException as e:  # window closed etc.; reported by stop()
+            self._error = e
+
+    def _run_on_bus(self, bus) -> None:
+        """Same loop, fed by the shared capture thread (core.framebus) at the recorder's rate."""
+        seq = 0
+        try:
+            with bus.subscribe(self.fps):
+                while not self._stop.is_set():
+                    try:
+                        f = bus.newer_than(seq, timeout=1.0)
+                    except RuntimeError:
+                        if not bus.running:
+                            raise
+                        continue
+                    c0 = time.thread_time()
+                    seq = f.seq
+                    img = f.img
+                    if self.scale != 1.0:
+                        img = cv2.resize(img, None, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_AREA)
+                    self.ring.push(f.t, img)
+                    self._frames += 1
+                    self._peak_bytes = max(self._peak_bytes, self.ring.nbytes)
+                    self._cpu_s += time.thread_time() - c0
+        except BaseException as e:
+            self._error = e
+
+    # ---------- output ----------
+
+    def dump(self, path: Path, last_s: Optional[float] = None) -> Optional[Path]:
+        """Write the buffered frames (optionally only the last 'last_s' seconds) as a clip."""
+        since = time.perf_counter() - last_s if last_s else None
+        return write_clip(list(self.ring.frames(since)), path, self.fps)
+
+    def stats(self) -> Dict[str, float]:
+        end = self._t_end if self._stop.is_set() and self._t_end else time.perf_counter()
+        elapsed = max(1e-9, end - self._t_start) if self._t_start else 0.0
+        return {
+            "fps": round(self._frames / elapsed, 2) if elapsed else 0.0,
+            "frames": self._frames,
+            "buffered": len(self.ring),
+            "cpu_pct": round(100.0 * self._cpu_s / elapsed, 2) if elapsed else 0.0,
+            "capture_ms": round(1000.0 * self._capture_s / max(1, self._frames), 2),
+            "mem_kb": round(self.ring.nbytes / 1024, 1),
+            "peak_mem_kb": round(self._peak_bytes / 1024, 1),
+        }
@@ -2,17 +2,15 @@
 import pathlib
 from typing import Optional, Tuple
 import base64
-import pyautogui
-import win32gui
 from contextlib import contextmanager
 import html
 import re
 from datetime import datetime
 from pathlib import Path
 
-# pyautogui base settings are kept here to make screenshots fast and disable failsafe stops
-pyautogui.FAILSAFE = False
-pyautogui.PAUSE = 0.02
+# pyautogui (and its FAILSAFE/PAUSE settings) come from core.backend on first screenshot
+from .backend import gui
+from .budget import as_dicts, check, collect
 
 
 def _client_region(hwnd) -> Optional[Tuple[int, int, int, int]]:
@@ -20,19 +18,9 @@ def _client_region(hwnd) -> Optional[Tuple[int, int, int, int]]:
     Returns the client rectangle of hwnd in screen coordinates as (x, y, w, h),
     or None if the window is unavailable.
     """
-    if not hwnd or not win32gui.IsWindow(hwnd):
-        return None
-    try:
-        l, t, r, b = win32gui.GetClientRect(hwnd)
-        (sx, sy) = win32gui.ClientToScreen(hwnd, (l, t))
-        (ex, ey) = win32gui.ClientToScreen(hwnd, (r, b))
-        w = max(0, ex - sx)
-        h = max(0, ey - sy)
-        if w <= 0 or h <= 0:
-            return None
-        return (sx, sy, w, h)
-    except Exception:
-        return None
+    from .dpi import client_map
+    cm = client_map(hwnd)
+    return (cm.left, cm.top, cm.width, cm.height) if cm is not None else None
 
 
 def _draw_hr_roi_overlay(img, client_w: int, client_h: int) -> None:
@@ -69,13 +57,20 @@ def save_client_screenshot(hwnd, dest_path: pathlib.Path, draw_hr_roi: bool = Tr
     """
     dest_path.parent.mkdir(parents=True, exist_ok=True)
     region = _client_region(hwnd)
+    from .framebus import active_bus
+    bus = active_bus(hwnd) if region else None
 
     # Screenshot
-    if region:
-        img = pyautogui.screenshot(region=region)  # PIL.Image
+    if bus is not None:
+        from PIL import Image
+        frame = bus.fresh()
+        img = Image.fromarray(frame.img[:, :, ::-1])       # BGR -> RGB (copy)
+        client_w, client_h = img.size
+    elif region:
+        img = gui().screenshot(region=region)  # PIL.Image
         client_w, client_h = region[2], region[3]
     else:
-        img = pyautogui.screenshot()
+        img = gui().screenshot()
         client_w, client_h = img.size
 
     if draw_hr_roi:
@@ -110,13 +105,54 @@ def _ensure_node_state(request):
     return node
 
 import base64
+import os
+import time
 
-def _append_step_card(node, step):
+# 1 = embed step screenshots into the HTML as base64 (portable single file, but every image
+# stays in memory until the session ends); default links them by path
+EMBED_SCREENSHOTS = os.environ.get("SIMPAD_REPORT_EMBED", "0") == "1"
+
+def _href(p: Path, report_dir: Path | None) -> str:
+    """Link to an artifact relative to the HTML report, so reports/ + artifacts/ can be moved together."""
+    try:
+        return Path(os.path.relpath(p, Path(report_dir).resolve())).as_posix() if report_dir else p.as_uri()
+    except ValueError:   # other drive on Windows
+        return p.as_uri()
+
+BUDGET_COLORS = {"green": "#16a34a", "amber": "#f59e0b", "red": "#dc2626"}
+
+def _append_step_card(node, step, report_dir: Path | None = None):
     status = step["status"]
     name = html.escape(step["name"])
     times = f'{step["started"]} → {step.get("ended","")}'
     color = {"passed":"#16a34a","failed":"#dc2626","skipped":"#a3a3a3"}.get(status,"#2563eb")
 
+    screen_html = ""
+    if step.get("screen"):
+        screen_html = f'<div style="font-size:12px;">Screen: <code>{html.escape(step["screen"])}</code></div>'
+
+    clip_html = ""
+    if step.get("clip"):
+        c = Path(step["clip"]).resolve()
+        href = _href(c, report_dir)
+        clip_html = (f'<div style="font-size:12px;">Clip (last seconds before the failure): '
+                     f'<a href="{html.escape(href)}">{html.escape(c.name)}</a></div>')
+
+    profile_html = ""
+    if step.get("profile"):
+        svg, folded = (Path(x).resolve() for x in step["profile"])
+        profile_html = (f'<div style="font-size:12px;">Profile: <a href="{html.escape(_href(svg, report_dir))}">flamegraph</a>'
+                        f' · <a href="{html.escape(_href(folded, report_dir))}">{html.escape(folded.name)}</a>'
+                        f' <span style="color:#6b7280;">{html.escape(step.get("profile_summary") or "")}</span></div>')
+
+    budget_html = ""
+    if step.get("budgets"):
+        chips = "".join(
+            f'<span style="display:inline-block;margin:2px 4px 0 0;padding:0 6px;border-radius:8px;color:#fff;'
+            f'background:{BUDGET_COLORS[b.grade]};">{html.escape(b.describe())}</span>'
+            for b in step["budgets"])
+        budget_html = f'<div style="font-size:12px;">Budgets: {chips}</div>'
+
     shot_html = ""
     if step.get("screenshot"):
         p = Path(step["screenshot"]).resolve()
@@ -127,12 +163,16 @@ def _append_step_card(node, step):
         except Exception:
             rel_txt = str(p)
 
-        # embed thumbnail directly in the card (base64)
-        try:
-            data = base64.b64encode(p.read_bytes()).decode("ascii")
-            thumb = f'<img src="data:image/png;base64,{data}" style="max-width:420px;display:block;margin-top:4px;" />'
-        except Exception:
-            thumb = ""
+        if EMBED_SCREENSHOTS:
+            try:
+                data = base64.b64encode(p.read_bytes()).decode("ascii")
+                src = f"data:image/png;base64,{data}"
+            except Exception:
+                src = ""
+        else:
+            src = _href(p, report_dir)
+        thumb = (f'<a href="{html.escape(src)}"><img src="{html.escape(src)}" loading="lazy" '
+                 f'style="max-width:420px;display:block;margin-top:4px;" /></a>') if src else ""
 
         shot_html = f'<div>Screenshot: <code>{html.escape(rel_txt)}</code>{thumb}</div>'
 
@@ -140,6 +180,10 @@ def _append_step_card(node, step):
     <div style="border:1px solid #e5e7eb;border-left:6px solid {color};padding:8px;margin:6px 0;">
       <div><b>Step {step['idx']}:</b> {name} <span style="color:{color};">[{status}]</span></div>
       <div style="font-size:12px;color:#6b7280;">{times}</div>
+      {screen_html}
+      {clip_html}
+      {budget_html}
+      {profile_html}
       {shot_html}
     </div>
     """
@@ -147,25 +191,107 @@ def _append_step_card(node, step):
     try:
         from pytest_html import extras
         node._reporter_extras.append(extras.html(card))     # html card
-        if step.get("screenshot"):
+        if step.get("screenshot") and EMBED_SCREENSHOTS:
             # also attach a full-size image (in addition to the preview)
             node._reporter_extras.append(extras.image(str(Path(step["screenshot"]).resolve())))
     except Exception:
         pass
 
 
+def _check_screen(hwnd, expected: str, entry: dict) -> None:
+    """
+    Assert the current screen via the fingerprint library. A screen the library does not
+    know is skipped with a warning (SIMPAD_SCREENS=strict fails the step instead);
+    SIMPAD_SCREENS=record adds the current screen (controller / gw0 only).
+    """
+    from .screens import default_library, assert_screen, may_record, record_screen, screens_mode
+    lib = default_library()
+    mode = screens_mode()
+    if mode == "record" and may_record():
+        added = record_screen(hwnd, expected, lib)
+        entry["screen"] = f"{expected} ({'recorded' if added else 'already recorded'})"
+        return
+    if expected not in lib.screens():
+        entry["screen"] = f"{expected} (not in the screen library, not checked)"
+        msg = (f"Screen '{expected}' is not in the screen library ({lib.path}); record it with "
+               f"SIMPAD_SCREENS=record or 'python -m simpad_automation.core.screens record {expected}'")
+        if mode == "strict":
+            raise AssertionError(msg)
+        print(f"[WARN] {msg}")
+        return
+    m = assert_screen(hwnd, expected, lib)
+    entry["screen"] = f"{m.name} (d={m.distance:.3f}, margin={m.margin:.3f})"
+
+
+def _save_clip(hwnd, dest: Path, entry: dict) -> None:
+    """Dump the flight recorder of this window (core.recorder), if one is running."""
+    from .recorder import active_recorder
+    rec = active_recorder(hwnd)
+    if rec is None:
+        return
+    try:
+        entry["clip"] = rec.dump(dest)
+    except Exception as e:
+        print(f"[WARN] Could not write failure clip: {e}")
+
+
+def _start_profile():
+    """Per-step bucket of the running sampler (core.profiler, SIMPAD_PROFILE=1), if any."""
+    from .profiler import active_sampler
+    sampler = active_sampler()
+    return (sampler, sampler.open_bucket()) if sampler is not None else None
+
+
+def _save_profile(prof, dest_dir: Path | None, entry: dict) -> None:
+    """Close the step's profile bucket and write profile.folded / profile.svg next to the step artifacts."""
+    if prof is None:
+        return
+    from .profiler import save_profile
+    sampler, bucket = prof
+    sampler.close_bucket(bucket)
+    entry["profile_summary"] = ", ".join(f"{k} {v}%" for k, v in bucket.shares().items())
+    if dest_dir is None:
+        return
+    try:
+        files = save_profile(bucket, dest_dir, title=f"step {entry['idx']}: {entry['name']}")
+        if files:
+            entry["profile"] = (files[1], files[0])
+    except Exception as e:
+        print(f"[WARN] Could not write step profile: {e}")
+
+
+def _emit_step(node, entry: dict, t0: float) -> None:
+    """Stream the finished step to the JSONL report (core.eventlog) right away."""
+    from .eventlog import emit, artifact
+    arts = [{"kind": "clip", "path": artifact(entry["clip"])}] if entry.get("clip") else []
+    if entry.get("profile"):
+        arts += [{"kind": "flamegraph", "path": artifact(entry["profile"][0])},
+                 {"kind": "folded", "path": artifact(entry["profile"][1])}]
+    emit("step", test=getattr(node, "nodeid", None), idx=entry["idx"], name=entry["name"],
+         status=entry["status"], started=entry["started"], ended=entry["ended"],
+         duration_ms=round((time.perf_counter() - t0) * 1000.0, 1),
+         screenshot=artifact(entry.get("screenshot")), screen=entry.get("screen"),
+         profile=entry.get("profile_summary"), budgets=as_dicts(entry.get("budgets") or []), artifacts=arts)
+
+
 @contextmanager
-def step(request, name: str, hwnd=None, artifacts_dir: Path | None = None, draw_hr_roi: bool = True):
+def step(request, name: str, hwnd=None, artifacts_dir: Path | None = None, draw_hr_roi: bool = True,
+         expect_screen: str | None = None, budget_ms: float | None = None):
     """
     Step context manager.
     Example:
-        with step(request, "Open Device Info", hwnd, artifacts_dir):
+        with step(request, "Open Device Info", hwnd, artifacts_dir, expect_screen="device_info_popup"):
             click(...)
     On exception, saves a screenshot and marks the step as failed.
+    expect_screen: after the body, assert this screen is showing (core.screens fingerprints).
+    budget_ms: latency budget of the whole step (core.budget); budgets of calls inside the step
+    (read_hr_value(..., budget_ms=...)) are recorded on it too. SIMPAD_BUDGET_MODE=soft/hard enforces them.
+    With SIMPAD_PROFILE=1 the step's stack samples go to profile.folded / profile.svg in the step dir.
     """
     node = _ensure_node_state(request)
     node._step_idx += 1
     idx = node._step_idx
+    t0 = time.perf_counter()
     started = datetime.now().strftime("%H:%M:%S")
     entry = {
         "idx": idx,
@@ -175,6 +301,10 @@ def step(request, name: str, hwnd=None, artifacts_dir: Path | None = None, draw_
         "ended": None,
         "screenshot": None,
         "dir": None,
+        "screen": None,
+        "clip": None,
+        "profile": None,
+        "budgets": [],
     }
     node._steps.append(entry)
 
@@ -184,24 +314,35 @@ def step(request, name: str, hwnd=None, artifacts_dir: Path | None = None, draw_
         step_dir = Path(artifacts_dir) / f"step_{idx}_{_slug(name)}"
         step_dir.mkdir(parents=True, exist_ok=True)
         entry["dir"] = step_dir
+    prof = _start_profile()
 
-    try:
-        yield
-    except Exception:
-        entry["status"] = "failed"
-        entry["ended"] = datetime.now().strftime("%H:%M:%S")
-        # Save screenshot if hwnd is available
+    with collect() as budgets:
+        entry["budgets"] = budgets
         try:
-            if hwnd is not None and artifacts_dir is not None:
-                from .reporter import save_client_screenshot  # local import to avoid circular dependencies
-                shot_path = (step_dir or Path(artifacts_dir)) / "failed.png"
-                save_client_screenshot(hwnd, shot_path, draw_hr_roi=draw_hr_roi)
-                entry["screenshot"] = shot_path
-        finally:
-            pass
-        # Step card will be added to report in makereport (see conftest.py)
-        raise
-    else:
-        entry["status"] = "passed"
-        entry["ended"] = datetime.now().strftime("%H:%M:%S")
+            yield
+            if expect_screen and hwnd is not None:
+                _check_screen(hwnd, expect_screen, entry)
+            if budget_ms is not None:
+                check(f"step {idx}: {name}", (time.perf_counter() - t0) * 1000.0, budget_ms)
+        except Exception:
+            entry["status"] = "failed"
+            entry["ended"] = datetime.now().strftime("%H:%M:%S")
+            # Save screenshot if hwnd is available
+            try:
+                if hwnd is not None and artifacts_dir is not None:
+                    from .reporter import save_client_screenshot  # local import to avoid circular dependencies
+                    shot_path = (step_dir or Path(artifacts_dir)) / "failed.png"
+                    save_client_screenshot(hwnd, shot_path, draw_hr_roi=draw_hr_roi)
+                    entry["screenshot"] = shot_path
+                    _save_clip(hwnd, (step_dir or Path(artifacts_dir)) / "failed.mp4", entry)
+            finally:
+                _save_profile(prof, step_dir, entry)
+                _emit_step(node, entry, t0)
+            # Step card will be added to report in makereport (see conftest.py)
+            raise
+        else:
+            entry["status"] = "passed"
+            entry["ended"] = datetime.now().strftime("%H:%M:%S")
+            _save_profile(prof, step_dir, entry)
+            _emit_step(node, entry, t0)
     # Step card will be added in makereport
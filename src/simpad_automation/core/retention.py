@@ -0,0 +1,457 @@
+# -*- coding: utf-8 -*-
+"""
+Retention of test artifacts and reports (artifacts/, tests/artifacts/, reports/).
+- every file belongs to a run: files named with a session tag (report_<tag>.html,
+  events_<tag>.jsonl, summary_<tag>.json, fragments/<tag>_gw0.json) to that tag, other
+  files (screenshots, step folders, ocr_debug, profiles, clips) to the run whose time span
+  contains their mtime; files older than any known run are grouped per day (pre_<YYYYMMDD>)
+- policy (SIMPAD_RETENTION): the newest 'loose' runs stay as they are, older runs are
+  compacted into archive/<tag>.zip, runs older than 'days' / beyond 'runs' are deleted,
+  then the oldest runs go until everything fits in 'size'. The current run and runs
+  younger than GRACE_S are never touched.
+- compaction stores images content-addressed in archive/blobs/ (an image that is the same
+  in 50 runs is stored once); the zip holds everything else plus MANIFEST.json
+  (path -> blob). Loose files are not hardlinked: step images are rewritten in place by
+  the next run, which would change every link.
+- incremental: the index (archive/index.json) remembers each directory's mtime and
+  subdirectories; an unchanged directory is not listed again. Files rewritten in place
+  in such a directory are re-attributed by mtime when their old run is compacted.
+
+SIMPAD_RETENTION = off (default) | on (= days=14,runs=30,size=2G,loose=3) | any subset of keys
+Opt-in: scripts/run_ui.ps1 switches it on; a plain pytest run never deletes anything.
+
+    python -m simpad_automation.core.retention status|apply [--base DIR]
+    python -m simpad_automation.core.retention restore <tag> <dest> [--base DIR]
+
+conftest.py applies the policy at session end (controller only). Stdlib only; headless,
+safe to import on CI.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import time
+import zipfile
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+ROOTS = ("artifacts", "tests/artifacts", "reports")
+STORE = "artifacts/archive"
+IMAGE_EXT = (".png", ".jpg", ".jpeg", ".bmp")
+SKIP_NAMES = {"viewer.html", ".launch.lock", ".retention.lock"}
+GRACE_S = 3600.0        # runs that ended less than this ago may still be written by another session
+TAG_RE = re.compile(r"(\d{8}_\d{6})")
+_UNITS = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30, "T": 1 << 40}
+
+
+@dataclass
+class RetentionPolicy:
+    days: Optional[float] = 14
+    runs: Optional[int] = 30
+    size: Optional[int] = 2 << 30       # bytes
+    loose: int = 3
+
+    @classmethod
+    def parse(cls, spec: str) -> Optional["RetentionPolicy"]:
+        """
+        ''/'off' -> None; 'on' -> default policy; 'days=7,size=500M' -> policy
+        (missing keys keep their defaults, 'none' = no limit).
+        """
+        spec = (spec or "").strip()
+        if spec.lower() in ("", "off", "0", "false"):
+            return None
+        pol = cls()
+        if spec.lower() in ("on", "1", "true"):
+            return pol
+        for part in filter(None, (p.strip() for p in spec.split(","))):
+            key, _, val = part.partition("=")
+            key, val = key.strip().lower(), val.strip()
+            if key not in ("days", "runs", "size", "loose"):
+                raise ValueError(f"SIMPAD_RETENTION: unknown key {key!r} in {spec!r}")
+            if val.lower() == "none":
+                if key == "loose":
+                    raise ValueError("SIMPAD_RETENTION: loose needs a number")
+                setattr(pol, key, None)
+            elif key == "size":
+                m = re.fullmatch(r"(\d+(?:\.\d+)?)\s*([KMGT]?)B?", val.upper())
+                if not m:
+                    raise ValueError(f"SIMPAD_RETENTION: bad size {val!r}")
+                pol.size = int(float(m.group(1)) * _UNITS.get(m.group(2), 1))
+            else:
+                setattr(pol, key, float(val) if key == "days" else int(val))
+        return pol
+
+
+def policy_from_env() -> Optional[RetentionPolicy]:
+    return RetentionPolicy.parse(os.environ.get("SIMPAD_RETENTION", ""))
+
+
+def tag_time(tag: str) -> Optional[float]:
+    try:
+        return datetime.strptime(tag, "%Y%m%d_%H%M%S").timestamp()
+    except ValueError:
+        return None
+
+
+def _fmt_bytes(n: float) -> str:
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if n < 1024 or unit == "GiB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024.0
+    return f"{n:.1f} GiB"
+
+
+class RetentionManager:
+    """Index of runs and their files under 'base'; apply() enforces a RetentionPolicy."""
+
+    def __init__(self, base: Path | str, roots: Iterable[str] = ROOTS, store: str = STORE):
+        self.base = Path(base)
+        self.roots = [r for r in roots]
+        self.store = store.rstrip("/")
+        self.index_path = self.base / self.store / "index.json"
+        self.dirs: Dict[str, list] = {}          # dir -> [mtime_ns, [subdirs]]
+        self.files: Dict[str, list] = {}         # file -> [size, mtime, run]
+        self.runs: Dict[str, dict] = {}          # run -> {start, end, state, archive, bytes, blobs}
+        self.blobs: Dict[str, list] = {}         # sha -> [path, size, refs]
+        self.listed = 0                          # directories listed by the last scan
+        self._load()
+
+    # ---------- index ----------
+
+    def _load(self) -> None:
+        try:
+            raw = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            print(f"[WARN] Retention index unreadable, rebuilding: {e}")
+            return
+        self.dirs, self.files = raw.get("dirs", {}), raw.get("files", {})
+        self.runs, self.blobs = raw.get("runs", {}), raw.get("blobs", {})
+
+    def save(self) -> None:
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.index_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"version": 1, "dirs": self.dirs, "files": self.files,
+                                   "runs": self.runs, "blobs": self.blobs}), encoding="utf-8")
+        os.replace(tmp, self.index_path)
+
+    def _run(self, name: str, t: float) -> dict:
+        run = self.runs.get(name)
+        if run is None:
+            run = self.runs[name] = {"start": t, "end": t, "state": "loose", "archive": None,
+                                     "bytes": 0, "blobs": []}
+        run["start"], run["end"] = min(run["start"], t), max(run["end"], t)
+        return run
+
+    def _owner(self, rel: str, mtime: float, exclude: Optional[str] = None) -> str:
+        m = TAG_RE.search(Path(rel).name)
+        if m and tag_time(m.group(1)) is not None:
+            return m.group(1)
+        best = None
+        for name, run in self.runs.items():
+            if name != exclude and run["state"] == "loose" and run["start"] - 1.0 <= mtime and (best is None or run["start"] > self.runs[best]["start"]):
+                best = name
+        if best is not None and (mtime <= self.runs[best]["end"] + GRACE_S or tag_time(best) is not None):
+            return best
+        return "pre_" + datetime.fromtimestamp(mtime).strftime("%Y%m%d")
+
+    # ---------- incremental scan ----------
+
+    def begin_run(self, tag: str) -> None:
+        """Register the current session (start from its tag) so its files are attributed to it."""
+        t = tag_time(tag) or time.time()
+        self._run(tag, t)["end"] = max(self._run(tag, t)["end"], time.time())
+
+    def scan(self) -> int:
+        """Pick up new / changed / removed files; unchanged directories are not listed. Returns new files."""
+        self.listed = 0
+        by_dir: Dict[str, set] = {}
+        for rel in self.files:
+            by_dir.setdefault(os.path.dirname(rel), set()).add(rel)
+        new = 0
+        stack = [r for r in self.roots if (self.base / r).is_dir()]
+        for gone in [d for d in self.dirs if not any(d == r or d.startswith(r + "/") for r in stack)]:
+            del self.dirs[gone]
+        while stack:
+            rel_dir = stack.pop()
+            if rel_dir == self.store or rel_dir.startswith(self.store + "/"):
+                continue
+            full = self.base / rel_dir
+            try:
+                mtime_ns = os.stat(full).st_mtime_ns
+            except FileNotFoundError:
+                self._forget_dir(rel_dir, by_dir)
+                continue
+            cached = self.dirs.get(rel_dir)
+            if cached is not None and cached[0] == mtime_ns:
+                stack.extend(cached[1])
+                continue
+            self.listed += 1
+            subdirs, seen = [], set()
+            with os.scandir(full) as it:
+                for e in it:
+                    rel = f"{rel_dir}/{e.name}"
+                    if e.is_dir(follow_symlinks=False):
+                        subdirs.append(rel)
+                    elif e.is_file(follow_symlinks=False) and e.name not in SKIP_NAMES:
+                        seen.add(rel)
+                        st = e.stat()
+                        known = self.files.get(rel)
+                        if known is None or known[0] != st.st_size or known[1] != st.st_mtime:
+                            self._add_file(rel, st.st_size, st.st_mtime, known)
+                            new += 1
+            for rel in by_dir.get(rel_dir, set()) - seen:
+                self._drop_file(rel)
+            for old in set(cached[1] if cached else []) - set(subdirs):
+                self._forget_dir(old, by_dir)
+            self.dirs[rel_dir] = [mtime_ns, subdirs]
+            stack.extend(subdirs)
+        return new
+
+    def _add_file(self, rel: str, size: int, mtime: float, known: Optional[list],
+                  exclude: Optional[str] = None) -> None:
+        if known is not None:
+            self._drop_file(rel)
+        owner = self._owner(rel, mtime, exclude)
+        run = self._run(owner, mtime)
+        run["bytes"] += size
+        self.files[rel] = [size, mtime, owner]
+
+    def _drop_file(self, rel: str) -> None:
+        size, _mtime, owner = self.files.pop(rel)
+        if owner in self.runs:
+            self.runs[owner]["bytes"] = max(0, self.runs[owner]["bytes"] - size)
+
+    def _forget_dir(self, rel_dir: str, by_dir: Dict[str, set]) -> None:
+        for d in [d for d in self.dirs if d == rel_dir or d.startswith(rel_dir + "/")]:
+            for rel in by_dir.get(d, set()):
+                if rel in self.files:
+                    self._drop_file(rel)
+            del self.dirs[d]
+
+    # ---------- compaction ----------
+
+    def _run_files(self, name: str) -> List[str]:
+        return sorted(rel for rel, (_s, _m, owner) in self.files.items() if owner == name)
+
+    def _blob(self, path: Path) -> Tuple[str, str]:
+        h = hashlib.blake2b(digest_size=20)
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        sha = h.hexdigest()
+        rel = f"{self.store}/blobs/{sha[:2]}/{sha}{path.suffix.lower()}"
+        return sha, rel
+
+    def _rewritten(self, rel: str, st: os.stat_result, name: str) -> bool:
+        """
+        File rewritten in place after run 'name' ended (a step image overwritten by a later run
+        leaves its directory mtime alone, so scan() kept the old owner): re-attribute it
+        and return True - it must not be archived or deleted with it.
+        """
+        if st.st_mtime > self.runs[name]["end"] + 1.0 and TAG_RE.search(Path(rel).name) is None:
+            self._add_file(rel, st.st_size, st.st_mtime, self.files[rel], exclude=name)
+            return True
+        return False
+
+    def compact(self, name: str) -> int:
+        """Move a loose run into archive/<name>.zip (+ shared image blobs). Returns bytes freed."""
+        run = self.runs[name]
+        archive = self.base / self.store / f"{name}.zip"
+        archive.parent.mkdir(parents=True, exist_ok=True)
+        manifest: Dict[str, str] = {}
+        moved, freed = [], 0
+        with zipfile.ZipFile(archive, "a" if archive.exists() else "w", zipfile.ZIP_DEFLATED) as zf:
+            for rel in self._run_files(name):
+                path = self.base / rel
+                try:
+                    st = path.stat()
+                except FileNotFoundError:
+                    self._drop_file(rel)
+                    continue
+                if self._rewritten(rel, st, name):
+                    continue
+                if path.suffix.lower() in IMAGE_EXT:
+                    sha, blob_rel = self._blob(path)
+                    blob = self.blobs.get(sha)
+                    if blob is None:
+                        (self.base / blob_rel).parent.mkdir(parents=True, exist_ok=True)
+                        shutil.copy2(path, self.base / blob_rel)
+                        blob = self.blobs[sha] = [blob_rel, st.st_size, 0]
+                    if sha not in run["blobs"]:
+                        blob[2] += 1
+                        run["blobs"].append(sha)
+                    manifest[rel] = sha
+                else:
+                    zf.write(path, rel)
+                moved.append(rel)
+                freed += st.st_size
+            if manifest:
+                old = json.loads(zf.read("MANIFEST.json")) if "MANIFEST.json" in zf.namelist() else {}
+                old.update(manifest)
+                zf.writestr("MANIFEST.json", json.dumps(old, indent=1))
+        for rel in moved:
+            (self.base / rel).unlink(missing_ok=True)
+            self._drop_file(rel)
+        self._prune_dirs(moved)
+        run.update(state="archived", archive=f"{self.store}/{name}.zip", bytes=archive.stat().st_size)
+        return freed
+
+    def delete(self, name: str) -> int:
+        """Remove a run completely (loose files, archive, unreferenced blobs). Returns bytes freed."""
+        run = self.runs[name]
+        freed = 0
+        files = []
+        for rel in self._run_files(name):
+            try:
+                st = (self.base / rel).stat()
+            except FileNotFoundError:
+                self._drop_file(rel)
+                continue
+            if self._rewritten(rel, st, name):
+                continue
+            files.append(rel)
+        self.runs.pop(name)
+        for rel in files:
+            freed += self.files[rel][0]
+            (self.base / rel).unlink(missing_ok=True)
+            del self.files[rel]
+        self._prune_dirs(files)
+        if run.get("archive"):
+            p = self.base / run["archive"]
+            freed += p.stat().st_size if p.exists() else 0
+            p.unlink(missing_ok=True)
+        for sha in run.get("blobs", []):
+            blob = self.blobs.get(sha)
+            if blob is not None:
+                blob[2] -= 1
+                if blob[2] <= 0:
+                    (self.base / blob[0]).unlink(missing_ok=True)
+                    freed += blob[1]
+                    del self.blobs[sha]
+        return freed
+
+    def _prune_dirs(self, removed: List[str]) -> None:
+        """Remove directories the removed files left empty (never a root)."""
+        dirs = sorted({os.path.dirname(r) for r in removed}, key=len, reverse=True)
+        for rel_dir in dirs:
+            while rel_dir and rel_dir not in self.roots:
+                try:
+                    (self.base / rel_dir).rmdir()
+                except OSError:
+                    break
+                self.dirs.pop(rel_dir, None)
+                parent = os.path.dirname(rel_dir)
+                if parent in self.dirs:
+                    self.dirs[parent][1] = [d for d in self.dirs[parent][1] if d != rel_dir]
+                rel_dir = parent
+
+    # ---------- policy ----------
+
+    def total_bytes(self) -> int:
+        return sum(r["bytes"] for r in self.runs.values()) + sum(b[1] for b in self.blobs.values())
+
+    def apply(self, policy: RetentionPolicy, current: Optional[str] = None,
+              now: Optional[float] = None, grace_s: float = GRACE_S) -> Dict[str, object]:
+        """Scan, compact and delete according to the policy. Returns what was done."""
+        now = time.time() if now is None else now
+        if current:
+            self.begin_run(current)
+        new = self.scan()
+        order = sorted(self.runs, key=lambda n: self.runs[n]["end"], reverse=True)   # newest first
+        protected = {n for n in order if n == current or now - self.runs[n]["end"] < grace_s}
+        compacted, deleted, freed = [], [], 0
+
+        for i, name in enumerate(order):
+            run = self.runs[name]
+            if name in protected:
+                continue
+            too_old = policy.days is not None and now - run["end"] > policy.days * 86400.0
+            too_many = policy.runs is not None and i >= policy.runs
+            if too_old or too_many:
+                freed += self.delete(name)
+                deleted.append(name)
+            elif i >= policy.loose and run["state"] == "loose":
+                before = run["bytes"]
+                self.compact(name)
+                freed += max(0, before - self.runs[name]["bytes"])
+                compacted.append(name)
+
+        if policy.size is not None:
+            for name in reversed([n for n in order if n in self.runs and n not in protected]):
+                if self.total_bytes() <= policy.size:
+                    break
+                freed += self.delete(name)
+                deleted.append(name)
+        self.save()
+        return {"new_files": new, "listed_dirs": self.listed, "compacted": compacted, "deleted": deleted,
+                "freed": freed, "total": self.total_bytes(), "runs": len(self.runs)}
+
+    def restore(self, name: str, dest: Path | str) -> Path:
+        """Extract an archived run (zip members + its images from the blob store) under dest."""
+        run = self.runs.get(name)
+        if run is None or not run.get("archive"):
+            raise RuntimeError(f"Retention: run {name!r} has no archive")
+        dest = Path(dest)
+        with zipfile.ZipFile(self.base / run["archive"]) as zf:
+            zf.extractall(dest)
+            manifest = json.loads(zf.read("MANIFEST.json")) if "MANIFEST.json" in zf.namelist() else {}
+        for rel, sha in manifest.items():
+            (dest / rel).parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(self.base / self.blobs[sha][0], dest / rel)
+        return dest
+
+    def status(self) -> List[str]:
+        lines = []
+        for name in sorted(self.runs, key=lambda n: self.runs[n]["end"], reverse=True):
+            r = self.runs[name]
+            when = datetime.fromtimestamp(r["end"]).strftime("%Y-%m-%d %H:%M")
+            lines.append(f"{name:18s} {when}  {r['state']:8s} {_fmt_bytes(r['bytes']):>10s}"
+                         + (f"  {len(r['blobs'])} images" if r["blobs"] else ""))
+        lines.append(f"total {_fmt_bytes(self.total_bytes())} in {len(self.runs)} runs, "
+                     f"{len(self.blobs)} shared images")
+        return lines
+
+
+def apply_retention(base: Path | str, current: Optional[str] = None,
+                    policy: Optional[RetentionPolicy] = None) -> Optional[Dict[str, object]]:
+    """Session-end entry point: apply the policy from SIMPAD_RETENTION (None when switched off)."""
+    policy = policy or policy_from_env()
+    if policy is None:
+        return None
+    from .workers import launch_lock
+    try:
+        with launch_lock(Path(base) / "artifacts" / ".retention.lock", timeout=5.0):
+            res = RetentionManager(base).apply(policy, current=current)
+    except RuntimeError as e:
+        print(f"[WARN] Retention skipped: {e}")
+        return None
+    if res["compacted"] or res["deleted"]:
+        print(f"[CLEAN] Retention: compacted {len(res['compacted'])} run(s), deleted {len(res['deleted'])}, "
+              f"freed {_fmt_bytes(res['freed'])}; {_fmt_bytes(res['total'])} kept in {res['runs']} runs")
+    return res
+
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="Artifact / report retention")
+    ap.add_argument("command", choices=("status", "apply", "restore"))
+    ap.add_argument("args", nargs="*", help="restore: <tag> <dest>")
+    ap.add_argument("--base", default=".", help="repository root (default: current directory)")
+    a = ap.parse_args()
+    mgr = RetentionManager(a.base)
+    if a.command == "status":
+        mgr.scan()
+        mgr.save()
+        print("\n".join(mgr.status()))
+    elif a.command == "apply":
+        print(apply_retention(a.base))
+    else:
+        if len(a.args) != 2:
+            ap.error("restore needs <tag> <dest>")
+        print(f"[INFO] Restored into {mgr.restore(*a.args)}")
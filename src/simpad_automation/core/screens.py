@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+"""
+Screen-state classifier: which SimPad screen is showing, from a tiny fingerprint.
+- fingerprint = client area -> grayscale -> 32x32 (INTER_AREA) -> zero-mean, unit-norm vector
+- library = N reference fingerprints (several samples per screen allowed), stored as .npz
+- identify() = one matrix-vector product over the whole library (well under 1 ms)
+
+Recording the library ui/screens.npz (once per app version / theme; it is host-specific
+and git-ignored):
+- SIMPAD_SCREENS=record pytest -m ui: every step(expect_screen=...) of the E2E run adds the
+  screen it ends on instead of checking it (scripts/run_ui.ps1 does this while the file
+  does not exist yet). Only one process writes (the controller or xdist worker gw0), the
+  file is replaced atomically, and a capture that matches a DIFFERENT known screen is
+  refused, so a wrong navigation cannot poison the library
+- by hand, with SimPad open on that screen:
+    python -m simpad_automation.core.screens record hr_slider
+    python -m simpad_automation.core.screens list
+
+SIMPAD_SCREENS = check (default: a screen missing from the library is skipped with a
+warning) | strict (a missing screen fails the step) | record
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+import os
+import time
+
+import cv2
+import numpy as np
+
+from simpad_automation.ui.navigation import SCREENS
+
+FP_SIZE = 32
+DEFAULT_LIBRARY = Path(__file__).resolve().parents[1] / "ui" / "screens.npz"
+
+# Screens the library is expected to know (names used by step(expect_screen=...))
+KNOWN_SCREENS = SCREENS
+SAME_SAMPLE = 0.15     # a capture this close to a sample of the same screen adds nothing when recording
+
+
+def screens_mode() -> str:
+    """'check' | 'strict' | 'record' (SIMPAD_SCREENS)."""
+    mode = os.environ.get("SIMPAD_SCREENS", "check").lower()
+    return mode if mode in ("check", "strict", "record") else "check"
+
+
+def may_record() -> bool:
+    """Only the controller or xdist worker gw0 writes the library (workers would race on one file)."""
+    from .workers import worker_id
+    return worker_id() in (None, "gw0")
+
+
+def fingerprint(img_bgr: np.ndarray, size: int = FP_SIZE) -> np.ndarray:
+    """Low-res, brightness/contrast-invariant grayscale fingerprint (float32, unit norm)."""
+    gray = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2GRAY) if img_bgr.ndim == 3 else img_bgr
+    small = cv2.resize(gray, (size, size), interpolation=cv2.INTER_AREA).astype(np.float32).ravel()
+    small -= small.mean()
+    n = float(np.linalg.norm(small))
+    return small / n if n > 1e-6 else small
+
+
+@dataclass
+class ScreenMatch:
+    name: Optional[str]     # None if nothing is close enough
+    distance: float         # euclidean distance between unit fingerprints (0 = identical, 2 = opposite)
+    margin: float           # distance to the best OTHER screen minus 'distance'
+    runner_up: Optional[str]
+    us: float               # classification time, microseconds
+
+
+class ScreenLibrary:
+    """Reference fingerprints with labels; identification is vectorized over all of them."""
+
+    def __init__(self, names: Optional[List[str]] = None, vectors: Optional[np.ndarray] = None,
+                 path: Optional[Path] = None):
+        self.names: List[str] = list(names or [])
+        self.vectors = vectors if vectors is not None else np.zeros((0, FP_SIZE * FP_SIZE), np.float32)
+        self.path = path
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def screens(self) -> List[str]:
+        return sorted(set(self.names))
+
+    def add(self, name: str, img_bgr: np.ndarray) -> None:
+        """Add one reference sample for 'name' (several samples per screen are fine)."""
+        fp = fingerprint(img_bgr)
+        self.names.append(name)
+        self.vectors = np.vstack([self.vectors, fp[None, :]]).astype(np.float32)
+
+    def identify(self, img_bgr: np.ndarray, max_distance: float = 0.45) -> ScreenMatch:
+        t0 = time.perf_counter()
+        if not self.names:
+            return ScreenMatch(None, float("inf"), 0.0, None, 0.0)
+        fp = fingerprint(img_bgr)
+        # |a-b|^2 = 2 - 2 a.b for unit vectors -> one GEMV for the whole library
+        d = np.sqrt(np.maximum(0.0, 2.0 - 2.0 * (self.vectors @ fp)))
+        order = np.argsort(d)
+        best = int(order[0])
+        name = self.names[best]
+        runner_up, d2 = None, float("inf")
+        for k in order[1:]:
+            if self.names[int(k)] != name:
+                runner_up, d2 = self.names[int(k)], float(d[int(k)])
+                break
+        dist = float(d[best])
+        us = (time.perf_counter() - t0) * 1e6
+        return ScreenMatch(name if dist <= max_distance else None, dist, d2 - dist, runner_up, us)
+
+    # ---------- persistence ----------
+
+    def save(self, path: Optional[Path] = None) -> Path:
+        """Write to a temp file next to the library and rename it over (readers never see half a file)."""
+        p = Path(path or self.path or DEFAULT_LIBRARY)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        tmp = p.with_name(f".{p.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp, "wb") as f:
+                np.savez_compressed(f, names=np.array(self.names), vectors=self.vectors)
+            os.replace(tmp, p)
+        finally:
+            tmp.unlink(missing_ok=True)
+        self.path = p
+        return p
+
+    @classmethod
+    def load(cls, path: Optional[Path] = None) -> "ScreenLibrary":
+        p = Path(path or DEFAULT_LIBRARY)
+        with np.load(p) as data:
+            return cls([str(n) for n in data["names"]], data["vectors"].astype(np.float32), p)
+
+    @classmethod
+    def load_or_empty(cls, path: Optional[Path] = None) -> "ScreenLibrary":
+        p = Path(path or DEFAULT_LIBRARY)
+        return cls.load(p) if p.exists() else cls(path=p)
+
+
+# ---------- live helpers (Windows) ----------
+
+_default_lib: Optional[ScreenLibrary] = None
+
+def default_library() -> ScreenLibrary:
+    global _default_lib
+    if _default_lib is None:
+        _default_lib = ScreenLibrary.load_or_empty()
+    return _default_lib
+
+
+def capture_client_bgr(hwnd) -> np.ndarray:
+    from .ocr import _grab_client_bgr  # GUI stack only when actually capturing
+    img, _rect = _grab_client_bgr(hwnd)
+    return img
+
+
+def record_screen(hwnd, name: str, library: Optional[ScreenLibrary] = None) -> bool:
+    """
+    Add the current client area as a sample of 'name' and save the library.
+    Returns False when an almost identical sample of that screen is already recorded.
+    Raises AssertionError when the capture is recognized as another recorded screen
+    (the step did not end where it says; recording it would poison the library).
+    """
+    if name not in KNOWN_SCREENS:
+        raise ValueError(f"unknown screen '{name}' (ui/navigation.py SCREENS)")
+    lib = library or default_library()
+    img = capture_client_bgr(hwnd)
+    same = lib.identify(img, max_distance=SAME_SAMPLE)
+    if same.name == name:
+        return False
+    if same.name is not None:
+        raise AssertionError(f"not recording '{name}': the window shows the recorded screen '{same.name}' "
+                             f"(distance={same.distance:.3f})")
+    lib.add(name, img)
+    path = lib.save()
+    print(f"[INFO] Recorded screen '{name}' ({lib.names.count(name)} sample(s)) -> {path}")
+    return True
+
+
+def identify_screen(hwnd, library: Optional[ScreenLibrary] = None, max_distance: float = 0.45) -> ScreenMatch:
+    return (library or default_library()).identify(capture_client_bgr(hwnd), max_distance=max_distance)
+
+
+def assert_screen(hwnd, expected: str, library: Optional[ScreenLibrary] = None,
+                  max_distance: float = 0.45, min_margin: float = 0.05) -> ScreenMatch:
+    """Fail fast (AssertionError) if the current screen is not 'expected'."""
+    m = identify_screen(hwnd, library, max_distance)
+    if m.name != expected or m.margin < min_margin:
+        raise AssertionError(
+            f"expected screen '{expected}', got '{m.name}' "
+            f"(distance={m.distance:.3f}, margin={m.margin:.3f}, runner-up={m.runner_up})"
+        )
+    return m
+
+
+def wait_for_screen(hwnd, expected: str, timeout: float = 3.0, poll: float = 0.05,
+                    library: Optional[ScreenLibrary] = None, max_distance: float = 0.45) -> ScreenMatch:
+    """Poll until 'expected' is showing (replaces fixed sleeps after navigation)."""
+    t0 = time.time()
+    m = identify_screen(hwnd, library, max_distance)
+    while m.name != expected and time.time() - t0 < timeout:
+        time.sleep(poll)
+        m = identify_screen(hwnd, library, max_distance)
+    if m.name != expected:
+        raise AssertionError(f"screen '{expected}' not shown within {timeout}s (last: '{m.name}', "
+                             f"distance={m.distance:.3f})")
+    return m
+
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="SimPad screen fingerprint library")
+    ap.add_argument("command", choices=("record", "identify", "list"))
+    ap.add_argument("name", nargs="?", help="record: screen name (ui/navigation.py SCREENS)")
+    ap.add_argument("--library", type=Path, default=DEFAULT_LIBRARY)
+    a = ap.parse_args()
+    lib = ScreenLibrary.load_or_empty(a.library)
+    if a.command == "list":
+        missing = [s for s in KNOWN_SCREENS if s not in lib.screens()]
+        print(f"{lib.path}: {len(lib)} sample(s)")
+        for s in lib.screens():
+            print(f"  {s:20s} {lib.names.count(s)}")
+        print("missing: " + (", ".join(missing) or "none"))
+    else:
+        from .app import _simpad_windows
+        windows = sorted(_simpad_windows())
+        if not windows:
+            raise SystemExit("[ERROR] No SimPad window is open")
+        if a.command == "record":
+            if not a.name:
+                ap.error("record needs a screen name")
+            if not record_screen(windows[0], a.name, lib):
+                print(f"[INFO] '{a.name}' already has a sample like this one")
+        else:
+            m = identify_screen(windows[0], lib)
+            print(f"{m.name} (distance={m.distance:.3f}, margin={m.margin:.3f}, runner-up={m.runner_up})")
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""
+Closed-loop slider control: set a slider to a value instead of replaying a fixed drag.
+- the mapping value <-> knob position along the track is a line fitted to every
+  (position, value) pair seen so far; the first use learns it from the current value
+  and one probe drag, later uses (a sweep) start from the fitted line
+- each move drags the knob from where it is to the predicted position and reads the
+  value back through the caller's read()
+- a miss is corrected by bisection / interpolation inside the bracket of positions
+  already seen below and above the target (at most max_steps corrections)
+- learned points are kept per slider name for the process (SliderControl.reset() forgets)
+
+    ctl = SliderControl("level", drag, read, knob=0.584, probe=0.519)
+    res = ctl.set(70)
+    print(res.describe())
+
+The drag and the read-back are plain callables, so the search runs headless in tests.
+No SimPad slider is wired up yet: that needs a read-back ROI measured on a real capture.
+Headless, safe to import on CI.
+"""
+
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+MAX_STEPS = 3          # corrections after the first predicted drag
+MIN_MOVE = 0.002       # positions closer than this (about one pixel on the 640 px axis) are the same
+MAX_POINTS = 24        # newest (position, value) pairs kept per slider
+
+Point = Tuple[float, int]
+
+_POINTS: Dict[str, List[Point]] = {}
+
+
+@dataclass
+class SliderResult:
+    target: int
+    value: Optional[int]
+    position: float
+    drags: int                                   # incl. the probe drag when the mapping was learned here
+    moves: List[Point] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return self.value == self.target
+
+    def describe(self) -> str:
+        path = " -> ".join(f"{v}@{p:.3f}" for p, v in self.moves)
+        return f"target {self.target}: {self.value} after {self.drags} drag(s) ({path})"
+
+
+def fit_line(points: List[Point]) -> Optional[Tuple[float, float]]:
+    """Least-squares value = a + b * position; None with fewer than two distinct positions."""
+    n = len(points)
+    if n < 2:
+        return None
+    mp = sum(p for p, _ in points) / n
+    mv = sum(v for _, v in points) / n
+    var = sum((p - mp) ** 2 for p, _ in points)
+    if var < MIN_MOVE ** 2:
+        return None
+    b = sum((p - mp) * (v - mv) for p, v in points) / var
+    if b == 0:
+        return None
+    return mv - b * mp, b
+
+
+class SliderControl:
+    """
+    One slider: a knob position is the relative client coordinate along the track.
+    drag(from_pos, to_pos) moves the knob; read() returns the previewed value (None = unreadable).
+    """
+
+    def __init__(self, name: str, drag: Callable[[float, float], None], read: Callable[[], Optional[int]],
+                 knob: float, probe: Optional[float] = None, limits: Tuple[float, float] = (0.02, 0.98)):
+        self.name = name
+        self._drag = drag
+        self._read = read
+        self.knob = knob                # where the knob is now (best knowledge)
+        self.probe = probe              # first probe target when nothing is learned yet
+        self.limits = limits
+        self.points = _POINTS.setdefault(name, [])
+        self.drags = 0
+
+    def reset(self) -> None:
+        """Forget the learned mapping of this slider."""
+        self.points.clear()
+
+    # ---------- mapping ----------
+
+    def _remember(self, pos: float, value: Optional[int]) -> None:
+        if value is None:
+            return
+        self.points.append((pos, value))
+        del self.points[:-MAX_POINTS]
+
+    def position_of(self, value: float) -> Optional[float]:
+        """Predicted knob position for a value (None until two positions were seen)."""
+        line = fit_line(self.points)
+        if line is None:
+            return None
+        a, b = line
+        return self._clamp((value - a) / b)
+
+    def _clamp(self, pos: float) -> float:
+        return min(max(pos, self.limits[0]), self.limits[1])
+
+    # ---------- moves ----------
+
+    def read(self) -> Optional[int]:
+        v = self._read()
+        return self._read() if v is None else v
+
+    def move(self, pos: float) -> Optional[int]:
+        """Drag the knob to pos and read the preview back."""
+        pos = self._clamp(pos)
+        self._drag(self.knob, pos)
+        self.drags += 1
+        self.knob = pos
+        value = self.read()
+        self._remember(pos, value)
+        return value
+
+    def locate(self) -> Optional[int]:
+        """Read the current value; with a known mapping, the knob is where that value maps to."""
+        value = self.read()
+        if value is not None:
+            known = self.position_of(value)
+            if known is not None:
+                self.knob = known
+            else:
+                self._remember(self.knob, value)      # first use: the knob is where we were told
+        return value
+
+    def learn(self) -> Optional[int]:
+        """Make sure two distinct positions are known: one probe drag if needed (returns its value)."""
+        if fit_line(self.points) is not None:
+            return None
+        if self.probe is None:
+            raise RuntimeError(f"Slider '{self.name}': no mapping learned and no probe position given")
+        value = self.move(self.probe)
+        if value is None:
+            raise RuntimeError(f"Slider '{self.name}': preview value unreadable after the probe drag")
+        if fit_line(self.points) is None:
+            raise RuntimeError(f"Slider '{self.name}': probe drag did not change the value")
+        return value
+
+    def _next(self, target: int) -> float:
+        """Bracketed interpolation between the closest positions below/above the target, else the fitted line."""
+        below = [(p, v) for p, v in self.points if v < target]
+        above = [(p, v) for p, v in self.points if v > target]
+        pred = self.position_of(target)
+        if below and above:
+            p0, v0 = min(below, key=lambda pv: target - pv[1])
+            p1, v1 = min(above, key=lambda pv: pv[1] - target)
+            mid = p0 + (p1 - p0) * (target - v0) / (v1 - v0)
+            # interpolation can stall on a plateau of equal values: bisect when it would barely move
+            if min(abs(mid - p0), abs(mid - p1)) < MIN_MOVE:
+                mid = (p0 + p1) / 2.0
+            return mid
+        return pred if pred is not None else self.knob
+
+    def set(self, target: int, max_steps: int = MAX_STEPS) -> SliderResult:
+        """Drag to the predicted position, then correct up to max_steps times."""
+        drags0 = self.drags
+        moves: List[Point] = []
+        value = self.locate()
+        if value == target:
+            return SliderResult(target, value, self.knob, 0, moves)
+        probed = self.learn()
+        if probed is not None:
+            value = probed
+            moves.append((self.knob, value))
+        for _ in range(max_steps + 1):
+            if value == target:
+                break
+            pos = self._next(target)
+            if abs(pos - self.knob) < MIN_MOVE:
+                break                              # resolution reached (value not on the track?)
+            value = self.move(pos)
+            moves.append((self.knob, value))
+        return SliderResult(target, value, self.knob, self.drags - drags0, moves)
+
@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""
+Screen text map: OCR a region ONCE (word boxes + confidences), then answer any number
+of phrase / location queries against it.
+- words are indexed by normalized text (same normalization as verify.py)
+- contains_phrase() aligns the phrase only around fuzzy anchor hits from the index
+- locate() returns the client-relative box of the matched words (usable with click_relative)
+- screen_text_map() keeps the map cached until the captured pixels change
+"""
+
+from __future__ import annotations
+import re
+import zlib
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .verify import (
+    STOPWORDS, _sim, _norm_word, _tokenize_expected, _prep_variants, _line_upscale,
+    _align_dp, _pairs_ok, _use_pytesseract, _grab_roi_bgr,
+)
+
+_GOOD_CONF = 85.0       # stop trying variants once mean word confidence reaches this
+
+
+@dataclass
+class Word:
+    text: str                                   # raw OCR text
+    norm: str                                   # _norm_word(text), "" for digits/punctuation
+    box: Tuple[float, float, float, float]      # (rx, ry, rw, rh) relative to the client area
+    conf: float                                 # tesseract confidence 0..100
+    line: Tuple[int, int, int]                  # (block, paragraph, line) from tesseract
+
+
+@dataclass
+class PhraseMatch:
+    ok: bool
+    phrase: str
+    pairs: List[Tuple[str, str, float]]
+    words: List[Word] = field(default_factory=list)
+
+    @property
+    def box(self) -> Optional[Tuple[float, float, float, float]]:
+        """Union box of the matched words (client-relative), None if nothing matched."""
+        if not self.words:
+            return None
+        x0 = min(w.box[0] for w in self.words)
+        y0 = min(w.box[1] for w in self.words)
+        x1 = max(w.box[0] + w.box[2] for w in self.words)
+        y1 = max(w.box[1] + w.box[3] for w in self.words)
+        return (x0, y0, x1 - x0, y1 - y0)
+
+    @property
+    def center(self) -> Optional[Tuple[float, float]]:
+        b = self.box
+        return None if b is None else (b[0] + b[2] / 2.0, b[1] + b[3] / 2.0)
+
+
+class TextMap:
+    """Word-level OCR result of one frame + an index for repeated queries."""
+
+    def __init__(self, words: List[Word], digest: int = 0):
+        self.words = words
+        self.digest = digest
+        self._tokens = [w.norm.lower() for w in words]
+        self._index: Dict[str, List[int]] = {}
+        for i, t in enumerate(self._tokens):
+            if t:
+                self._index.setdefault(t, []).append(i)
+        self._cache: Dict[Tuple, PhraseMatch] = {}
+
+    @property
+    def text(self) -> str:
+        return " ".join(w.text for w in self.words)
+
+    # ---------- queries ----------
+
+    def _anchors(self, token: str, min_ratio: float) -> List[int]:
+        """Word indices whose token fuzzily matches 'token' (exact index hit first)."""
+        hits = list(self._index.get(token, []))
+        if hits:
+            return hits
+        for key, idxs in self._index.items():
+            if _sim(key, token) >= min_ratio or token in key:
+                hits.extend(idxs)
+        return sorted(hits)
+
+    def find(self, phrase: str, min_ratio: float = 0.62, avg_threshold: float = 0.80) -> PhraseMatch:
+        key = (phrase, min_ratio, avg_threshold)
+        if key in self._cache:
+            return self._cache[key]
+
+        exp = _tokenize_expected(phrase)
+        best = PhraseMatch(False, phrase, [])
+        if exp:
+            # anchor on the longest content word; align only a window around each hit
+            content = [t for t in exp if t not in STOPWORDS] or exp
+            anchor = max(content, key=len)
+            a_pos = exp.index(anchor)
+            windows = []
+            for hit in self._anchors(anchor, min_ratio):
+                w = (max(0, hit - a_pos - 2), min(len(self._tokens), hit + (len(exp) - a_pos) + 2))
+                if w not in windows:
+                    windows.append(w)
+            # anchor word unreadable -> the (at most one) bad word rule may still pass on all words
+            windows = windows or [(0, len(self._tokens))]
+            best_score = float("-inf")
+            for lo, hi in windows:
+                idxs = [i for i in range(lo, hi) if self._tokens[i]]
+                src: List[Tuple[int, ...]] = []
+                pairs = _align_dp([self._tokens[i] for i in idxs], exp, min_ratio, src=src)
+                ok = _pairs_ok(pairs, min_ratio, avg_threshold)
+                score = sum(s for (_, _, s) in pairs) + (len(exp) if ok else 0)
+                if score > best_score:
+                    used = sorted({idxs[k] for t in src for k in t})
+                    best = PhraseMatch(ok, phrase, pairs, [self.words[i] for i in used])
+                    best_score = score
+        self._cache[key] = best
+        return best
+
+    def contains_phrase(self, phrase: str, min_ratio: float = 0.62, avg_threshold: float = 0.80) -> bool:
+        return self.find(phrase, min_ratio, avg_threshold).ok
+
+    def locate(self, phrase: str, min_ratio: float = 0.62,
+               avg_threshold: float = 0.80) -> Optional[Tuple[float, float, float, float]]:
+        """Client-relative (rx, ry, rw, rh) of the phrase, or None if it is not on screen."""
+        m = self.find(phrase, min_ratio, avg_threshold)
+        return m.box if m.ok else None
+
+    def contains_text(self, raw: str) -> bool:
+        """Exact (whitespace-insensitive) check on raw OCR text, e.g. codes like 'Error: -1'."""
+        squash = lambda s: re.sub(r"\s+", "", s).lower()
+        return squash(raw) in squash(self.text)
+
+
+# ---------- building ----------
+
+def _words_from_data(data: Dict[str, list], roi_xywh_rel: Tuple[float, float, float, float],
+                     client_size: Tuple[int, int], scale: float) -> List[Word]:
+    """tesseract image_to_data dict -> Words with client-relative boxes."""
+    rx, ry, _, _ = roi_xywh_rel
+    cw, ch = client_size
+    words = []
+    for k, text in enumerate(data["text"]):
+        text = str(text).strip()
+        conf = float(data["conf"][k])
+        if not text or conf < 0:
+            continue
+        l, t = data["left"][k] / scale, data["top"][k] / scale
+        w, h = data["width"][k] / scale, data["height"][k] / scale
+        words.append(Word(
+            text=text,
+            norm=_norm_word(text),
+            box=(rx + l / cw, ry + t / ch, w / cw, h / ch),
+            conf=conf,
+            line=(int(data["block_num"][k]), int(data["par_num"][k]), int(data["line_num"][k])),
+        ))
+    return words
+
+
+def build_text_map(img_bgr: np.ndarray, roi_xywh_rel: Tuple[float, float, float, float],
+                   client_size: Tuple[int, int], psm: int = 6) -> TextMap:
+    """
+    Word-level OCR of an already grabbed ROI image. Tries the binarized variants of
+    _prep_variants() and keeps the one with the most confident letters.
+    """
+    pytesseract = _use_pytesseract()
+    cfg = f"--oem 3 --psm {psm}"
+    best: List[Word] = []
+    best_score = -1.0
+    scale = _line_upscale()                 # word boxes are mapped back with the same factor
+    for v in _prep_variants(img_bgr, scale):
+        data = pytesseract.image_to_data(v, config=cfg, lang="eng", output_type=pytesseract.Output.DICT)
+        words = _words_from_data(data, roi_xywh_rel, client_size, scale)
+        score = sum(len(w.norm) * w.conf / 100.0 for w in words)
+        if score > best_score:
+            best, best_score = words, score
+        if words and np.mean([w.conf for w in words]) >= _GOOD_CONF:
+            break
+    return TextMap(best, digest=zlib.crc32(np.ascontiguousarray(img_bgr).data))
+
+
+_MAP_CACHE: Dict[Tuple, TextMap] = {}
+
+def screen_text_map(hwnd, client_rect: Dict[str, int],
+                    roi_xywh_rel: Tuple[float, float, float, float]) -> TextMap:
+    """
+    Grab the ROI and return its TextMap. OCR runs again only when the grabbed pixels
+    differ from the last call for the same (hwnd, roi).
+    """
+    img = _grab_roi_bgr(hwnd, roi_xywh_rel, client_rect)
+    digest = zlib.crc32(np.ascontiguousarray(img).data)
+    key = (hwnd, tuple(roi_xywh_rel))
+    cached = _MAP_CACHE.get(key)
+    if cached is not None and cached.digest == digest:
+        return cached
+    tm = build_text_map(img, roi_xywh_rel, (client_rect["width"], client_rect["height"]))
+    tm.digest = digest
+    _MAP_CACHE[key] = tm
+    return tm
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+Fixed-size time-series ring buffer for sampled readings (timestamp, value, confidence)
++ assertion helpers over the recorded series.
+Headless: numpy only, safe to import on CI.
+"""
+
+import math
+import threading
+from typing import Optional
+
+import numpy as np
+
+SAMPLE_DTYPE = np.dtype([("t", "f8"), ("value", "f8"), ("conf", "f4")])
+
+
+class TimeSeriesRing:
+    """
+    Thread-safe ring of samples. Oldest samples are overwritten when full.
+    value=None / conf=None are stored as NaN (no reading).
+    """
+
+    def __init__(self, capacity: int = 1024):
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self._buf = np.zeros(capacity, dtype=SAMPLE_DTYPE)
+        self._n = 0          # total samples ever appended
+        self._lock = threading.Lock()
+
+    @property
+    def capacity(self) -> int:
+        return len(self._buf)
+
+    def __len__(self) -> int:
+        return min(self._n, len(self._buf))
+
+    def append(self, t: float, value: Optional[float], conf: Optional[float] = None) -> None:
+        with self._lock:
+            self._buf[self._n % len(self._buf)] = (
+                t,
+                math.nan if value is None else value,
+                math.nan if conf is None else conf,
+            )
+            self._n += 1
+
+    def snapshot(self, since: Optional[float] = None, until: Optional[float] = None) -> np.ndarray:
+        """Copy of the stored samples in chronological order, optionally limited to [since, until]."""
+        with self._lock:
+            cap = len(self._buf)
+            if self._n <= cap:
+                arr = self._buf[:self._n].copy()
+            else:
+                i = self._n % cap
+                arr = np.concatenate((self._buf[i:], self._buf[:i]))
+        if since is not None:
+            arr = arr[arr["t"] >= since]
+        if until is not None:
+            arr = arr[arr["t"] <= until]
+        return arr
+
+    def latest(self) -> Optional[np.void]:
+        with self._lock:
+            if self._n == 0:
+                return None
+            return self._buf[(self._n - 1) % len(self._buf)].copy()
+
+    # ---------- queries / assertions ----------
+
+    def first_time_reaching(self, target: float, since: Optional[float] = None) -> Optional[float]:
+        """Timestamp of the first sample (at/after 'since') whose value == target, else None."""
+        arr = self.snapshot(since=since)
+        hit = np.flatnonzero(arr["value"] == target)
+        return float(arr["t"][hit[0]]) if hit.size else None
+
+    def assert_reaches(self, target: float, within_s: float, since: float) -> float:
+        """
+        Assert the series shows 'target' no later than 'within_s' seconds after 'since'.
+        Returns the reaction time in seconds.
+        """
+        t_hit = self.first_time_reaching(target, since=since)
+        if t_hit is None or t_hit - since > within_s:
+            seen = self.snapshot(since=since)["value"]
+            seen = [int(v) for v in seen[~np.isnan(seen)]]
+            when = "never" if t_hit is None else f"after {t_hit - since:.3f}s"
+            raise AssertionError(
+                f"value {target} not reached within {within_s}s ({when}); seen: {_compact(seen)}"
+            )
+        return t_hit - since
+
+    def assert_monotonic(self, since: float, until: Optional[float] = None,
+                         increasing: bool = True, tolerance: float = 0.0) -> None:
+        """
+        Assert recognized values in [since, until] never move against the expected direction
+        by more than 'tolerance' (missing readings are ignored).
+        """
+        vals = self.snapshot(since=since, until=until)["value"]
+        vals = vals[~np.isnan(vals)]
+        if vals.size < 2:
+            return
+        steps = np.diff(vals) if increasing else -np.diff(vals)
+        bad = np.flatnonzero(steps < -tolerance)
+        if bad.size:
+            k = int(bad[0])
+            direction = "increasing" if increasing else "decreasing"
+            raise AssertionError(
+                f"series not {direction}: {vals[k]:g} -> {vals[k + 1]:g} at sample {k + 1}; "
+                f"values: {_compact([int(v) for v in vals])}"
+            )
+
+
+def _compact(values) -> str:
+    """Run-length view of a value list for assertion messages: 80x3, 90, 100x5."""
+    out, prev, cnt = [], None, 0
+    for v in values:
+        if v == prev:
+            cnt += 1
+            continue
+        if prev is not None:
+            out.append(f"{prev}x{cnt}" if cnt > 1 else f"{prev}")
+        prev, cnt = v, 1
+    if prev is not None:
+        out.append(f"{prev}x{cnt}" if cnt > 1 else f"{prev}")
+    return ", ".join(out) or "<none>"
@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+"""
+Input pacing: every delay the input layer uses (pyautogui.PAUSE, cursor settle, button
+hold, double-click gap, post-click/focus/drag waits, key intervals, OCR retry sleep)
+comes from one TimingProfile instead of constants spread over the modules.
+- "safe": the historical constants (default when nothing is calibrated)
+- "fast": roughly halved, for a quick local machine
+- "calibrated": derived from the app's measured input-to-render latency on this host
+  (calibrate_timing), persisted per host in the user's data folder:
+  %LOCALAPPDATA%/simpad_automation/timing/<host>.json (~/.config/... elsewhere),
+  never inside the installed package; SIMPAD_TIMING_DIR overrides the folder
+
+SIMPAD_TIMING = auto (default: calibrated if this host has a profile, else safe) |
+safe | fast | calibrated. Explicit delay/interval arguments still win.
+
+Calibrate (Windows, launches SimPad):
+    python -m simpad_automation.core.timing calibrate
+Stdlib only at import (numpy is loaded by the measurement); headless, safe to import on CI.
+"""
+
+import json
+import os
+import socket
+import time
+from dataclasses import asdict, dataclass, fields, replace
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+@dataclass(frozen=True)
+class TimingProfile:
+    name: str = "safe"
+    pause: float = 0.02          # pyautogui.PAUSE (after every pyautogui call)
+    settle: float = 0.12         # cursor moved -> button down (SendInput)
+    hold: float = 0.03           # button down -> up
+    after_click: float = 0.1     # click_relative default delay
+    double_gap: float = 0.06     # between the two clicks of ensure_focus
+    after_focus: float = 0.2     # after ensure_focus
+    drag_grab: float = 0.05      # moveTo start -> mouseDown
+    after_drag: float = 0.1
+    key_interval: float = 0.03   # type_text
+    key_repeat: float = 0.02     # press_backspace
+    focus_poll: float = 0.05     # wait_foreground polling
+    ocr_retry: float = 0.08      # between OCR frames (read_digits_conf)
+
+    def describe(self) -> str:
+        return f"{self.name} (after_click {self.after_click * 1000:.0f} ms, settle {self.settle * 1000:.0f} ms)"
+
+
+SAFE = TimingProfile()
+FAST = TimingProfile(name="fast", pause=0.0, settle=0.04, hold=0.015, after_click=0.05, double_gap=0.04,
+                     after_focus=0.1, drag_grab=0.03, after_drag=0.05, key_interval=0.01, key_repeat=0.01,
+                     focus_poll=0.02, ocr_retry=0.04)
+PROFILES: Dict[str, TimingProfile] = {"safe": SAFE, "fast": FAST}
+
+def default_dir() -> Path:
+    """Per-user folder for calibrated profiles (%LOCALAPPDATA%, else $XDG_CONFIG_HOME or ~/.config)."""
+    base = os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CONFIG_HOME") or Path.home() / ".config"
+    return Path(base) / "simpad_automation" / "timing"
+
+
+def host_profile_path(host: Optional[str] = None, directory: Optional[Path] = None) -> Path:
+    d = Path(directory or os.environ.get("SIMPAD_TIMING_DIR") or default_dir())
+    return d / f"{(host or socket.gethostname()).lower()}.json"
+
+
+def save_profile(profile: TimingProfile, measured: Optional[Dict] = None, path: Optional[Path] = None) -> Path:
+    p = Path(path or host_profile_path())
+    p.parent.mkdir(parents=True, exist_ok=True)
+    data = {"host": socket.gethostname(), "created": datetime.now().isoformat(timespec="seconds"),
+            "measured": measured or {}, "profile": asdict(profile)}
+    p.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    return p
+
+
+def load_profile(path: Optional[Path] = None) -> Optional[TimingProfile]:
+    """Calibrated profile of this host (or from 'path'), None if there is none or it is unreadable."""
+    p = Path(path or host_profile_path())
+    if not p.exists():
+        return None
+    try:
+        raw = json.loads(p.read_text(encoding="utf-8"))["profile"]
+        known = {f.name for f in fields(TimingProfile)}
+        return TimingProfile(**{k: v for k, v in raw.items() if k in known})
+    except Exception as e:
+        print(f"[WARN] Ignoring unreadable timing profile {p}: {e}")
+        return None
+
+
+# ---------- active profile ----------
+
+_current: Optional[TimingProfile] = None
+
+def _from_env() -> TimingProfile:
+    name = os.environ.get("SIMPAD_TIMING", "auto").lower()
+    if name in PROFILES:
+        return PROFILES[name]
+    calibrated = load_profile()
+    if name == "calibrated" and calibrated is None:
+        print(f"[WARN] SIMPAD_TIMING=calibrated but {host_profile_path()} does not exist, using 'safe'")
+    elif name not in ("auto", "calibrated"):
+        print(f"[WARN] Unknown SIMPAD_TIMING={name!r}, using 'auto'")
+    return calibrated or SAFE
+
+
+def current_timing() -> TimingProfile:
+    """Active profile (resolved from SIMPAD_TIMING on first use)."""
+    global _current
+    if _current is None:
+        _current = _from_env()
+    return _current
+
+
+def use_timing(profile: TimingProfile | str) -> TimingProfile:
+    """Switch the process to a profile ('safe' | 'fast' | 'calibrated' | a TimingProfile)."""
+    global _current
+    if isinstance(profile, str):
+        if profile == "calibrated":
+            cal = load_profile()
+            if cal is None:
+                raise RuntimeError(f"No calibrated timing profile at {host_profile_path()}")
+            profile = cal
+        elif profile in PROFILES:
+            profile = PROFILES[profile]
+        else:
+            raise ValueError(f"timing profile must be one of {sorted(PROFILES) + ['calibrated']}, got {profile!r}")
+    _current = profile
+    from . import backend
+    if backend.initialized():
+        backend.init_backend(pause=profile.pause)     # re-apply pyautogui.PAUSE
+    return profile
+
+
+# ---------- calibration: input -> render latency ----------
+
+MIN_CHANGED = 0.01     # share of (downscaled) pixels that must change to count as a UI response
+PIXEL_DELTA = 24
+STABLE_S = 0.12        # no further change for this long = rendering settled
+
+
+def _small(img):
+    import numpy as np
+    g = img if img.ndim == 2 else img.mean(axis=2)
+    return np.ascontiguousarray(g[::4, ::4], dtype=np.int16)
+
+
+def _changed(a, b, min_changed: float = MIN_CHANGED) -> bool:
+    import numpy as np
+    if a.shape != b.shape:
+        return True
+    return np.count_nonzero(np.abs(a - b) > PIXEL_DELTA) >= min_changed * a.size
+
+
+def measure_response(act: Callable[[], None], grab: Callable[[], "np.ndarray"], timeout: float = 2.0,
+                     min_changed: float = MIN_CHANGED) -> Optional[Tuple[float, float]]:
+    """
+    Run act() and poll grab() until the picture changes and then holds still.
+    Returns (latency_s: act done -> first changed frame, settle_s: first -> last change),
+    or None if nothing changed within timeout.
+    """
+    prev = _small(grab())
+    act()
+    t_act = time.perf_counter()
+    first = last = None
+    while time.perf_counter() - t_act < timeout:
+        cur = _small(grab())
+        t = time.perf_counter()
+        if _changed(prev, cur, min_changed):
+            first = t if first is None else first
+            last = t
+        elif last is not None and t - last >= STABLE_S:
+            break
+        prev = cur
+    if first is None:
+        return None
+    return first - t_act, last - first
+
+
+def derive_profile(latencies: List[float], settles: List[float], grab_s: float = 0.0,
+                   base: TimingProfile = SAFE, floor: TimingProfile = FAST) -> TimingProfile:
+    """
+    Minimal delays for the measured response (p90 of the samples), clamped to [fast, safe]
+    for the pre-click pacing and to [fast, 3 x safe] for the waits after an action.
+    The capture time is the measurement resolution and is added as margin.
+    """
+    def p90(xs):
+        xs = sorted(xs)
+        return xs[min(len(xs) - 1, int(round(0.9 * (len(xs) - 1))))]
+
+    lat, settle = p90(latencies), p90(settles)
+    react = lat + settle + grab_s
+
+    def clamp(v, name, hi_mult=1.0):
+        return round(min(max(v, getattr(floor, name)), getattr(base, name) * hi_mult), 3)
+
+    return replace(
+        base, name="calibrated",
+        pause=clamp(0.1 * lat, "pause"),
+        settle=clamp(0.5 * lat, "settle"),
+        hold=clamp(0.25 * lat, "hold"),
+        double_gap=clamp(0.5 * lat, "double_gap"),
+        key_interval=clamp(0.25 * lat, "key_interval"),
+        key_repeat=clamp(0.25 * lat, "key_repeat"),
+        drag_grab=clamp(0.5 * lat, "drag_grab"),
+        focus_poll=clamp(0.5 * lat, "focus_poll"),
+        after_click=clamp(1.25 * react, "after_click", 3.0),
+        after_focus=clamp(1.25 * react, "after_focus", 3.0),
+        after_drag=clamp(1.25 * react, "after_drag", 3.0),
+        ocr_retry=clamp(lat + grab_s, "ocr_retry"),
+    )
+
+
+# screens toggled by the calibration CLI: a single-click round trip of ui/navigation.py NAV_EDGES
+# (Volume opens the panel, Back closes it), reached from the start screen through the graph
+CALIBRATION_TOGGLE = ("main", "volume")
+
+
+def calibrate_timing(hwnd, on: Tuple[float, float], off: Tuple[float, float], samples: int = 6,
+                     save: bool = True) -> TimingProfile:
+    """
+    Toggle between two UI states (click 'on', then 'off', both must visibly change the
+    client area), measure each response and derive the profile. Runs under the safe
+    profile; saves the result for this host unless save=False.
+    """
+    import statistics
+    from .ocr import _grab_client_bgr
+    from .window import click_relative
+    previous = current_timing()
+    use_timing(SAFE)
+    grab = lambda: _grab_client_bgr(hwnd)[0]
+    lats, settles, grabs = [], [], []
+    try:
+        for i in range(samples * 2):
+            point = on if i % 2 == 0 else off
+            t = time.perf_counter()
+            grab()
+            grabs.append(time.perf_counter() - t)
+            r = measure_response(lambda: click_relative(hwnd, *point, delay=0.0), grab)
+            if r is None:
+                print(f"[WARN] calibrate_timing: no visible response to click at {point}")
+                continue
+            lats.append(r[0])
+            settles.append(r[1])
+            time.sleep(SAFE.after_click)
+    finally:
+        use_timing(previous)
+    if len(lats) < samples:
+        raise RuntimeError(f"calibrate_timing: only {len(lats)} of {samples * 2} clicks changed the screen")
+    grab_s = statistics.median(grabs)
+    prof = derive_profile(lats, settles, grab_s)
+    measured = {"samples": len(lats), "grab_ms": round(grab_s * 1000, 1),
+                "latency_ms": [round(x * 1000, 1) for x in lats],
+                "settle_ms": [round(x * 1000, 1) for x in settles]}
+    print(f"[INFO] Timing calibration: {measured} -> {prof.describe()}")
+    if save:
+        print(f"[INFO] Saved timing profile: {save_profile(prof, measured)}")
+    return prof
+
+
+if __name__ == "__main__":
+    import sys
+    if sys.argv[1:2] != ["calibrate"]:
+        print(f"usage: python -m simpad_automation.core.timing calibrate   (current: {current_timing().describe()})")
+        sys.exit(0)
+    from .app import launch_app, close_app
+    from .nav import default_graph, follow
+    from simpad_automation.ui import controls as ui
+    graph = default_graph()
+    there, back = graph.round_trip(*CALIBRATION_TOGGLE)
+    process, hwnd = launch_app()
+    try:
+        follow(hwnd, graph.plan("home", there.src))
+        calibrate_timing(hwnd, on=getattr(ui, there.control), off=getattr(ui, back.control))
+    finally:
+        close_app(process, hwnd)
@@ -3,40 +3,71 @@
 Universal OCR phrase verifier for SimPad: robust, low-tuning.
 - Ensemble OCR (multi-psm, multi-threshold, invert/normal)
 - Weighted word-level fuzzy match (content words > stopwords)
-- Fallback: contour-based word segmentation + smart split for glued words
+- Fallback: native-resolution word segmentation (core.wordseg) + smart split for glued words
 - Debug artifacts -> artifacts/ocr_debug/<debug_name>/
 """
 
 from __future__ import annotations
 import re
 import tempfile
+import unicodedata
 from pathlib import Path
-from typing import Tuple, List, Dict
+from typing import TYPE_CHECKING, Tuple, List, Dict, Iterable, Optional
 import sys  # added for platform check
 
 import cv2
 import numpy as np
 
-# LAZY IMPORTS: avoid breaking module import on Linux/CI
-try:
-    import pyautogui as _pyautogui  # may be missing on CI
-except Exception:
-    _pyautogui = None
+from functools import lru_cache
 
-try:
-    import pytesseract as _pytesseract  # may be missing on CI
-except Exception:
-    _pytesseract = None
+from .backend import gui, ocr_engine
+from .workers import artifacts_root
+from .bufpool import scratch, resize_by, clahe
+from .inkbox import tighten
+from .dpi import ClientMap, upscale_for
+from .wordseg import WordBox, draw_boxes, enhance, segment_words, text_mask, word_crop
+from .budget import budget
+from .framebus import active_bus, crop_rel
 
-from difflib import SequenceMatcher
+if TYPE_CHECKING:
+    from .catalog import CatalogHit
 
 
 # ---------- small utils ----------
 
 STOPWORDS = {"to", "of", "and", "in", "on", "for", "the", "a", "an", "is", "at", "by"}
 
+def _lcs_len(a: str, b: str) -> int:
+    """Longest common subsequence length, bit-parallel (one int op per char of b)."""
+    if not a or not b:
+        return 0
+    masks: Dict[str, int] = {}
+    for i, ch in enumerate(a):
+        masks[ch] = masks.get(ch, 0) | (1 << i)
+    full = (1 << len(a)) - 1
+    v = full
+    for ch in b:
+        u = v & masks.get(ch, 0)
+        v = ((v + u) | (v - u)) & full
+    return len(a) - bin(v).count("1")
+
+@lru_cache(maxsize=65536)
+def _sim_lower(a: str, b: str) -> float:
+    if not a and not b:
+        return 1.0
+    return 2.0 * _lcs_len(a, b) / (len(a) + len(b))
+
 def _sim(a: str, b: str) -> float:
-    return SequenceMatcher(None, a.lower(), b.lower()).ratio()
+    """
+    Similarity 0..1 (2*LCS / total length, the indel-distance ratio), cached.
+    Never below the old SequenceMatcher ratio: its greedy blocks miss some common
+    characters, so a swapped pair of letters ('ndtot' / 'ndoit': 0.60 -> 0.80) now
+    counts as one lost character. Intended for OCR, which swaps and drops glyphs.
+    The 0.62 / 0.80 thresholds were rechecked against the old decisions on ~3.4k
+    corrupted and unrelated word pairs: they agree on 99.6 % / 99.97 %, and no other
+    threshold agrees better, so they are kept.
+    """
+    return _sim_lower(a.lower(), b.lower())
 
 _GLYPH_SUBS = str.maketrans({
     "x": "t", "X": "t",
@@ -45,8 +76,13 @@ _GLYPH_SUBS = str.maketrans({
     "5": "s", "S": "s",
 })
 
+# letters of any script (Latin, Cyrillic, umlauts...); digits, '_' and punctuation go.
+# NFC first so a decomposed 'ä' stays one letter. Same as [A-Za-z] on ASCII text.
+_NON_LETTERS = re.compile(r"[\W\d_]+")
+_NON_LETTERS_SPACES = re.compile(r"(?:[^\w ]|[\d_])+")
+
 def _letters_only(s: str) -> str:
-    return re.sub(r"[^A-Za-z ]+", " ", s)
+    return _NON_LETTERS_SPACES.sub(" ", unicodedata.normalize("NFC", s))
 
 def _norm_sentence(s: str) -> str:
     s = _letters_only(s)
@@ -54,7 +90,7 @@ def _norm_sentence(s: str) -> str:
     return s
 
 def _norm_word(s: str) -> str:
-    s = re.sub(r"[^A-Za-z]+", "", s).translate(_GLYPH_SUBS)
+    s = _NON_LETTERS.sub("", unicodedata.normalize("NFC", s)).translate(_GLYPH_SUBS)
     return s
 
 def _tokenize_expected(phrase: str) -> List[str]:
@@ -72,19 +108,15 @@ def _weighted_score(matches: List[Tuple[str, str, float]]) -> float:
     return total / max(1e-9, weight)
 
 
-# ---------- lazy deps helpers (so import won't fail on CI) ----------
+# ---------- lazy deps helpers (imported on first use, see core.backend) ----------
 
 def _use_pyautogui():
-    """Return pyautogui or raise if unavailable (e.g., non-Windows CI)."""
-    if _pyautogui is None:
-        raise RuntimeError("pyautogui is not available on this environment (likely non-Windows CI).")
-    return _pyautogui
+    """Return configured pyautogui or raise RuntimeError if unavailable (e.g., non-Windows CI)."""
+    return gui()
 
 def _use_pytesseract():
-    """Return pytesseract or raise if unavailable."""
-    if _pytesseract is None:
-        raise RuntimeError("pytesseract is not available in this environment.")
-    return _pytesseract
+    """Return the OCR engine (local OCR server or pytesseract); RuntimeError if unavailable."""
+    return ocr_engine()
 
 
 # ---------- screenshot helpers ----------
@@ -92,34 +124,45 @@ def _use_pytesseract():
 def _grab_roi_bgr(hwnd, roi_xywh_rel: Tuple[float, float, float, float],
                   client_rect: Dict[str, int]) -> np.ndarray:
     rx, ry, rw, rh = roi_xywh_rel
-    x = int(client_rect["left"] + client_rect["width"] * rx)
-    y = int(client_rect["top"]  + client_rect["height"] * ry)
-    w = max(1, int(client_rect["width"]  * rw))
-    h = max(1, int(client_rect["height"] * rh))
-    # ✅ use lazy import
-    img_rgb = np.array(_use_pyautogui().screenshot(region=(x, y, w, h)))
+    bus = active_bus(hwnd)
+    if bus is not None:   # shared capture (core.framebus)
+        return crop_rel(bus.fresh().img, rx, ry, rw, rh).copy()
+    region = ClientMap.from_rect(client_rect).region(rx, ry, rw, rh)
+    # ✅ use lazy import; asarray views the PIL buffer (BGR conversion is the only copy)
+    img_rgb = np.asarray(_use_pyautogui().screenshot(region=region))
     return cv2.cvtColor(img_rgb, cv2.COLOR_RGB2BGR)
 
 
 # ---------- ensemble OCR (line mode) ----------
 
-def _prep_variants(img_bgr: np.ndarray) -> List[np.ndarray]:
-    """Generate several binarized variants (normal & inverted)."""
-    gray = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2GRAY)
-    big  = cv2.resize(gray, None, fx=3.6, fy=3.6, interpolation=cv2.INTER_CUBIC)
-    clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-    g = clahe.apply(big)
-    g = cv2.GaussianBlur(g, (3, 3), 0)
+LINE_UPSCALE = 3.6   # tuned on 96-dpi captures; divided by the display scale (core.dpi.upscale_for)
+
+def _line_upscale() -> float:
+    """Upscale factor of the line read for the current capture's DPI."""
+    return upscale_for(LINE_UPSCALE)
+
+def _prep_variants(img_bgr: np.ndarray, scale: Optional[float] = None) -> List[np.ndarray]:
+    """
+    Generate several binarized variants (normal & inverted), upscaled by 'scale'
+    (default: _line_upscale()).
+    Pooled buffers: the variants are valid until the next call on this thread.
+    """
+    if scale is None:
+        scale = _line_upscale()
+    gray = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2GRAY, dst=scratch("pv.gray", img_bgr.shape[:2]))
+    big  = resize_by(gray, scale, "pv.big")
+    g = clahe().apply(big, dst=scratch("pv.clahe", big.shape))
+    cv2.GaussianBlur(g, (3, 3), 0, dst=g)
 
     variants = []
     for th in (185, 190, 200):
-        _, thr = cv2.threshold(g, th, 255, cv2.THRESH_BINARY)
+        _, thr = cv2.threshold(g, th, 255, cv2.THRESH_BINARY, dst=scratch(f"pv.thr{th}", g.shape))
         variants.append(thr)
-        variants.append(cv2.bitwise_not(thr))
+        variants.append(cv2.bitwise_not(thr, dst=scratch(f"pv.thr{th}.inv", g.shape)))
     ada = cv2.adaptiveThreshold(g, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
-                                cv2.THRESH_BINARY, 31, 8)
+                                cv2.THRESH_BINARY, 31, 8, dst=scratch("pv.ada", g.shape))
     variants.append(ada)
-    variants.append(cv2.bitwise_not(ada))
+    variants.append(cv2.bitwise_not(ada, dst=scratch("pv.ada.inv", g.shape)))
     return variants
 
 def _ocr_text_psm(bin_img: np.ndarray, psm: int) -> str:
@@ -142,58 +185,6 @@ def _ensemble_read_line(img_bgr: np.ndarray) -> str:
 
 # ---------- word segmentation fallback ----------
 
-def _binarize_for_words(img_bgr: np.ndarray) -> np.ndarray:
-    gray = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2GRAY)
-    big  = cv2.resize(gray, None, fx=3.8, fy=3.8, interpolation=cv2.INTER_CUBIC)
-    clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-    big   = clahe.apply(big)
-    big   = cv2.GaussianBlur(big, (3, 3), 0)
-    _, thr = cv2.threshold(big, 185, 255, cv2.THRESH_BINARY)
-    return thr
-
-def _find_word_boxes(bin_img: np.ndarray) -> List[Tuple[int, int, int, int]]:
-    H, W = bin_img.shape
-    k_close = cv2.getStructuringElement(cv2.MORPH_RECT, (31, 3))
-    closed  = cv2.morphologyEx(bin_img, cv2.MORPH_CLOSE, k_close, iterations=1)
-    cnts, _ = cv2.findContours(closed, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-    boxes = []
-    for c in cnts:
-        x, y, w, h = cv2.boundingRect(c)
-        area = w * h
-        if area < 0.002 * W * H:   # tiny noise
-            continue
-        if h < 0.20 * H:
-            continue
-        if w > 0.98 * W:
-            continue
-        pad = 2
-        x = max(0, x - pad); y = max(0, y - pad)
-        w = min(W - x, w + 2 * pad)
-        h = min(H - y, h + 2 * pad)
-        boxes.append((x, y, w, h))
-    boxes.sort(key=lambda b: b[0])
-    # merge neighbors with tiny gap
-    merged = []
-    if boxes:
-        cur = list(boxes[0])
-        for bx in boxes[1:]:
-            cx, cy, cw, ch = cur
-            bx_, by_, bw_, bh_ = bx
-            gap = bx_ - (cx + cw)
-            gap_thresh = 0.25 * ((ch + bh_) / 2.0)
-            if gap <= max(3, gap_thresh):
-                x0 = min(cx, bx_)
-                y0 = min(cy, by_)
-                x1 = max(cx + cw, bx_ + bw_)
-                y1 = max(cy + ch, by_ + bh_)
-                cur = [x0, y0, x1 - x0, y1 - y0]
-            else:
-                merged.append(tuple(cur)); cur = list(bx)
-        merged.append(tuple(cur))
-    else:
-        merged = boxes
-    return merged
-
 def _tess_word(bin_img: np.ndarray, user_words: Path | None = None) -> str:
     # use lazy import for pytesseract
     pytesseract = _use_pytesseract()
@@ -213,9 +204,12 @@ def _best_split(merged: str, exp_left: str, exp_right: str) -> tuple[int, float,
             best_k, best_s1, best_s2, best_total = k, s1, s2, tot
     return best_k, best_s1, best_s2
 
-def _ocr_words(img_bgr: np.ndarray, expected_words: List[str], debug_dir: Path | None) -> List[str]:
-    bin_img = _binarize_for_words(img_bgr)
-    boxes = _find_word_boxes(bin_img)
+def _ocr_words(img_bgr: np.ndarray, expected_words: List[str],
+               debug_dir: Path | None) -> Tuple[List[str], List[WordBox]]:
+    """One tesseract call per segmented word; returns the non-empty words and their boxes in img_bgr."""
+    enhanced = enhance(img_bgr)
+    mask = text_mask(enhanced)
+    boxes = segment_words(mask, enhanced)
 
     # hint dictionary
     tmp_words = None
@@ -228,81 +222,140 @@ def _ocr_words(img_bgr: np.ndarray, expected_words: List[str], debug_dir: Path |
     words = []
     if debug_dir:
         debug_dir.mkdir(parents=True, exist_ok=True)
-        cv2.imwrite(str(debug_dir / "bin.png"), bin_img)
+        cv2.imwrite(str(debug_dir / "bin.png"), mask)
 
-    for idx, (x, y, w, h) in enumerate(boxes, start=1):
-        crop = bin_img[y:y+h, x:x+w]
-        crop = cv2.resize(crop, None, fx=1.8, fy=1.8, interpolation=cv2.INTER_CUBIC)
+    for idx, box in enumerate(boxes, start=1):
+        crop = word_crop(enhanced, box)
         txt = _tess_word(crop, user_words=tmp_words)
         words.append(txt)
         if debug_dir:
             cv2.imwrite(str(debug_dir / f"word_{idx}.png"), crop)
             (debug_dir / f"word_{idx}.txt").write_text(txt or "<EMPTY>", encoding="utf-8")
 
+    if debug_dir:
+        cv2.imwrite(str(debug_dir / "words.png"), draw_boxes(img_bgr, boxes, words))
+
     if tmp_words and tmp_words.exists():
         try: tmp_words.unlink()
         except Exception: pass
 
-    return [w for w in words if w]  # drop empties
+    kept = [(w, b) for w, b in zip(words, boxes) if w]  # drop empties
+    return [w for w, _ in kept], [b for _, b in kept]
 
 
 # ---------- alignment & public API ----------
 
+# DP alignment scores: skipping an OCR token (noise) is cheap, leaving an expected
+# word without OCR text costs more than any real match can give.
+_SKIP_OCR = -0.05
+_SKIP_EXP = -1.0
+
+def _word_weight(exp: str) -> float:
+    return 0.35 if exp in STOPWORDS else 1.0
+
+def _split_plausible(w: str, tgt: str, nxt: str, s: float, min_ratio: float) -> bool:
+    """Same triggers the greedy aligner used before trying a glued-word split."""
+    concat_like = _sim(w, tgt + nxt) >= 0.80
+    near_thresh = s <= (min_ratio + 0.03)
+    longish = len(w) >= (len(tgt) + len(nxt) - 1)
+    return concat_like or near_thresh or longish
+
+def _align_dp(ocr: List[str], exp: List[str], min_ratio: float,
+              src: List[Tuple[int, ...]] | None = None) -> List[Tuple[str, str, float]]:
+    """
+    Optimal monotonic alignment of OCR tokens to expected tokens.
+    Operations: match (1:1), split (1 OCR -> 2 expected, glued words),
+    merge (2 OCR -> 1 expected, broken word), skip OCR token, skip expected token.
+    A split must look like a glued pair (see _split_plausible) and a merge must beat the
+    single token; in both cases every piece has to score >= min_ratio - 0.03.
+    Maximizes the weighted similarity of the expected tokens.
+    Returns one (ocr_piece, expected, score) per expected token; skipped ones have ("", exp, 0.0).
+    If 'src' is given it is filled with the OCR token indices behind each pair.
+    """
+    n, m = len(ocr), len(exp)
+    NEG = float("-inf")
+    best = [[NEG] * (m + 1) for _ in range(n + 1)]
+    back: List[List[Tuple]] = [[()] * (m + 1) for _ in range(n + 1)]
+    best[0][0] = 0.0
+    wt = [_word_weight(e) for e in exp]
+    min_piece = min_ratio - 0.03
+
+    for i in range(n + 1):
+        for j in range(m + 1):
+            cur = best[i][j]
+            if cur == NEG:
+                continue
+
+            def relax(ni, nj, gain, op):
+                if cur + gain > best[ni][nj]:
+                    best[ni][nj] = cur + gain
+                    back[ni][nj] = (i, j) + op
+
+            if i < n:
+                relax(i + 1, j, _SKIP_OCR, ("skip_ocr",))
+            if j < m:
+                relax(i, j + 1, _SKIP_EXP, ("skip_exp",))
+            if i < n and j < m:
+                w = ocr[i]
+                s = _sim(w, exp[j])
+                relax(i + 1, j + 1, wt[j] * s, ("match", s))
+                if j + 1 < m and len(w) >= 2 and _split_plausible(w, exp[j], exp[j + 1], s, min_ratio):
+                    k, s1, s2 = _best_split(w, exp[j], exp[j + 1])
+                    if k > 0 and s1 >= min_piece and s2 >= min_piece:
+                        relax(i + 1, j + 2, wt[j] * s1 + wt[j + 1] * s2, ("split", k, s1, s2))
+                if i + 1 < n:
+                    sm = _sim(w + ocr[i + 1], exp[j])
+                    if sm >= min_piece and sm > s:
+                        relax(i + 2, j + 1, wt[j] * sm, ("merge", sm))
+
+    # walk back from the full alignment
+    pairs: List[Tuple[str, str, float]] = []
+    origin: List[Tuple[int, ...]] = []
+    i, j = n, m
+    while (i, j) != (0, 0):
+        pi, pj, op = back[i][j][0], back[i][j][1], back[i][j][2]
+        if op == "match":
+            pairs.append((ocr[pi], exp[pj], back[i][j][3]))
+            origin.append((pi,))
+        elif op == "split":
+            k, s1, s2 = back[i][j][3:]
+            pairs.append((ocr[pi][k:], exp[pj + 1], s2))
+            pairs.append((ocr[pi][:k], exp[pj], s1))
+            origin.extend([(pi,), (pi,)])
+        elif op == "merge":
+            pairs.append((ocr[pi] + ocr[pi + 1], exp[pj], back[i][j][3]))
+            origin.append((pi, pi + 1))
+        elif op == "skip_exp":
+            pairs.append(("", exp[pj], 0.0))
+            origin.append(())
+        i, j = pi, pj
+    pairs.reverse()
+    if src is not None:
+        src[:] = origin[::-1]
+    return pairs
+
+def _pairs_ok(pairs: List[Tuple[str, str, float]], min_ratio: float, avg_threshold: float) -> bool:
+    """Pass/fail rule for an alignment (every expected word has OCR text, see _align_words)."""
+    if not pairs or any(not piece for (piece, _, _) in pairs):
+        return False
+    below = sum(1 for (_, e, s) in pairs if s < min_ratio and e not in STOPWORDS)
+    return (below <= 1) and (_weighted_score(pairs) >= avg_threshold)
+
 def _align_words(ocr_words: List[str], expected_words: List[str],
                  min_ratio: float = 0.62, avg_threshold: float = 0.80) -> Tuple[bool, List[Tuple[str, str, float]]]:
     """
     Align OCR tokens to expected tokens:
       - glyph normalization
-      - allow glued pairs via best split
+      - optimal DP alignment with glued (split) / broken (merge) words and noise skipping
+      - fail if any expected word has no OCR text at all
       - pass if <=1 non-stopword below min_ratio and weighted-avg >= avg_threshold
     """
-    ocr = [_norm_word(w) for w in ocr_words]
+    ocr = [w for w in (_norm_word(w) for w in ocr_words) if w]
     exp = expected_words[:]
-    pairs: List[Tuple[str, str, float]] = []
-
-    i = j = 0
-    while i < len(ocr) and j < len(exp):
-        w = ocr[i]; tgt = exp[j]
-        s = _sim(w, tgt)
-
-        def should_try_split() -> bool:
-            if (j + 1) >= len(exp): return False
-            concat_like = _sim(w, tgt + exp[j + 1]) >= 0.80
-            near_thresh = s <= (min_ratio + 0.03)
-            longish = len(w) >= (len(tgt) + len(exp[j+1]) - 1)
-            return concat_like or near_thresh or longish
-
-        if should_try_split():
-            k, s1, s2 = _best_split(w, tgt, exp[j + 1])
-            if k > 0 and s1 >= (min_ratio - 0.03) and s2 >= (min_ratio - 0.03):
-                pairs.append((w[:k], tgt, s1))
-                pairs.append((w[k:], exp[j + 1], s2))
-                i += 1; j += 2
-                continue
-
-        pairs.append((w, tgt, s))
-        i += 1; j += 1
-
-    # if still short, try to split the last/next into remaining expected
-    while len(pairs) < len(exp) and i < len(ocr) and (j + 1) < len(exp):
-        w = ocr[i]
-        k, s1, s2 = _best_split(w, exp[j], exp[j + 1])
-        if k > 0:
-            pairs.append((w[:k], exp[j], s1))
-            pairs.append((w[k:], exp[j + 1], s2))
-            i += 1; j += 2
-        else:
-            break
-
-    if len(pairs) < len(exp):
-        return False, pairs
-
-    scores = [s for (_, e, s) in pairs[:len(exp)]]
-    below = sum(1 for (_, e, s) in pairs[:len(exp)] if s < min_ratio and e not in STOPWORDS)
-    avg = _weighted_score(pairs[:len(exp)])
-
-    ok = (below <= 1) and (avg >= avg_threshold)
-    return ok, pairs
+    if not exp:
+        return False, []
+    pairs = _align_dp(ocr, exp, min_ratio)
+    return _pairs_ok(pairs, min_ratio, avg_threshold), pairs
 
 
 def assert_phrase_in_roi(hwnd, client_rect: Dict[str, int],
@@ -310,41 +363,48 @@ def assert_phrase_in_roi(hwnd, client_rect: Dict[str, int],
                          expected_phrase: str,
                          debug_name: str = "phrase_check",
                          min_ratio: float = 0.62,
-                         avg_threshold: float = 0.80) -> Tuple[bool, Dict]:
+                         avg_threshold: float = 0.80,
+                         budget_ms: Optional[float] = None) -> Tuple[bool, Dict]:
     """
     Universal phrase verification (robust, low tuning).
-    Returns (ok, details) where details has 'text', 'tokens', 'pairs', 'debug_dir'.
+    Returns (ok, details) where details has 'text', 'tokens', 'pairs', 'debug_dir'
+    (+ 'boxes': word boxes in ROI pixels when the word fallback ran).
+    budget_ms: latency budget of this call (core.budget, recorded on the current step).
     """
-    exp_tokens = _tokenize_expected(expected_phrase)
-    debug_dir = Path("artifacts") / "ocr_debug" / debug_name
-
-    img = _grab_roi_bgr(hwnd, roi_xywh_rel, client_rect)
-
-    # Stage 1: ensemble line read, quick decision by tokens
-    line = _ensemble_read_line(img)
-    line_tokens = _tokenize_expected(line)
-    ok_line, pairs_line = _align_words(line_tokens, exp_tokens, min_ratio, avg_threshold)
-
-    # Stage 2 (fallback): contour word read + alignment
-    if not ok_line:
-        words = _ocr_words(img, exp_tokens, debug_dir=debug_dir)
-        ok_words, pairs_words = _align_words(words, exp_tokens, min_ratio, avg_threshold)
-        return ok_words, {
-            "mode": "words",
+    with budget("assert_phrase_in_roi", budget_ms):
+        exp_tokens = _tokenize_expected(expected_phrase)
+        debug_dir = artifacts_root() / "ocr_debug" / debug_name
+
+        img = _grab_roi_bgr(hwnd, roi_xywh_rel, client_rect)
+        # only the text block (+ margin) of the wide ROI goes through the upscaling
+        img, (tx, ty, _tw, _th) = tighten(img)
+
+        # Stage 1: ensemble line read, quick decision by tokens
+        line = _ensemble_read_line(img)
+        line_tokens = _tokenize_expected(line)
+        ok_line, pairs_line = _align_words(line_tokens, exp_tokens, min_ratio, avg_threshold)
+
+        # Stage 2 (fallback): segmented word read + alignment
+        if not ok_line:
+            words, boxes = _ocr_words(img, exp_tokens, debug_dir=debug_dir)
+            ok_words, pairs_words = _align_words(words, exp_tokens, min_ratio, avg_threshold)
+            return ok_words, {
+                "mode": "words",
+                "text": line,
+                "tokens": words,
+                "boxes": [(x + tx, y + ty, w, h) for x, y, w, h in boxes],   # px in the ROI
+                "pairs": pairs_words,
+                "debug_dir": str(debug_dir),
+            }
+
+        return True, {
+            "mode": "line",
             "text": line,
-            "tokens": words,
-            "pairs": pairs_words,
+            "tokens": line_tokens,
+            "pairs": pairs_line,
             "debug_dir": str(debug_dir),
         }
 
-    return True, {
-        "mode": "line",
-        "text": line,
-        "tokens": line_tokens,
-        "pairs": pairs_line,
-        "debug_dir": str(debug_dir),
-    }
-
 # ---- public wrappers for CI unit-tests (no GUI) ----
 
 def normalize_text(s: str) -> str:
@@ -365,3 +425,22 @@ def compare_tokens(target: str, ocr_text: str, ok_ratio: float = 0.7) -> bool:
         avg_threshold=ok_ratio,
     )
     return ok
+
+def compare_tokens_batch(ocr_texts: Iterable[str], catalog, ok_ratio: float = 0.7,
+                         k: int = 10) -> List[Optional["CatalogHit"]]:
+    """
+    Match many OCR lines against a phrase catalog (core.catalog.PhraseCatalog or a list of
+    phrases). Per line: the best passing catalog entry (same rule as compare_tokens), or None.
+    Only the top-k index candidates of each line are aligned; repeated lines are aligned once.
+    """
+    from .catalog import PhraseCatalog
+    if not isinstance(catalog, PhraseCatalog):
+        catalog = PhraseCatalog(catalog)
+    seen: Dict[str, Optional["CatalogHit"]] = {}
+    out = []
+    for text in ocr_texts:
+        if text not in seen:
+            hit = catalog.best(text, k=k, min_ratio=0.62, avg_threshold=ok_ratio)
+            seen[text] = hit if hit is not None and hit.ok else None
+        out.append(seen[text])
+    return out
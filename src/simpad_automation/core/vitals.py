@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+Vitals dashboard reader: several numeric ROIs from ONE client-area capture.
+- ROIs come from ui.controls.NUMERIC_ROIS (name -> rx, ry, rw, rh)
+- all regions are binarized, stacked on one canvas and read with a single tesseract call
+- regions the batched read could not decode fall back to the per-ROI passes of ocr.py
+"""
+
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Optional, List, Tuple, Dict, Iterable
+
+import numpy as np
+
+from simpad_automation.ui.controls import NUMERIC_ROIS
+from .backend import ocr_engine
+from .ocr import (
+    _grab_client_bgr, _crop_rel, _green_mask, _scale_and_binarize, _tighten_digits,
+    _vote_frame, _Votes, _looks_truncated,
+)
+
+ROW_GAP = 24      # blank rows between stacked regions
+ROW_MARGIN = 12   # blank border around the canvas
+
+
+@dataclass
+class VitalReading:
+    name: str
+    value: Optional[int]
+    conf: Optional[float]   # tesseract confidence 0..100 (None if the engine gave none)
+    mode: str               # "batched" | "fallback" | "none"
+    ms: float               # time spent on this field after the shared capture/batch
+
+
+@dataclass
+class VitalsResult:
+    readings: Dict[str, VitalReading] = field(default_factory=dict)
+    capture_ms: float = 0.0
+    batch_ms: float = 0.0
+    total_ms: float = 0.0
+
+    def __getitem__(self, name: str) -> Optional[int]:
+        return self.readings[name].value
+
+    def values(self) -> Dict[str, Optional[int]]:
+        return {n: r.value for n, r in self.readings.items()}
+
+
+def _stack_rows(images: List[np.ndarray], gap: int = ROW_GAP,
+                margin: int = ROW_MARGIN) -> Tuple[np.ndarray, List[Tuple[int, int]]]:
+    """Stack white-on-black binarized regions vertically; returns canvas and (y0, y1) per region."""
+    width = 2 * margin + max(im.shape[1] for im in images)
+    height = 2 * margin + sum(im.shape[0] for im in images) + gap * (len(images) - 1)
+    canvas = np.zeros((height, width), dtype=np.uint8)
+    spans = []
+    y = margin
+    for im in images:
+        canvas[y:y + im.shape[0], margin:margin + im.shape[1]] = im
+        spans.append((y, y + im.shape[0]))
+        y += im.shape[0] + gap
+    return canvas, spans
+
+
+def _assign_rows(data: Dict[str, list], spans: List[Tuple[int, int]]) -> Dict[int, Tuple[int, float]]:
+    """Group image_to_data words by the region row under their center -> (value, mean conf)."""
+    rows: Dict[int, List[Tuple[str, float]]] = {}
+    for text, conf, top, height in zip(data["text"], data["conf"], data["top"], data["height"]):
+        d = re.sub(r"\D", "", str(text))
+        if not d:
+            continue
+        cy = top + height / 2.0
+        for i, (y0, y1) in enumerate(spans):
+            if y0 <= cy < y1:
+                rows.setdefault(i, []).append((d, max(0.0, float(conf))))
+                break
+    out = {}
+    for i, parts in rows.items():
+        out[i] = (int("".join(d for d, _ in parts)), float(np.mean([c for _, c in parts])))
+    return out
+
+
+def read_vitals(hwnd, names: Optional[Iterable[str]] = None) -> VitalsResult:
+    """
+    Capture the client area once and read all requested numeric ROIs together.
+    names: keys of NUMERIC_ROIS (default: all of them).
+    """
+    t0 = time.perf_counter()
+    names = list(names) if names is not None else list(NUMERIC_ROIS)
+    unknown = [n for n in names if n not in NUMERIC_ROIS]
+    if unknown:
+        raise KeyError(f"read_vitals: unknown ROI name(s) {unknown}; known: {sorted(NUMERIC_ROIS)}")
+
+    res = VitalsResult()
+    img = _grab_client_bgr(hwnd)[0]
+    # tight crops: only the digits (+ margin) are upscaled, stacked and OCRed
+    crops = {n: _tighten_digits(_crop_rel(img, *NUMERIC_ROIS[n])) for n in names}
+    t1 = time.perf_counter()
+    res.capture_ms = (t1 - t0) * 1000.0
+
+    # 1) one batched call over all regions (green mask pass)
+    batched: Dict[int, Tuple[int, float]] = {}
+    if names:
+        # copies: _scale_and_binarize returns a pooled buffer reused by the next call
+        bins = [_scale_and_binarize(_green_mask(crops[n])).copy() for n in names]
+        canvas, spans = _stack_rows(bins)
+        cfg = "--psm 6 -c tessedit_char_whitelist=0123456789"
+        pytesseract = ocr_engine()
+        data = pytesseract.image_to_data(canvas, config=cfg, output_type=pytesseract.Output.DICT)
+        batched = _assign_rows(data, spans)
+    t2 = time.perf_counter()
+    res.batch_ms = (t2 - t1) * 1000.0
+
+    # 2) per-field decision / fallback on the same capture
+    for i, n in enumerate(names):
+        tf = time.perf_counter()
+        rw = NUMERIC_ROIS[n][2]
+        if i in batched and not _looks_truncated(batched[i][0], rw):
+            val, conf = batched[i]
+            res.readings[n] = VitalReading(n, val, conf, "batched", 0.0)
+            continue
+        votes = _Votes()
+        val = _vote_frame(crops[n], rw, votes)
+        if val is None:
+            val = votes.best()
+        conf = votes.conf(val) if val is not None else None
+        mode = "fallback" if val is not None else "none"
+        res.readings[n] = VitalReading(n, val, conf, mode, (time.perf_counter() - tf) * 1000.0)
+
+    res.total_ms = (time.perf_counter() - t0) * 1000.0
+    return res
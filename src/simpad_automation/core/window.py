@@ -1,16 +1,19 @@
 # -*- coding: utf-8 -*-
+import os
 import time
 import ctypes
 from ctypes import wintypes
 
-import pyautogui
 import win32gui
 import win32api
 import win32con
 
-# Setup pyautogui for stability
-pyautogui.FAILSAFE = False
-pyautogui.PAUSE = 0.02
+# pyautogui is configured once in core.backend (FAILSAFE off, PAUSE from the timing profile)
+from .backend import gui
+# every delay below comes from the active timing profile (core.timing: safe / fast / calibrated)
+from .timing import current_timing
+# one client -> screen transform (physical pixels, DPI-aware process) for clicks, drags and captures
+from .dpi import client_map
 
 # Compatibility: On some Python/Windows builds, wintypes does not have ULONG_PTR
 if not hasattr(wintypes, "ULONG_PTR"):
@@ -24,6 +27,7 @@ def get_client_rect(hwnd):
     {
       left, top, right, bottom, width, height
     }
+    Physical pixels once the process is DPI-aware (core.dpi, enabled on first use).
     """
     try:
         if not win32gui.IsWindow(hwnd):
@@ -31,18 +35,11 @@ def get_client_rect(hwnd):
             return None
 
         title = win32gui.GetWindowText(hwnd)
-        l, t, r, b = win32gui.GetClientRect(hwnd)
-        (left, top) = win32gui.ClientToScreen(hwnd, (l, t))
-        (right, bottom) = win32gui.ClientToScreen(hwnd, (r, b))
-        rect = {
-            "left": left,
-            "top": top,
-            "right": right,
-            "bottom": bottom,
-            "width": right - left,
-            "height": bottom - top,
-        }
-        print(f"[INFO] get_client_rect('{title}') -> {rect}")
+        cm = client_map(hwnd)
+        if cm is None:
+            raise RuntimeError("empty client area")
+        rect = cm.rect
+        print(f"[INFO] get_client_rect('{title}') -> {rect} @ {cm.dpi} dpi")
         return rect
     except Exception as e:
         print(f"[ERROR] get_client_rect failed for hwnd={hwnd}: {e}")
@@ -51,12 +48,10 @@ def get_client_rect(hwnd):
 
 def rel_to_abs(hwnd, rx: float, ry: float):
     """Convert client area fractions (rx, ry) to absolute screen coordinates (x, y)."""
-    rect = get_client_rect(hwnd)
-    if not rect:
+    cm = client_map(hwnd)
+    if cm is None:
         raise RuntimeError("rel_to_abs: client rect is not available")
-    x = int(rect["left"] + rect["width"] * rx)
-    y = int(rect["top"] + rect["height"] * ry)
-    return x, y
+    return cm.point(rx, ry)
 
 
 def wait_foreground(hwnd, timeout=3.0):
@@ -70,10 +65,49 @@ def wait_foreground(hwnd, timeout=3.0):
             win32gui.SetForegroundWindow(hwnd)
         except Exception:
             pass
-        time.sleep(0.05)
+        time.sleep(current_timing().focus_poll)
     return False
 
 
+# ---------- Input backend ----------
+# "sendinput": foreground window + global cursor + SendInput (default, most compatible)
+# "message":   PostMessage to the window / child under the point (no focus, no cursor)
+# "auto":      "message", but windows that ignore posted input fall back to SendInput
+#              (decided once per window by bginput.probe_input, before its first pointer input)
+INPUT_BACKENDS = ("sendinput", "message", "auto")
+_input_backend = os.environ.get("SIMPAD_INPUT_BACKEND", "sendinput").lower()
+if _input_backend not in INPUT_BACKENDS:
+    print(f"[WARN] Unknown SIMPAD_INPUT_BACKEND={_input_backend!r}, using 'sendinput'")
+    _input_backend = "sendinput"
+
+def set_input_backend(name: str) -> None:
+    """Switch input backend for the whole process: 'sendinput' | 'message' | 'auto'."""
+    global _input_backend
+    name = name.lower()
+    if name not in INPUT_BACKENDS:
+        raise ValueError(f"input backend must be one of {INPUT_BACKENDS}, got {name!r}")
+    _input_backend = name
+
+def get_input_backend() -> str:
+    return _input_backend
+
+def _use_messages(hwnd, rx: float | None = None, ry: float | None = None) -> bool:
+    """
+    True if input for hwnd should be posted as window messages (no focus wait).
+    In auto mode an undecided window is probed at the pointer target (rx, ry);
+    keyboard input (no point) uses SendInput until a probe has decided.
+    """
+    if _input_backend == "sendinput":
+        return False
+    if _input_backend == "message":
+        return True
+    from . import bginput
+    mode = bginput.mode_for(hwnd)
+    if mode is None and rx is not None:
+        return bginput.probe_input(hwnd, rx, ry)
+    return mode == "message"
+
+
 # ---------- Clicks (with SendInput) ----------
 
 user32 = ctypes.WinDLL("user32", use_last_error=True)
@@ -100,18 +134,27 @@ def _sendinput_click_left():
     down = INPUT(type=INPUT_MOUSE, mi=MOUSEINPUT(0, 0, 0, MOUSEEVENTF_LEFTDOWN, 0, 0))
     up   = INPUT(type=INPUT_MOUSE, mi=MOUSEINPUT(0, 0, 0, MOUSEEVENTF_LEFTUP,   0, 0))
     user32.SendInput(1, ctypes.byref(down), ctypes.sizeof(INPUT))
-    time.sleep(0.03)
+    time.sleep(current_timing().hold)
     user32.SendInput(1, ctypes.byref(up), ctypes.sizeof(INPUT))
 
 
-def click_relative(hwnd, rx: float, ry: float, delay: float = 0.1):
+def click_relative(hwnd, rx: float, ry: float, delay: float | None = None):
     """A single click on the relative coordinates of the client area.
         Returns the (x, y) coordinates of the actual click location.
+        delay: wait after the click (default: after_click of the timing profile)
     """
+    pace = current_timing()
+    if delay is None:
+        delay = pace.after_click
+    if _use_messages(hwnd, rx, ry):
+        from . import bginput
+        x, y = bginput.post_click(hwnd, rx, ry)
+        time.sleep(delay)
+        return x, y
     wait_foreground(hwnd, timeout=1.0)
     x, y = rel_to_abs(hwnd, rx, ry)
     win32api.SetCursorPos((x, y))
-    time.sleep(0.12)        
+    time.sleep(pace.settle)
     _sendinput_click_left()
     time.sleep(delay)
     return x, y
@@ -119,14 +162,20 @@ def click_relative(hwnd, rx: float, ry: float, delay: float = 0.1):
 
 def ensure_focus(hwnd, rx: float, ry: float):
     """Return focus to the window: double-click on the point (rx, ry) of the client area."""
+    pace = current_timing()
+    if _use_messages(hwnd, rx, ry):
+        from . import bginput
+        bginput.post_double_click(hwnd, rx, ry)
+        time.sleep(pace.after_focus)
+        return
     wait_foreground(hwnd, timeout=1.0)
     x, y = rel_to_abs(hwnd, rx, ry)
     win32api.SetCursorPos((x, y))
-    time.sleep(0.12)
+    time.sleep(pace.settle)
     _sendinput_click_left()
-    time.sleep(0.06)
+    time.sleep(pace.double_gap)
     _sendinput_click_left()
-    time.sleep(0.2)
+    time.sleep(pace.after_focus)
 
 
 # ---------- Smooth dragging (drag) ----------
@@ -140,21 +189,27 @@ def drag_relative(hwnd,
     - steps: number of intermediate points (10–15 is usually sufficient)
     - duration: total drag time (sec)
     """
-    rect = get_client_rect(hwnd)
-    if not rect:
+    pace = current_timing()
+    if _use_messages(hwnd, rx_start, ry_start):
+        from . import bginput
+        bginput.post_drag(hwnd, rx_start, ry_start, rx_end, ry_end, steps=steps, duration=duration)
+        time.sleep(pace.after_drag)
+        return
+
+    cm = client_map(hwnd)
+    if cm is None:
         raise RuntimeError("drag_relative: client rect is not available")
 
-    x0 = rect["left"] + rect["width"]  * rx_start
-    y0 = rect["top"]  + rect["height"] * ry_start
-    x1 = rect["left"] + rect["width"]  * rx_end
-    y1 = rect["top"]  + rect["height"] * ry_end
+    x0, y0 = cm.point(rx_start, ry_start)
+    x1, y1 = cm.point(rx_end, ry_end)
 
     # Just in case, let's bring the window to the front before dragging.
     wait_foreground(hwnd, timeout=1.0)
 
     # Smooth movement
+    pyautogui = gui()
     pyautogui.moveTo(x0, y0)
-    time.sleep(0.05)
+    time.sleep(pace.drag_grab)
     pyautogui.mouseDown()
     try:
         for i in range(1, steps + 1):
@@ -165,4 +220,4 @@ def drag_relative(hwnd,
             time.sleep(max(0.0, duration / steps))
     finally:
         pyautogui.mouseUp()
-    time.sleep(0.1)
\ No newline at end of file
+    time.sleep(pace.after_drag)
\ No newline at end of file
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+Word segmentation for the word-by-word OCR fallback (verify._ocr_words), at native
+resolution:
+- CLAHE once on the native ROI; bright-text mask with the same 185 threshold the
+  upscaled path used
+- connectedComponentsWithStats -> glyph boxes; noise components dropped in one numpy pass
+- row projection of the glyph boxes -> text lines; column projection per line -> words
+  (a column gap wider than the word gap separates two words; the gap is measured to
+  sub-pixel precision from where the column profile crosses the threshold, which is
+  what thresholding the 3.8x upscaled image used to resolve)
+- only the final word crops are upscaled (3.8x, blur, threshold, then 1.8x as before;
+  divided by the display scale on a high-DPI capture)
+
+The word gap matches what the old 31x3 close at 3.8x did (about 7.5 native px once the
+blurred, upscaled threshold has thinned the glyph edges), widened to a quarter of the
+line height for large fonts like its neighbour-merge rule.
+Headless, safe to import on CI.
+"""
+
+from typing import List, NamedTuple, Optional
+
+import cv2
+import numpy as np
+
+from .bufpool import scratch, resize_by, clahe
+from .dpi import upscale_for
+
+THRESH = 185
+MIN_GLYPH_AREA = 2        # px; smaller components are sensor / anti-aliasing noise
+WORD_GAP_PX = 7.5         # sub-pixel blank width that separates two words (old 31 px close at 3.8x)
+WORD_GAP_H = 0.25         # ... or this share of the line height (+ 1.5 px), whichever is wider
+LINE_GAP_H = 0.3          # a blank row band at least this share of the glyph height splits lines
+PAD_PX = 1
+BIN_UPSCALE = 3.8         # word crops are binarized at (at most) this scale ...
+CROP_UPSCALE = 1.8        # ... and enlarged again for tesseract (both tuned at 96 dpi, see core.dpi)
+
+
+class WordBox(NamedTuple):
+    x: int
+    y: int
+    w: int
+    h: int
+
+
+def enhance(img_bgr: np.ndarray) -> np.ndarray:
+    """Contrast-equalized gray ROI at native resolution (pooled)."""
+    gray = img_bgr if img_bgr.ndim == 2 else cv2.cvtColor(
+        img_bgr, cv2.COLOR_BGR2GRAY, dst=scratch("ws.gray", img_bgr.shape[:2]))
+    return clahe().apply(gray, dst=scratch("ws.clahe", gray.shape))
+
+
+def text_mask(enhanced: np.ndarray) -> np.ndarray:
+    """Bright text as 255 on 0 (pooled)."""
+    _, mask = cv2.threshold(enhanced, THRESH, 255, cv2.THRESH_BINARY, dst=scratch("ws.mask", enhanced.shape))
+    return mask
+
+
+def _runs(covered: np.ndarray) -> np.ndarray:
+    """[start, end) of the covered stretches."""
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], covered.astype(np.int8), [0]))))
+    return edges.reshape(-1, 2)
+
+
+def _bridge(runs: np.ndarray, gaps: np.ndarray, min_gap: float) -> np.ndarray:
+    """Join neighbouring runs whose gap (one per pair) is below min_gap."""
+    if len(runs) < 2:
+        return runs
+    keep = np.concatenate(([True], gaps >= min_gap))
+    return np.stack([runs[keep, 0], np.concatenate((runs[:-1, 1][keep[1:]], runs[-1:, 1]))], axis=1)
+
+
+def _subpixel_gaps(runs: np.ndarray, profile: np.ndarray, thresh: float = THRESH) -> np.ndarray:
+    """
+    Blank width between neighbouring runs, from where the (column max) profile crosses
+    the threshold between the last ink column and the first blank one on each side.
+    """
+    ends, starts = runs[:-1, 1], runs[1:, 0]
+    p = profile.astype(np.float32)
+    f_left = (p[ends - 1] - thresh) / np.maximum(1e-3, p[ends - 1] - p[ends])
+    f_right = (p[starts] - thresh) / np.maximum(1e-3, p[starts] - p[starts - 1])
+    return (starts - ends + 1) - np.clip(f_left, 0.0, 1.0) - np.clip(f_right, 0.0, 1.0)
+
+
+def _coverage(lo: np.ndarray, hi: np.ndarray, n: int) -> np.ndarray:
+    """Positions covered by any of the [lo, hi) intervals."""
+    d = np.zeros(n + 1, np.int32)
+    np.add.at(d, lo, 1)
+    np.add.at(d, hi, -1)
+    return np.cumsum(d[:-1]) > 0
+
+
+def segment_words(mask: np.ndarray, enhanced: Optional[np.ndarray] = None) -> List[WordBox]:
+    """
+    Word boxes (x, y, w, h) in reading order (lines top-down, words left-right) of a text
+    mask. With the enhance()d image the word gaps are measured to sub-pixel precision.
+    """
+    H, W = mask.shape
+    n, _labels, stats, _ = cv2.connectedComponentsWithStats(mask, connectivity=8)
+    st = stats[1:]                                   # row 0 is the background
+    st = st[st[:, cv2.CC_STAT_AREA] >= MIN_GLYPH_AREA]
+    if not len(st):
+        return []
+    x0, y0 = st[:, cv2.CC_STAT_LEFT], st[:, cv2.CC_STAT_TOP]
+    x1, y1 = x0 + st[:, cv2.CC_STAT_WIDTH], y0 + st[:, cv2.CC_STAT_HEIGHT]
+
+    glyph_h = float(np.median(y1 - y0))
+    lines = _runs(_coverage(y0, y1, H))
+    lines = _bridge(lines, lines[1:, 0] - lines[:-1, 1], max(1.0, LINE_GAP_H * glyph_h))
+    line_of = np.searchsorted(lines[:, 0], y0, side="right") - 1
+
+    boxes: List[WordBox] = []
+    for li, (ly0, ly1) in enumerate(lines):
+        sel = line_of == li
+        gx0, gx1, gy0, gy1 = x0[sel], x1[sel], y0[sel], y1[sel]
+        gap = max(WORD_GAP_PX, WORD_GAP_H * (ly1 - ly0) + 1.5)
+        words = _runs(_coverage(gx0, gx1, W))
+        if enhanced is not None and len(words) > 1:
+            gaps = _subpixel_gaps(words, enhanced[ly0:ly1].max(axis=0))
+        else:
+            gaps = words[1:, 0] - words[:-1, 1]
+        words = _bridge(words, gaps, gap)
+        word_of = np.searchsorted(words[:, 0], gx0, side="right") - 1
+        top = np.full(len(words), H); bottom = np.zeros(len(words), np.int64)
+        np.minimum.at(top, word_of, gy0)
+        np.maximum.at(bottom, word_of, gy1)
+        for (wx0, wx1), wy0, wy1 in zip(words, top, bottom):
+            boxes.append(WordBox(int(wx0), int(wy0), int(wx1 - wx0), int(wy1 - wy0)))
+
+    # same rejects as the contour path: specks, fragments far below the text height, full-width bars
+    out = []
+    for b in boxes:
+        if b.w * b.h < 0.002 * W * H or b.h < 0.20 * H or b.w > 0.98 * W:
+            continue
+        x, y = max(0, b.x - PAD_PX), max(0, b.y - PAD_PX)
+        out.append(WordBox(x, y, min(W, b.x + b.w + PAD_PX) - x, min(H, b.y + b.h + PAD_PX) - y))
+    return out
+
+
+def word_crop(enhanced: np.ndarray, box: WordBox) -> np.ndarray:
+    """Upscaled, binarized crop of one word of the enhance()d ROI for tesseract (pooled)."""
+    x, y, w, h = box
+    total = upscale_for(BIN_UPSCALE * CROP_UPSCALE)
+    bin_f = min(BIN_UPSCALE, total)
+    big = resize_by(enhanced[y:y + h, x:x + w], bin_f, "wc.big")
+    cv2.GaussianBlur(big, (3, 3), 0, dst=big)
+    cv2.threshold(big, THRESH, 255, cv2.THRESH_BINARY, dst=big)
+    return resize_by(big, total / bin_f, "wc.out") if total > bin_f else big
+
+
+def draw_boxes(img_bgr: np.ndarray, boxes: List[WordBox], labels: List[str] = ()) -> np.ndarray:
+    """Copy of the ROI with the word boxes (and their OCR text) drawn, for the report."""
+    out = img_bgr.copy() if img_bgr.ndim == 3 else cv2.cvtColor(img_bgr, cv2.COLOR_GRAY2BGR)
+    for i, (x, y, w, h) in enumerate(boxes):
+        cv2.rectangle(out, (x, y), (x + w - 1, y + h - 1), (0, 200, 255), 1)
+        if i < len(labels) and labels[i]:
+            cv2.putText(out, labels[i], (x, max(10, y - 2)), cv2.FONT_HERSHEY_SIMPLEX, 0.35, (0, 200, 255), 1)
+    return out
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+Worker-aware helpers for parallel runs (pytest-xdist: pytest -n <N>).
+Each worker gets its own SimPad instance, its own artifacts subtree and its own
+report fragment; fragments are merged by the controller at session end.
+Headless (stdlib only), safe to import on CI.
+"""
+
+import json
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+def worker_id() -> Optional[str]:
+    """xdist worker name ('gw0', 'gw1', ...) or None in a normal single-process run."""
+    return os.environ.get("PYTEST_XDIST_WORKER") or None
+
+
+def worker_index() -> int:
+    wid = worker_id()
+    if wid and wid.startswith("gw") and wid[2:].isdigit():
+        return int(wid[2:])
+    return 0
+
+
+def artifacts_root(base: Path | str = "artifacts") -> Path:
+    """artifacts/ in a single run, artifacts/<worker>/ under xdist."""
+    wid = worker_id()
+    return Path(base) / wid if wid else Path(base)
+
+
+@contextmanager
+def launch_lock(lock_path: Path | str = Path("artifacts") / ".launch.lock",
+                timeout: float = 120.0, stale_after: float = 180.0):
+    """
+    Cross-process mutex (O_EXCL lock file) so workers start SimPad one at a time and
+    each one picks up its own new window.
+    """
+    p = Path(lock_path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    t0 = time.time()
+    while True:
+        try:
+            fd = os.open(str(p), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            os.write(fd, str(os.getpid()).encode("ascii"))
+            os.close(fd)
+            break
+        except FileExistsError:
+            try:
+                if time.time() - p.stat().st_mtime > stale_after:
+                    p.unlink()   # left behind by a crashed worker
+                    continue
+            except FileNotFoundError:
+                continue
+            if time.time() - t0 > timeout:
+                raise RuntimeError(f"launch_lock: timed out waiting for {p}")
+            time.sleep(0.2)
+    try:
+        yield
+    finally:
+        try:
+            p.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def tile_origin(index: int, win_w: int, win_h: int, screen_w: int, screen_h: int,
+                gap: int = 8) -> tuple[int, int]:
+    """
+    Top-left screen position for worker 'index' so instances do not overlap.
+    Raises RuntimeError when the screen has no free tile left (run fewer workers).
+    """
+    cols = max(1, (screen_w + gap) // (win_w + gap))
+    rows = max(1, (screen_h + gap) // (win_h + gap))
+    if index >= cols * rows:
+        raise RuntimeError(f"tile_origin: worker {index} has no free tile "
+                           f"({cols}x{rows} windows of {win_w}x{win_h} fit on {screen_w}x{screen_h}); "
+                           f"use at most -n {cols * rows}")
+    col, row = index % cols, index // cols
+    return col * (win_w + gap), row * (win_h + gap)
+
+
+# ---------- report fragments ----------
+
+def fragment_path(report_dir: Path | str, tag: str, worker: Optional[str] = None) -> Path:
+    return Path(report_dir) / "fragments" / f"{tag}_{worker or worker_id() or 'main'}.json"
+
+
+def write_fragment(path: Path, records: List[Dict]) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(records, indent=1, default=str), encoding="utf-8")
+    return path
+
+
+def merge_fragments(report_dir: Path | str, tag: str) -> Optional[Path]:
+    """
+    Merge reports/fragments/<tag>_*.json into reports/summary_<tag>.json
+    (tests sorted by nodeid, per-worker totals). Returns the summary path or None.
+    """
+    frag_dir = Path(report_dir) / "fragments"
+    parts = sorted(frag_dir.glob(f"{tag}_*.json"))
+    if not parts:
+        return None
+    tests: List[Dict] = []
+    workers: Dict[str, Dict[str, float]] = {}
+    for part in parts:
+        try:
+            records = json.loads(part.read_text(encoding="utf-8"))
+        except Exception as e:
+            print(f"[WARN] Skipping unreadable report fragment {part.name}: {e}")
+            continue
+        for r in records:
+            tests.append(r)
+            w = workers.setdefault(r.get("worker") or "main", {"tests": 0, "failed": 0, "duration": 0.0})
+            w["tests"] += 1
+            w["failed"] += int(r.get("outcome") == "failed")
+            w["duration"] += float(r.get("duration") or 0.0)
+    tests.sort(key=lambda r: r.get("nodeid", ""))
+    summary = {
+        "tag": tag,
+        "tests": tests,
+        "workers": workers,
+        "failed": sum(w["failed"] for w in workers.values()),
+    }
+    out = Path(report_dir) / f"summary_{tag}.json"
+    out.write_text(json.dumps(summary, indent=1, default=str), encoding="utf-8")
+    return out
@@ -38,6 +38,13 @@ HR_RY = HR_CY - HR_RH / 2.0
 # Single source of truth for OCR/readers/overlays
 HR_ROI = (HR_RX, HR_RY, HR_RW, HR_RH)
 
+# ---------- Numeric ROI registry (used by core.vitals.read_vitals) ----------
+# name -> (rx, ry, rw, rh). Add other vitals here once their ROI is measured
+# on the client area; read_vitals() accepts any of these names.
+NUMERIC_ROIS = {
+    "hr": HR_ROI,
+}
+
 # Volume screen
 VOLUME_BUTTON = (0.765, 0.933)
 
@@ -73,5 +80,8 @@ ERROR_HEAD_ROI = (0.060, 0.295, 0.880, 0.085)  # rx, ry, rw, rh  ← было н
 # Отдельный компактный ROI для "Error: -1" (если решим проверять код тоже)
 ERROR_CODE_ROI = (0.420, 0.420, 0.220, 0.070)
 
+# Whole second popup (headline + "Error: -1") for one-shot text maps (core.textmap)
+ERROR_POPUP_ROI = (0.060, 0.295, 0.880, 0.195)
+
 ERROR_TEXT_EXPECTED = "Unable to retrieve technical information"
 ERROR_CODE_EXPECTED = "Error: -1"
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+Navigation model: SimPad screens and the controls.py actions that move between them.
+Screen names match the screen fingerprint library (core.screens).
+Settle times are the waits the E2E scenarios use after each action.
+"""
+
+SCREENS = (
+    "home",               # start screen (Manual mode, battery indicator)
+    "manual_mode",        # patient type selection
+    "patient_list",       # standardized patient states (Healthy, ...)
+    "session_form",       # name session / instructor / participant
+    "session_ready",      # after the large OK, START available
+    "main",               # running session: HR value, Volume, Message, End
+    "hr_slider",
+    "volume",
+    "message",
+    "end_menu",
+    "battery_panel",
+    "device_info_popup",  # FIRST popup after the 'i' icon
+    "error_popup",        # SECOND popup: "Unable to retrieve technical information"
+)
+
+# Session form entries, filled in this order like the E2E scenario:
+# (field control, text) -> click field, CLEAR_BUTTON, focus OVERLAY_FOCUS, type, OK_BUTTON_SMALL
+SESSION_FORM = (
+    ("NAME_SESSION_FIELD", "Test Automation session"),
+    ("INSTRUCTOR_FIELD",   "test_instructor"),
+    ("PARTICIPANT1_FIELD", "test_participant"),
+)
+
+# (from, to, action, control name in controls.py, settle seconds)
+# action: "click" -> click_relative(*control); "drag" -> drag_relative(*start, *end) for a (start, end) pair;
+#         "form"  -> fill SESSION_FORM, then click_relative(*control); settle = the whole sequence
+NAV_EDGES = [
+    ("home",              "manual_mode",       "click", "MANUAL_MODE",          0.3),
+    ("manual_mode",       "patient_list",      "click", "STANDARDIZED_PATIENT", 3.0),
+    ("patient_list",      "session_form",      "click", "HEALTHY",              0.3),
+    ("session_form",      "session_ready",     "form",  "OK_BUTTON_LARGE",      4.6),
+    ("session_ready",     "main",              "click", "START_BUTTON",         0.4),
+    ("main",              "hr_slider",         "click", "HR_VALUE",             0.3),
+    ("hr_slider",         "main",              "click", "ACTIVATE_BUTTON",      0.6),
+    ("main",              "volume",            "click", "VOLUME_BUTTON",        0.5),
+    ("volume",            "main",              "click", "BACK_BUTTON",          0.3),
+    ("main",              "message",           "click", "MESSAGE_BUTTON",       0.5),
+    ("message",           "main",              "click", "BACK_BUTTON",          0.3),
+    ("main",              "end_menu",          "click", "END_BUTTON",           0.4),
+    ("end_menu",          "home",              "click", "QUIT_BUTTON",          0.4),
+    ("home",              "battery_panel",     "click", "BATTERY_INDICATOR",    0.45),
+    ("battery_panel",     "device_info_popup", "click", "INFO_ICON",            0.55),
+    ("device_info_popup", "error_popup",       "click", "POPUP_OK_TOPRIGHT",    1.0),
+    ("error_popup",       "home",              "click", "POPUP_OK_CENTER",      0.4),
+]
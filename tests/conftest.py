@@ -7,6 +7,11 @@ Root-level pytest bootstrap:
 - Non-Windows: safe stubs so headless unit tests can run
 - Excludes non-UI tests from HTML report on Windows
 - Keeps only a single report per run (same SESSION_TAG), but does not touch old runs
+- pytest-xdist (-n N): one SimPad instance per worker, per-worker artifacts and
+  report fragments merged into reports/summary_<tag>.json at session end
+- Streaming report: reports/events_<tag>[_<worker>].jsonl, one line per step/test as it
+  finishes (live view: reports/viewer.html, see core/eventlog.py)
+- SIMPAD_PROFILE=1: sampling profiler per test/step, flamegraphs under artifacts/ (core/profiler.py)
 """
 import os
 import sys
@@ -93,13 +98,95 @@ def pytest_collection_modifyitems(config, items):
         items[:] = keep
 
 
+# ---- 2.5) Streaming JSONL report (one file per process that runs tests) ----
+def pytest_sessionstart(session):
+    config = session.config
+    if config.option.collectonly:
+        return
+    if getattr(config.option, "numprocesses", None) and not hasattr(config, "workerinput"):
+        return  # xdist controller: the workers stream their own logs
+    from simpad_automation.core.eventlog import open_sink, events_path
+    from simpad_automation.core.workers import worker_id
+    tag = os.environ.get("PYTEST_HTML_TAG", SESSION_TAG)
+    sink = open_sink(events_path(pathlib.Path(config.rootpath) / "reports", tag))
+    sink.emit("session_start", tag=tag, worker=worker_id() or "main", pid=os.getpid(),
+              platform=sys.platform)
+    if not worker_id():
+        print(f"[INFO] Live report: python -m http.server (repo root) -> /reports/viewer.html?tag={tag}")
+
+
+def pytest_runtest_logstart(nodeid, location):
+    from simpad_automation.core.eventlog import emit
+    emit("test_start", test=nodeid)
+
+
+# ---- 2.6) Opt-in sampling profiler (SIMPAD_PROFILE=1) ----
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    """
+    Sample the test thread during the call phase; reporter.step files the samples per step.
+    The whole-test profile goes to artifacts/profiles/<test>.folded/.svg.
+    """
+    from simpad_automation.core import profiler
+    if not profiler.ENABLED:
+        yield
+        return
+    sampler = profiler.StackSampler().start()
+    try:
+        yield
+    finally:
+        total = sampler.stop()
+        _save_test_profile(item, sampler, total)
+
+
+def _save_test_profile(item, sampler, total):
+    from simpad_automation.core.profiler import save_profile
+    from simpad_automation.core.workers import artifacts_root
+    from simpad_automation.core.eventlog import emit, artifact
+    from simpad_automation.core.reporter import _slug
+    stats = sampler.stats()
+    try:
+        files = save_profile(total, artifacts_root(pathlib.Path(ROOT_DIR) / "artifacts") / "profiles",
+                             stem=_slug(item.nodeid)[-120:], title=item.nodeid)
+    except Exception as e:
+        print(f"[WARN] Could not write test profile: {e}")
+        files = None
+    emit("profile", test=item.nodeid, shares=total.shares(), **stats,
+         artifacts=[{"kind": "flamegraph", "path": artifact(files[1])},
+                    {"kind": "folded", "path": artifact(files[0])}] if files else [])
+
+
 # ---- 3) Keep only one report for this run (same SESSION_TAG); keep history ----
 def pytest_sessionfinish(session, exitstatus):
     """
     At the end, keep exactly one report for the current run (based on SESSION_TAG),
     deleting only duplicates with the same tag. Reports from previous runs remain untouched.
+    Workers write their report fragment; the controller merges all fragments.
     """
     from pathlib import Path
+    from simpad_automation.core.workers import worker_id, fragment_path, write_fragment, merge_fragments
+
+    from simpad_automation.core.eventlog import current_sink, close_sink
+
+    sink = current_sink()
+    if sink is not None:
+        sink.emit("session_end", exitstatus=int(exitstatus))
+        close_sink()
+
+    tag = os.environ.get("PYTEST_HTML_TAG", SESSION_TAG)
+    report_dir = Path(session.config.rootpath) / "reports"
+    records = getattr(session.config, "_simpad_records", [])
+    if worker_id() and records:
+        write_fragment(fragment_path(report_dir, tag), records)
+    if not hasattr(session.config, "workerinput"):
+        summary = merge_fragments(report_dir, tag)
+        if summary:
+            print(f"[INFO] Merged worker report fragments: {summary}")
+        from simpad_automation.core.retention import apply_retention
+        try:
+            apply_retention(session.config.rootpath, current=tag)
+        except Exception as e:
+            print(f"[WARN] Retention failed: {e}")
 
     html_fixed = getattr(session.config, "_html_fixed_path", None)
     if not html_fixed:
@@ -109,7 +196,6 @@ def pytest_sessionfinish(session, exitstatus):
     if not p.exists():
         return
 
-    tag = os.environ.get("PYTEST_HTML_TAG", SESSION_TAG)
     report_dir = p.parent
     base_stem = "_".join(p.stem.split("_")[:-1]) if tag in p.stem else p.stem
 
@@ -126,6 +212,35 @@ def pytest_sessionfinish(session, exitstatus):
     print(f"[INFO] Kept single HTML report for this run: {p.name}")
 
 
+# ---- 4) Per-worker result records (fragment written in pytest_sessionfinish) ----
+def _record_result(item, rep):
+    """Remember the call-phase outcome of a test for this worker's report fragment."""
+    if rep.when != "call" and not (rep.when == "setup" and rep.outcome != "passed"):
+        return
+    from simpad_automation.core.workers import worker_id
+    from simpad_automation.core.eventlog import emit, artifact
+    message = None
+    if rep.failed:
+        crash = getattr(rep.longrepr, "reprcrash", None)
+        message = crash.message if crash else str(rep.longrepr)[-2000:]
+    emit("test_end", test=item.nodeid, outcome=rep.outcome, when=rep.when,
+         duration=round(rep.duration, 3), worker=worker_id() or "main", message=message,
+         screenshot=artifact(getattr(item, "_simpad_failure_shot", None)))
+    records = item.config.__dict__.setdefault("_simpad_records", [])
+    records.append({
+        "nodeid": item.nodeid,
+        "outcome": rep.outcome,
+        "duration": round(rep.duration, 3),
+        "worker": worker_id() or "main",
+        "hwnd": getattr(item, "_simpad_hwnd", None),
+        "steps": [
+            {"idx": st["idx"], "name": st["name"], "status": st["status"],
+             "screenshot": str(st["screenshot"]) if st.get("screenshot") else None}
+            for st in getattr(item, "_steps", [])
+        ],
+    })
+
+
 # ======================================================================
 # Non-Windows: stubs (UI fixtures skipped; headless unit tests still run)
 # ======================================================================
@@ -139,35 +254,103 @@ if sys.platform != "win32":
     @pytest.hookimpl(hookwrapper=True)
     def pytest_runtest_makereport(item, call):
         outcome = yield
+        _record_result(item, outcome.get_result())
         return
 
 # ======================================================================
 # Windows: real UI bootstrap and screenshots on failure + step cards
 # ======================================================================
 else:
-    import pyautogui
+    import win32api
+    from simpad_automation.core.backend import init_backend
     from simpad_automation.core.app import launch_app, close_app
+    from simpad_automation.core.window import set_input_backend
+    from simpad_automation.core.workers import worker_id, worker_index, artifacts_root, launch_lock, tile_origin
     from simpad_automation.core.reporter import (
         save_client_screenshot,
         attach_image_to_pytest_html,   # keep if you use it
         _append_step_card,
     )
 
-    pyautogui.FAILSAFE = False
-    pyautogui.PAUSE = 0.02
+    # the one place pyautogui is imported and configured (modules no longer do it on import)
+    init_backend()
+    from simpad_automation.core.timing import current_timing
+    print(f"[INFO] Input timing profile: {current_timing().describe()}")
+
+    # Several instances on one desktop: no focus stealing / global cursor per action
+    if worker_id() and "SIMPAD_INPUT_BACKEND" not in os.environ:
+        set_input_backend("auto")
+
+    def _launch_for_worker():
+        """Serialized launch; each worker's window is tiled next to the others."""
+        with launch_lock(pathlib.Path(ROOT_DIR) / "artifacts" / ".launch.lock"):
+            process, hwnd = launch_app(foreground=False)
+        import win32gui
+        l, t, r, b = win32gui.GetWindowRect(hwnd)
+        try:
+            x, y = tile_origin(worker_index(), r - l, b - t,
+                               win32api.GetSystemMetrics(0), win32api.GetSystemMetrics(1))
+        except RuntimeError:
+            close_app(process, hwnd)
+            raise
+        win32gui.MoveWindow(hwnd, x, y, r - l, b - t, True)
+        return process, hwnd
+
+    def _start_framebus(hwnd):
+        """Shared capture thread for this window (SIMPAD_FRAMEBUS=0 disables): all grabs read its frames."""
+        if os.environ.get("SIMPAD_FRAMEBUS", "1") == "0":
+            return None
+        from simpad_automation.core.framebus import FrameBus
+        try:
+            return FrameBus(hwnd).start()
+        except Exception as e:
+            print(f"[WARN] FrameBus not started: {e}")
+            return None
+
+    def _stop_framebus(node, bus):
+        from simpad_automation.core.eventlog import emit
+        bus.stop()
+        stats = bus.stats()
+        print(f"[INFO] Frame bus: {stats}")
+        emit("framebus", test=node.nodeid, **stats)
+
+    def _start_recorder(hwnd):
+        """Flight recorder for failure clips (SIMPAD_RECORDER=1)."""
+        if os.environ.get("SIMPAD_RECORDER", "0") != "1":
+            return None
+        from simpad_automation.core.recorder import ClipRecorder
+        try:
+            return ClipRecorder(hwnd).start()
+        except Exception as e:
+            print(f"[WARN] ClipRecorder not started: {e}")
+            return None
+
+    def _stop_recorder(node, recorder):
+        from simpad_automation.core.eventlog import emit
+        recorder.stop()
+        stats = recorder.stats()
+        print(f"[INFO] Recorder cost: {stats}")
+        emit("recorder", test=node.nodeid, **stats)
 
     @pytest.fixture()
     def app_ctx(request):
         """
         Launch SimPad app once per test and close it on teardown.
         Stores hwnd on test node so makereport can take a screenshot before closing.
+        Under xdist every worker drives its own instance.
         """
-        process, hwnd = launch_app()
+        process, hwnd = _launch_for_worker() if worker_id() else launch_app()
         request.node._simpad_hwnd = hwnd
         request.node._simpad_process = process
+        bus = _start_framebus(hwnd)
+        recorder = _start_recorder(hwnd)
         try:
             yield (process, hwnd)
         finally:
+            if recorder is not None:
+                _stop_recorder(request.node, recorder)
+            if bus is not None:
+                _stop_framebus(request.node, bus)
             try:
                 close_app(process, hwnd)
             except Exception as e:
@@ -184,7 +367,7 @@ else:
 
         # --- failure screenshot ---
         if rep.when == "call" and rep.failed:
-            shots_dir = pathlib.Path(ROOT_DIR) / "artifacts" / "screenshots"
+            shots_dir = artifacts_root(pathlib.Path(ROOT_DIR) / "artifacts") / "screenshots"
             ts = datetime.now().strftime("%Y%m%d-%H%M%S")
             fname = f"{item.name}_{ts}.png"
             path = shots_dir / fname
@@ -195,17 +378,22 @@ else:
                 if not hasattr(rep, "extras"):
                     rep.extras = []
                 attach_image_to_pytest_html(rep, path)  # if your version already uses 'extras'
+                item._simpad_failure_shot = path
                 print(f"[SNAP] Saved failure screenshot with HR ROI: {path}")
             except Exception as e:
                 print(f"[WARN] Could not capture client screenshot: {e}")
 
+        _record_result(item, rep)   # after the screenshot so the streamed test_end can link it
+
         # --- step cards ---
         if rep.when == "call" and hasattr(item, "_steps"):
             try:
                 if not hasattr(rep, "extras"):
                     rep.extras = []
+                html_path = getattr(item.config, "_html_fixed_path", None)
+                report_dir = pathlib.Path(html_path).parent if html_path else None
                 for st in getattr(item, "_steps", []):
-                    _append_step_card(item, st)                 # generate HTML and images in item._reporter_extras
+                    _append_step_card(item, st, report_dir)                 # generate HTML and images in item._reporter_extras
                 for ex in getattr(item, "_reporter_extras", []):
                     rep.extras.append(ex)                       # append to new API
             except Exception as e:
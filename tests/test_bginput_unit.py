@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+from simpad_automation.core import bginput
+from simpad_automation.core.bginput import probe_digest
+
+HR_BOX = (0.45, 0.45, 0.10, 0.10)
+
+def _frame():
+    return np.zeros((200, 200, 3), np.uint8)
+
+@pytest.mark.noreport
+def test_probe_digest_sees_the_target_but_not_vitals_or_far_pixels():
+    img = _frame()
+    base = probe_digest(img, 0.5, 0.5, radius=0.1, exclude=(HR_BOX,))
+    img[95:100, 95:100] = 255                  # inside the vitals box: masked
+    assert probe_digest(img, 0.5, 0.5, radius=0.1, exclude=(HR_BOX,)) == base
+    img[5:10, 5:10] = 255                      # far from the target
+    assert probe_digest(img, 0.5, 0.5, radius=0.1, exclude=(HR_BOX,)) == base
+    img[82:85, 82:85] = 255                    # pressed state next to the point
+    assert probe_digest(img, 0.5, 0.5, radius=0.1, exclude=(HR_BOX,)) != base
+
+
+class _FakeWindow:
+    """Pixels around the target change on press when 'reacts'; records the posted gestures."""
+
+    def __init__(self, reacts):
+        self.reacts, self.pressed, self.events = reacts, False, []
+
+    def digest(self, hwnd, rx, ry):
+        return 1 if (self.reacts and self.pressed) else 0
+
+    def press(self, hwnd, rx, ry):
+        self.pressed = True
+        self.events.append("press")
+        return "target"
+
+    def cancel(self, hwnd, target):
+        self.pressed = False
+        self.events.append("cancel")
+
+
+@pytest.mark.noreport
+@pytest.mark.parametrize("reacts, mode", [(True, "message"), (False, "sendinput")])
+def test_probe_never_completes_a_click(monkeypatch, reacts, mode):
+    win = _FakeWindow(reacts)
+    monkeypatch.setattr(bginput, "_target_digest", win.digest)
+    monkeypatch.setattr(bginput, "_press", win.press)
+    monkeypatch.setattr(bginput, "_cancel_press", win.cancel)
+    monkeypatch.setattr(bginput, "_MODE_BY_HWND", {})
+    assert bginput.probe_input(7, 0.5, 0.5, timeout=0.2) is reacts
+    assert bginput.mode_for(7) == mode
+    assert win.events == ["press", "cancel"]   # one cancelled press, no click to replay
+
+
+@pytest.mark.noreport
+def test_probe_without_a_capture_does_not_post(monkeypatch):
+    win = _FakeWindow(True)
+    monkeypatch.setattr(bginput, "_target_digest", lambda hwnd, rx, ry: None)
+    monkeypatch.setattr(bginput, "_press", win.press)
+    monkeypatch.setattr(bginput, "_MODE_BY_HWND", {})
+    assert bginput.probe_input(7, 0.5, 0.5) is False
+    assert bginput.mode_for(7) == "sendinput" and win.events == []
@@ -0,0 +1,59 @@
+import time
+from types import SimpleNamespace
+import pytest
+from simpad_automation.core import budget
+from simpad_automation.core.reporter import step
+
+@pytest.mark.noreport
+def test_grade_bands():
+    assert budget.grade(100, 100) == "green"
+    assert budget.grade(125, 100) == "amber"
+    assert budget.grade(126, 100) == "red"
+
+@pytest.mark.noreport
+def test_modes():
+    assert budget.check("x", 200, 100, mode="off") is None
+    assert budget.check("x", 200, 100, mode="report").grade == "red"
+    with pytest.warns(budget.BudgetWarning):
+        budget.check("x", 110, 100, mode="soft")
+    with pytest.warns(budget.BudgetWarning):
+        budget.check("x", 110, 100, mode="hard")          # amber only warns
+    with pytest.raises(budget.BudgetExceeded):
+        budget.check("x", 200, 100, mode="hard")
+
+@pytest.mark.noreport
+def test_step_records_own_and_inner_budgets(monkeypatch):
+    monkeypatch.setattr(budget, "MODE", "report")
+    request = SimpleNamespace(node=SimpleNamespace(nodeid="t::x"))
+    with step(request, "Read", budget_ms=10_000):
+        with budget.budget("ocr", 1):
+            time.sleep(0.01)
+        with budget.budget("unbudgeted", None):
+            pass
+    recs = request.node._steps[0]["budgets"]
+    assert [(r.name, r.grade) for r in recs] == [("ocr", "red"), ("step 1: Read", "green")]
+
+@pytest.mark.noreport
+def test_hard_mode_fails_step_but_never_masks_errors(monkeypatch):
+    monkeypatch.setattr(budget, "MODE", "hard")
+    request = SimpleNamespace(node=SimpleNamespace(nodeid="t::x"))
+    with pytest.raises(budget.BudgetExceeded):
+        with step(request, "Slow", budget_ms=1):
+            time.sleep(0.01)
+    assert request.node._steps[0]["status"] == "failed"
+    with pytest.raises(KeyError):
+        with budget.budget("body error", 1):
+            time.sleep(0.01)
+            raise KeyError("x")
+
+@pytest.mark.noreport
+def test_nested_steps_keep_their_own_scope(monkeypatch):
+    monkeypatch.setattr(budget, "MODE", "report")
+    request = SimpleNamespace(node=SimpleNamespace(nodeid="t::x"))
+    with step(request, "outer", budget_ms=10_000):
+        with step(request, "inner"):
+            pass
+        budget.check("read_hr_value", 5, 100)
+    outer, inner = request.node._steps
+    assert [r.name for r in outer["budgets"]] == ["read_hr_value", "step 1: outer"]
+    assert inner["budgets"] == [] and budget._scopes() == []
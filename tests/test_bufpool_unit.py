@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+from simpad_automation.core import bufpool, verify
+
+@pytest.mark.noreport
+def test_pool_reuses_buffer_per_slot_and_shape():
+    p = bufpool.BufferPool(max_buffers=2)
+    a = p.get("x", (4, 5))
+    assert p.get("x", (4, 5)) is a
+    assert p.get("x", (5, 4)) is not a
+    p.get("y", (4, 5))                      # evicts the least recently used ("x", (4, 5))
+    assert p.get("x", (4, 5)) is not a
+    assert p.hits == 1 and p.misses == 4
+
+@pytest.mark.noreport
+def test_pooled_preprocessing_matches_unpooled(monkeypatch):
+    rng = np.random.default_rng(0)
+    img = rng.integers(0, 256, (54, 200, 3), dtype=np.uint8)
+    monkeypatch.setattr(bufpool, "ENABLED", False)
+    ref = [v.copy() for v in verify._prep_variants(img)]
+    monkeypatch.setattr(bufpool, "ENABLED", True)
+    for _ in range(2):                      # second call runs entirely on reused buffers
+        got = verify._prep_variants(img)
+        assert len(got) == len(ref)
+        for g, r in zip(got, ref):
+            assert np.array_equal(g, r)
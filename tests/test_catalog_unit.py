@@ -0,0 +1,49 @@
+import json
+import pytest
+from simpad_automation.core.catalog import PhraseCatalog
+from simpad_automation.core.verify import compare_tokens_batch
+
+PHRASES = {
+    "err.info": "Unable to retrieve technical information",
+    "err.short": "Unable to retrieve",
+    "hr.title": "Heart rate",
+    "mode.manual": "Manual mode",
+    "net.fail": "Network connection failed",
+}
+
+@pytest.mark.noreport
+def test_best_handles_glued_and_noisy_words():
+    cat = PhraseCatalog(PHRASES)
+    hit = cat.best("Unable to retreive technicalinformation")
+    assert hit.key == "err.info" and hit.ok
+    # the shorter phrase matches part of the line perfectly but explains less of it
+    assert cat.best("Unable to retrieve technical information").key == "err.info"
+    assert cat.best("Unable to retrieve").key == "err.short"
+
+@pytest.mark.noreport
+def test_batch_returns_none_for_unrelated_and_dedupes():
+    lines = ["Netw0rk connection faiIed", "Battery charging", "Netw0rk connection faiIed"]
+    hits = compare_tokens_batch(lines, list(PHRASES.values()))
+    assert hits[0].phrase == "Network connection failed"
+    assert hits[1] is None
+    assert hits[2] is hits[0]
+
+@pytest.mark.noreport
+def test_from_file_json_and_txt(tmp_path):
+    pj = tmp_path / "phrases.json"
+    pj.write_text(json.dumps(PHRASES), encoding="utf-8")
+    pt = tmp_path / "phrases.txt"
+    pt.write_text("# en\nHeart rate\n\nManual mode\n", encoding="utf-8")
+    assert len(PhraseCatalog.from_file(pj)) == 5
+    cat = PhraseCatalog.from_file(pt)
+    assert cat.phrases == ["Heart rate", "Manual mode"]
+    assert cat.best("Manuai mode").key == "Manual mode"
+
+@pytest.mark.noreport
+def test_non_latin_phrases_are_indexed_and_empty_ones_reported(capsys):
+    cat = PhraseCatalog({"ru": "Частота сердечных сокращений", "de": "Gerät nicht verfügbar",
+                         "en": "Heart rate", "num": "120 / 80"})
+    assert len(cat) == 3 and cat.tokens[1] == ["gerät", "nicht", "verfügbar"]
+    assert "num" in capsys.readouterr().out
+    assert cat.best("Частота сердечных сокрашений").key == "ru"
+    assert cat.best("Gerat nicht verfugbar").key == "de"
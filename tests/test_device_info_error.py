@@ -7,11 +7,11 @@ if sys.platform != "win32":
     pytest.skip("Windows desktop required for UI tests", allow_module_level=True)
 
 import time
-from pathlib import Path
 
 from simpad_automation.core.window import click_relative, get_client_rect
 from simpad_automation.core.verify import assert_phrase_in_roi
 from simpad_automation.core.reporter import step
+from simpad_automation.core.workers import artifacts_root
 from simpad_automation.ui import controls as ui
 
 @pytest.mark.ui
@@ -22,21 +22,21 @@ def test_device_info_error_popup_two_steps(app_ctx, request):
       - OK on second popup
     """
     process, hwnd = app_ctx
-    artifacts = Path("artifacts") / "test_device_info_error_popup_two_steps"
+    artifacts = artifacts_root() / "test_device_info_error_popup_two_steps"
     artifacts.mkdir(parents=True, exist_ok=True)
 
     # 1) Battery indicator
-    with step(request, "Tap Battery indicator", hwnd, artifacts):
+    with step(request, "Tap Battery indicator", hwnd, artifacts, expect_screen="battery_panel"):
         click_relative(hwnd, *ui.BATTERY_INDICATOR)
         time.sleep(0.45)
 
     # 2) 'i' icon → FIRST popup
-    with step(request, "Open FIRST popup via info icon", hwnd, artifacts):
+    with step(request, "Open FIRST popup via info icon", hwnd, artifacts, expect_screen="device_info_popup"):
         click_relative(hwnd, *ui.INFO_ICON)
         time.sleep(0.55)
 
     # 3) FIRST popup OK
-    with step(request, "Confirm FIRST popup (OK)", hwnd, artifacts):
+    with step(request, "Confirm FIRST popup (OK)", hwnd, artifacts, expect_screen="error_popup"):
         click_relative(hwnd, *ui.POPUP_OK_TOPRIGHT)
         time.sleep(1.0)
 
@@ -56,6 +56,6 @@ def test_device_info_error_popup_two_steps(app_ctx, request):
         assert ok, f"OCR phrase check failed: {details}"
 
     # 5) SECOND popup OK
-    with step(request, "Confirm SECOND popup (OK)", hwnd, artifacts):
+    with step(request, "Confirm SECOND popup (OK)", hwnd, artifacts, expect_screen="home"):
         click_relative(hwnd, *ui.POPUP_OK_CENTER)
         time.sleep(0.4)
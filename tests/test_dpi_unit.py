@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+from simpad_automation.core import dpi
+from simpad_automation.core.framebus import crop_rel
+
+@pytest.mark.noreport
+def test_one_transform_for_points_regions_and_crops():
+    cm = dpi.ClientMap(left=-1200, top=150, width=720, height=960, dpi=144)   # 150 %, left monitor
+    assert cm.scale == 1.5
+    assert cm.point(0.5, 0.25) == (-1200 + 360, 150 + 240)
+    frame = np.arange(960 * 720, dtype=np.int32).reshape(960, 720)
+    roi = (0.577, 0.147, 0.18, 0.14)
+    x, y, w, h = cm.region(*roi)
+    crop = crop_rel(frame, *roi)
+    assert crop.shape == (h, w) and crop[0, 0] == frame[y - cm.top, x - cm.left]
+    assert dpi.ClientMap.from_rect(cm.rect, cm.dpi) == cm
+
+@pytest.mark.noreport
+def test_upscale_keeps_tuned_constants_at_96_dpi():
+    assert dpi.capture_scale() == 1.0                   # no window resolved: 96 dpi
+    assert dpi.upscale_for(3.0) == 3.0
+    assert dpi.upscale_for(3.8 * 1.8, scale=1.0) == pytest.approx(6.84)
+    assert dpi.upscale_for(3.6, scale=1.5) == pytest.approx(2.4)
+    assert dpi.upscale_for(3.0, scale=4.0) == 1.0       # never downscaled
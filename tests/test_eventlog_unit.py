@@ -0,0 +1,21 @@
+import pytest
+from simpad_automation.core.eventlog import ReportSink, read_events, summarize, events_path
+
+@pytest.mark.noreport
+def test_sink_streams_and_survives_torn_line(tmp_path):
+    sink = ReportSink(events_path(tmp_path / "reports", "T", worker="gw1"))
+    shot = tmp_path / "artifacts" / "gw1" / "failed.png"
+    sink.emit("test_start", test="t::a")
+    sink.emit("step", test="t::a", idx=1, name="click", status="failed", screenshot=sink.rel(shot))
+    sink.emit("test_end", test="t::a", outcome="failed", duration=1.5)
+    sink.emit("test_start", test="t::b")
+    assert len(read_events(sink.path)) == 4          # already on disk before close()
+    with open(sink.path, "a", encoding="utf-8") as fh:
+        fh.write('{"event": "step", "test": "t::b", "id')  # crash mid-write
+    sink.close()
+
+    assert sink.path.name == "events_T_gw1.jsonl"
+    tests = summarize(read_events(sink.path))
+    assert tests["t::a"]["outcome"] == "failed"
+    assert tests["t::a"]["steps"][0]["screenshot"] == "../artifacts/gw1/failed.png"
+    assert tests["t::b"]["outcome"] == "interrupted"
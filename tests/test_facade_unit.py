@@ -0,0 +1,26 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+@pytest.mark.noreport
+def test_facade_import_is_light():
+    code = ("import sys, simpad_automation as s; "
+            "print(sorted(m for m in ('cv2', 'numpy', 'pyautogui', 'pytesseract', 'win32gui') if m in sys.modules)); "
+            "s.artifacts_root; print('numpy' in sys.modules)")
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                         env=dict(os.environ, PYTHONPATH=str(SRC))).stdout.split()
+    assert out == ["[]", "False"]
+
+@pytest.mark.noreport
+def test_facade_resolves_names_lazily():
+    import simpad_automation
+    from simpad_automation.core.timeseries import TimeSeriesRing
+    assert simpad_automation.TimeSeriesRing is TimeSeriesRing
+    assert "read_hr_value" in dir(simpad_automation)
+    with pytest.raises(AttributeError):
+        simpad_automation.no_such_name
@@ -0,0 +1,66 @@
+import threading
+import time
+import numpy as np
+import pytest
+from simpad_automation.core.framebus import FrameBus, crop_rel
+
+def _counting_grab(delay=0.0):
+    n = {"grabs": 0}
+    def grab():
+        n["grabs"] += 1
+        time.sleep(delay)
+        img = np.full((40, 60, 3), n["grabs"] % 256, np.uint8)
+        return img, {"left": 0, "top": 0, "width": 60, "height": 40}
+    return grab, n
+
+@pytest.mark.noreport
+def test_no_demand_no_captures_and_fresh_is_after_call():
+    grab, n = _counting_grab()
+    with FrameBus(grab=grab) as bus:
+        time.sleep(0.1)
+        assert n["grabs"] == 0 and bus.latest() is None
+        t = time.perf_counter()
+        f = bus.fresh()
+        assert f.t >= t and f.seq == 1 and not f.img.flags.writeable
+        assert bus.newer_than(f.seq).seq == 2
+        assert bus.at(f.t).seq == 1 and bus.at(f.t - 1.0) is None
+
+@pytest.mark.noreport
+def test_concurrent_readers_share_captures():
+    grab, n = _counting_grab(delay=0.02)
+    got = []
+    with FrameBus(grab=grab, max_hz=20) as bus:
+        def reader():
+            got.append(bus.fresh().seq)
+        threads = [threading.Thread(target=reader) for _ in range(8)]
+        for th in threads:
+            th.start()
+        for th in threads:
+            th.join()
+        assert len(got) == 8 and n["grabs"] < 8
+        assert bus.stats()["served"] == 8
+
+@pytest.mark.noreport
+def test_subscription_sets_rate_and_ring_is_bounded():
+    grab, n = _counting_grab()
+    with FrameBus(grab=grab, capacity=4, max_hz=200) as bus:
+        with bus.subscribe(50):
+            time.sleep(0.3)
+        during = n["grabs"]
+        time.sleep(0.15)
+        assert 5 <= during <= 20 and n["grabs"] <= during + 1   # stops capturing with the subscription
+        assert bus.stats()["buffered"] == 4
+    assert crop_rel(np.zeros((40, 60)), 0.5, 0.5, 0.25, 0.25).shape == (10, 15)
+
+@pytest.mark.noreport
+def test_consumers_read_the_window_bus():
+    from simpad_automation.core import ocr
+    from simpad_automation.core.recorder import ClipRecorder
+    grab, n = _counting_grab()
+    with FrameBus(hwnd=4242, grab=grab) as bus:
+        roi = ocr._grab_roi_bgr(4242, 0.5, 0.5, 0.5, 0.5)
+        assert roi.shape == (20, 30, 3) and roi.flags.writeable       # caller owns a copy
+        with ClipRecorder(4242, seconds=1, fps=20, scale=1.0) as rec:
+            time.sleep(0.3)
+        assert rec.stats()["frames"] >= 3 and len(rec.ring) >= 3
+        assert bus.stats()["captures"] == n["grabs"]
@@ -0,0 +1,27 @@
+import cv2
+import numpy as np
+import pytest
+from simpad_automation.core.inkbox import ink_bbox, tighten
+
+def _text_roi(fg, bg, w=400, h=80, org=(120, 50), scale=0.8):
+    img = np.full((h, w, 3), bg, np.uint8)
+    cv2.putText(img, "Unable", org, cv2.FONT_HERSHEY_SIMPLEX, scale, fg, 2)
+    return img
+
+@pytest.mark.noreport
+@pytest.mark.parametrize("fg,bg", [((20, 20, 20), (235, 235, 235)), ((255, 255, 255), (60, 40, 30))])
+def test_tighten_keeps_ink_with_margin(fg, bg):
+    img = _text_roi(fg, bg)
+    x, y, w, h = ink_bbox(img)
+    crop, (cx, cy, cw, ch) = tighten(img)
+    assert crop.shape[:2] == (ch, cw)
+    assert cx <= x - 4 and cy <= y - 4 and cx + cw >= x + w + 4 and cy + ch >= y + h + 4
+    assert cw * ch < 0.5 * img.shape[0] * img.shape[1]
+
+@pytest.mark.noreport
+def test_tighten_leaves_roi_when_no_ink_or_little_gain():
+    blank = np.full((50, 120, 3), 90, np.uint8)
+    assert tighten(blank)[1] == (0, 0, 120, 50)
+    full = _text_roi((0, 0, 0), (255, 255, 255), w=100, h=30, org=(2, 24), scale=1.0)
+    crop, box = tighten(full)
+    assert box == (0, 0, 100, 30) and crop is full
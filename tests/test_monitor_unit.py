@@ -0,0 +1,51 @@
+import time
+import numpy as np
+import pytest
+from simpad_automation.core.framebus import FrameBus
+from simpad_automation.core.monitor import RoiMonitor
+
+HWND = 4242
+
+def _changing_grab(every=5):
+    """Fake client capture whose pixels change every 'every' grabs."""
+    n = {"grabs": 0}
+    def grab():
+        n["grabs"] += 1
+        img = np.full((40, 60, 3), (n["grabs"] // every) % 256, np.uint8)
+        return img, {"left": 0, "top": 0, "width": 60, "height": 40}
+    return grab
+
+class _CountingReader:
+    def __init__(self, slow_first=0.0, fail=False):
+        self.calls, self.slow_first, self.fail = 0, slow_first, fail
+
+    def __call__(self, img):
+        self.calls += 1
+        if self.fail:
+            raise ValueError("reader broke")
+        if self.calls == 1:
+            time.sleep(self.slow_first)
+        return int(img[0, 0, 0]), 90.0
+
+@pytest.mark.noreport
+def test_monitor_skips_unchanged_frames_and_counts_dropped_ticks():
+    reader = _CountingReader(slow_first=0.12)             # ~6 periods at 50 Hz
+    with FrameBus(HWND, grab=_changing_grab()):
+        with RoiMonitor(HWND, roi=(0.0, 0.0, 1.0, 1.0), rate_hz=50, reader=reader) as mon:
+            time.sleep(0.4)
+    st = mon.stats()
+    assert st["samples"] == st["recognized"] + st["skipped_unchanged"] > 0
+    assert st["recognized"] == reader.calls and st["skipped_unchanged"] > 0
+    assert st["dropped"] >= 3 and st["target_hz"] == 50.0
+    assert len(mon.series) == st["samples"]
+
+@pytest.mark.noreport
+def test_monitor_error_does_not_hide_the_with_block_failure():
+    with FrameBus(HWND, grab=_changing_grab()):
+        with pytest.raises(AssertionError, match="real failure"):
+            with RoiMonitor(HWND, roi=(0.0, 0.0, 1.0, 1.0), rate_hz=50, reader=_CountingReader(fail=True)):
+                time.sleep(0.1)
+                raise AssertionError("real failure")
+        with pytest.raises(RuntimeError, match="RoiMonitor sampling failed"):
+            with RoiMonitor(HWND, roi=(0.0, 0.0, 1.0, 1.0), rate_hz=50, reader=_CountingReader(fail=True)):
+                time.sleep(0.1)
@@ -0,0 +1,68 @@
+import pytest
+from simpad_automation.core import nav, screens
+from simpad_automation.core.nav import NavGraph, default_graph
+
+
+@pytest.mark.noreport
+def test_default_graph_reaches_deep_screens():
+    g = default_graph()
+    path = g.plan("home", "hr_slider")
+    assert [e.control for e in path] == [
+        "MANUAL_MODE", "STANDARDIZED_PATIENT", "HEALTHY", "OK_BUTTON_LARGE", "START_BUTTON", "HR_VALUE",
+    ]
+    # recovery from a popup goes through the graph, not a relaunch
+    assert [e.dst for e in g.plan("error_popup", "battery_panel")] == ["home", "battery_panel"]
+    assert g.plan("main", "main") == []
+
+
+@pytest.mark.noreport
+def test_graph_spec_is_validated():
+    with pytest.raises(ValueError):
+        NavGraph.from_spec([("home", "nowhere", "click", "MANUAL_MODE", 0.1)])
+    with pytest.raises(ValueError):
+        NavGraph.from_spec([("home", "main", "click", "NO_SUCH_BUTTON", 0.1)])
+    with pytest.raises(ValueError):
+        NavGraph([]).plan("home", "main")
+
+
+class _FakeApp:
+    """Screen state machine driven by the graph; 'detour' lands one hop on another screen."""
+
+    def __init__(self, screen, detour=None):
+        self.screen, self.detour, self.actions = screen, dict(detour or {}), []
+
+    def perform(self, hwnd, edge):
+        self.actions.append((edge.action, edge.control))
+        self.screen = self.detour.pop(edge.control, edge.dst)
+
+    def identify(self, hwnd, library=None, max_distance=0.45):
+        return screens.ScreenMatch(self.screen, 0.0, 1.0, None, 0.0)
+
+    def wait(self, hwnd, expected, timeout=3.0, poll=0.05, library=None, max_distance=0.45):
+        if self.screen != expected:
+            raise AssertionError(expected)
+
+
+@pytest.mark.noreport
+def test_navigate_fills_session_form_and_replans_after_a_detour(monkeypatch):
+    app = _FakeApp("home", detour={"STANDARDIZED_PATIENT": "home"})   # first tap is missed
+    monkeypatch.setattr(nav, "_perform", app.perform)
+    monkeypatch.setattr(screens, "identify_screen", app.identify)
+    monkeypatch.setattr(screens, "wait_for_screen", app.wait)
+    done = nav.navigate(None, "hr_slider")
+    assert app.screen == "hr_slider"
+    assert [e.control for e in done][:3] == ["MANUAL_MODE", "STANDARDIZED_PATIENT", "MANUAL_MODE"]
+    assert ("form", "OK_BUTTON_LARGE") in app.actions
+
+    app.screen = None
+    with pytest.raises(RuntimeError, match="unknown"):
+        nav.navigate(None, "main")
+
+
+@pytest.mark.noreport
+def test_calibration_toggle_is_a_round_trip_of_the_graph():
+    from simpad_automation.core.timing import CALIBRATION_TOGGLE
+    there, back = default_graph().round_trip(*CALIBRATION_TOGGLE)
+    assert (there.control, back.control) == ("VOLUME_BUTTON", "BACK_BUTTON")
+    with pytest.raises(ValueError):
+        default_graph().round_trip("home", "manual_mode")            # no Back edge from manual_mode
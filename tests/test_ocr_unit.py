@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+from simpad_automation.core import ocr
+from simpad_automation.core.ocr import DigitRead, _Votes, _vote_frame
+
+FRAME = np.zeros((20, 40, 3), np.uint8)
+
+def _passes(*results):
+    """Fake _digit_passes: yields the given (value, conf) and records how many were consumed."""
+    used = []
+    def passes(img):
+        for r in results:
+            used.append(r)
+            yield r
+    return passes, used
+
+@pytest.fixture()
+def no_tighten(monkeypatch):
+    monkeypatch.setattr(ocr, "_tighten_digits", lambda img: img)
+
+@pytest.mark.noreport
+def test_confident_pass_stops_early_and_quorum_spans_frames(monkeypatch, no_tighten):
+    passes, used = _passes((120, 91.0), (120, 50.0), (121, 40.0))
+    monkeypatch.setattr(ocr, "_digit_passes", passes)
+    votes = _Votes()
+    assert _vote_frame(FRAME, 0.2, votes) == 120 and len(used) == 1
+
+    votes = _Votes()
+    monkeypatch.setattr(ocr, "_digit_passes", _passes((120, 50.0), (None, 0.0), (121, 40.0))[0])
+    assert _vote_frame(FRAME, 0.2, votes) is None                 # undecided frame
+    monkeypatch.setattr(ocr, "_digit_passes", _passes((120, 60.0), (99, 99.0))[0])
+    assert _vote_frame(FRAME, 0.2, votes) == 120                  # second vote for 120 = quorum
+    assert votes.passes == 4 and votes.conf(120) == 55.0
+
+@pytest.mark.noreport
+def test_truncated_or_empty_reads_go_to_components(monkeypatch, no_tighten):
+    calls = []
+    def components(img):
+        calls.append(img)
+        return 100, 70.0
+    monkeypatch.setattr(ocr, "_ocr_by_components", components)
+    monkeypatch.setattr(ocr, "_digit_passes", _passes((10, 95.0), (10, 95.0))[0])
+    assert _vote_frame(FRAME, 0.2, _Votes()) == 100               # '10' is never taken from one pass
+    monkeypatch.setattr(ocr, "_digit_passes", _passes((None, 0.0), (None, 0.0))[0])
+    assert _vote_frame(FRAME, 0.2, _Votes()) == 100
+    assert len(calls) == 2
+
+@pytest.mark.noreport
+def test_read_digits_conf_skips_unchanged_frames_and_falls_back_to_best_vote(monkeypatch, no_tighten):
+    frames = iter([FRAME, FRAME, FRAME + 1])
+    monkeypatch.setattr(ocr, "_grab_roi_bgr", lambda hwnd, rx, ry, rw, rh: next(frames))
+    monkeypatch.setattr(ocr, "_digit_passes", _passes((72, 60.0), (75, 30.0))[0])
+    monkeypatch.setattr(ocr, "_ocr_by_components", lambda img: (None, 0.0))
+    res = ocr.read_digits_conf(None, 0, 0, 0.2, 0.1, retries=3, sleep=0.0)
+    # frame 2 is identical to frame 1 and is not recognized again; frame 3 completes the quorum
+    assert res == DigitRead(72, 60.0, 3, 2)
+    frames = iter([FRAME])
+    res = ocr.read_digits_conf(None, 0, 0, 0.2, 0.1, retries=1, sleep=0.0)
+    assert res == DigitRead(72, 60.0, 2, 1)                      # undecided -> best vote so far
+
+@pytest.mark.noreport
+def test_stitch_glyphs_same_height_fixed_gap_and_border_background():
+    a = np.full((24, 10), 255, np.uint8); a[4:20, 3:7] = 0       # dark ink on white
+    b = np.full((12, 10), 255, np.uint8); b[2:10, 2:8] = 0
+    canvas, spans = ocr._stitch_glyphs([a, b], glyph_h=48, gap=32, margin=16)
+    assert canvas.shape == (48 + 32, 16 + 20 + 32 + 40 + 16)
+    assert spans == [(16, 36), (68, 108)]
+    assert canvas[0, 0] == 255 and canvas[40, 60] == 255          # white margins and gap
+    assert set(np.unique(canvas)) == {0, 255}
+
+@pytest.mark.noreport
+def test_assign_glyph_words_splits_multi_digit_words_and_keeps_best_conf():
+    spans = [(16, 36), (68, 88), (120, 140)]
+    words = [("12", 70.0, 10, 85),     # covers slots 0 and 1, one digit each -> split
+             ("7", 40.0, 118, 20),     # slot 2 by its center
+             ("9", 90.0, 120, 16),     # same slot, more confident -> wins
+             ("", 95.0, 0, 10)]        # no digits
+    assert ocr._assign_glyph_words(words, spans) == {0: ("1", 70.0), 1: ("2", 70.0), 2: ("9", 90.0)}
+    # a word over two slots with three digits is not split: last digit to the nearest slot
+    assert ocr._assign_glyph_words([("123", 50.0, 20, 60)], spans) == {0: ("3", 50.0)}
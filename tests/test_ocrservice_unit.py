@@ -0,0 +1,109 @@
+import socket
+import threading
+import time
+import numpy as np
+import pytest
+from simpad_automation.core import ocrservice
+from simpad_automation.core.ocrservice import OcrClient, OcrServer, parse_config
+
+class _FakeEngine:
+    """Answers with the image's mean; records batches and the peak number of concurrent calls."""
+    name = "fake"
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.batches = []
+        self.active = self.peak = 0
+        self._lock = threading.Lock()
+
+    def run_batch(self, op, config, lang, images):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            self.batches.append((op, config, len(images)))
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        if op == "data":
+            return [{"text": [str(int(im.mean()))], "conf": [90.0]} for im in images]
+        return [f"{lang}:{int(im.mean())}" for im in images]
+
+@pytest.mark.noreport
+def test_client_round_trip_over_tcp():
+    with OcrServer(("127.0.0.1", 0), workers=2, engine=_FakeEngine()) as srv:
+        c = OcrClient(srv.address)
+        img = np.full((12, 30), 7, np.uint8)
+        data = c.image_to_data(img, config="--psm 7", output_type=c.Output.DICT)
+        assert data == {"text": ["7"], "conf": [90.0]}
+        assert c.image_to_string(np.full((4, 4, 3), 9, np.uint8), lang="eng") == "eng:9"
+        st = c.stats()
+        c.close()
+    assert st["engine"] == "fake" and st["served"] == 2 and st["queue_depth"] == 0
+    assert st["latency_p95_ms"] >= st["latency_p50_ms"] > 0
+
+@pytest.mark.noreport
+def test_same_config_requests_are_batched_and_deduplicated_under_the_limit():
+    eng = _FakeEngine(delay=0.05)
+    srv = OcrServer(("127.0.0.1", 0), workers=1, engine=eng, batch_wait_s=0.0)
+    srv._t_start = time.perf_counter()
+    worker = threading.Thread(target=srv._work, daemon=True)
+    blocker = srv.submit("string", np.zeros((2, 2), np.uint8), "--psm 8")
+    worker.start()
+    time.sleep(0.01)                                      # the worker is busy with 'blocker'
+    jobs = [srv.submit("data", np.full((3, 3), v, np.uint8), "--psm 7") for v in (1, 2, 1, 3)]
+    other = srv.submit("data", np.full((3, 3), 5, np.uint8), "--psm 6")
+    assert srv.stats()["queue_depth"] == 5
+    for j in [blocker, other] + jobs:
+        assert j.done.wait(2.0) and j.error is None
+    srv._stop.set()
+    assert [j.result["text"] for j in jobs] == [["1"], ["2"], ["1"], ["3"]]
+    assert eng.batches == [("string", "--psm 8", 1), ("data", "--psm 7", 3), ("data", "--psm 6", 1)]
+    st = srv.stats()
+    assert eng.peak == 1 and st["batches"] == 3 and st["deduped"] == 1 and st["max_queue_depth"] == 5
+
+@pytest.mark.noreport
+def test_engine_falls_back_when_no_server(monkeypatch):
+    monkeypatch.setenv("SIMPAD_OCR_SERVER", "127.0.0.1:9")       # nothing listens on the discard port
+    monkeypatch.setattr(ocrservice, "_in_process", lambda: "in-process")
+    ocrservice.reset()
+    try:
+        assert ocrservice.engine() == "in-process"
+        assert ocrservice._down_until > time.monotonic()          # no probe on every call
+        with OcrServer(("127.0.0.1", 0), workers=1, engine=_FakeEngine()) as srv:
+            monkeypatch.setenv("SIMPAD_OCR_SERVER", ocrservice.format_address(srv.address))
+            ocrservice.reset()
+            assert isinstance(ocrservice.engine(), OcrClient)
+    finally:
+        ocrservice.reset()
+
+@pytest.mark.noreport
+def test_engine_is_opt_in_and_ignores_foreign_services(monkeypatch):
+    monkeypatch.delenv("SIMPAD_OCR_SERVER", raising=False)
+    monkeypatch.setattr(ocrservice, "_in_process", lambda: "in-process")
+    assert ocrservice.server_address() is None
+    srv = socket.socket()
+    srv.bind(("127.0.0.1", 0)); srv.listen(1)
+
+    def foreign():                          # answers with something that is not our reply
+        conn, _ = srv.accept()
+        conn.recv(1024)
+        conn.sendall(b"HTTP/1.1 400 Bad Request\r\n\r\n")
+        time.sleep(5.0)                     # then hangs
+        conn.close()
+
+    threading.Thread(target=foreign, daemon=True).start()
+    monkeypatch.setenv("SIMPAD_OCR_SERVER", "127.0.0.1:%d" % srv.getsockname()[1])
+    ocrservice.reset()
+    try:
+        t0 = time.monotonic()
+        assert ocrservice.engine() == "in-process"
+        assert time.monotonic() - t0 < ocrservice.PING_TIMEOUT_S + 0.5
+    finally:
+        ocrservice.reset()
+        srv.close()
+
+@pytest.mark.noreport
+def test_parse_config():
+    psm, cvars = parse_config("--oem 3 --psm 7 -c tessedit_char_whitelist=0123456789")
+    assert psm == 7 and cvars == {"tessedit_char_whitelist": "0123456789"}
+    assert parse_config("") == (None, {})
@@ -0,0 +1,43 @@
+import time
+from types import SimpleNamespace
+import pytest
+from simpad_automation.core import profiler
+from simpad_automation.core.reporter import step
+
+def _busy_python(ms):
+    end = time.perf_counter() + ms / 1000.0
+    n = 0
+    while time.perf_counter() < end:
+        n += 1
+    return n
+
+def _sleepy(ms):
+    time.sleep(ms / 1000.0)
+
+@pytest.mark.noreport
+def test_sampler_collapses_stacks_and_categories():
+    with profiler.StackSampler(interval_ms=2) as s:
+        _busy_python(150)
+        _sleepy(150)
+    prof = s.total
+    assert prof.samples > 20
+    stacks = "\n".join(prof.stacks)
+    assert "test_profiler_unit._busy_python:" in stacks and "test_profiler_unit._sleepy:" in stacks
+    assert "_pytest" not in stacks.split(";")[0]          # runner frames are cut
+    assert set(prof.categories) <= {"python", "sleep"} and prof.categories["sleep"] > 0
+    assert s.stats()["samples"] == prof.samples
+
+@pytest.mark.noreport
+def test_step_writes_profile_and_buckets(tmp_path):
+    request = SimpleNamespace(node=SimpleNamespace(nodeid="t::x"))
+    outer = profiler.active_sampler()                      # conftest's, under SIMPAD_PROFILE=1
+    with profiler.StackSampler(interval_ms=2) as s:
+        with step(request, "Busy", artifacts_dir=tmp_path):
+            _busy_python(100)
+    busy, = request.node._steps
+    svg, folded = busy["profile"]
+    assert svg.name == "profile.svg" and svg.read_text().startswith("<svg")
+    assert "_busy_python" in folded.read_text()
+    assert profiler.save_profile(profiler.Profile(), tmp_path) is None   # nothing sampled -> no files
+    assert s.total.samples >= sum(int(l.rsplit(" ", 1)[1]) for l in folded.read_text().splitlines())
+    assert profiler.active_sampler() is outer
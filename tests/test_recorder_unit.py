@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+from PIL import Image
+from simpad_automation.core.recorder import DeltaFrameRing, write_clip
+
+def _frame(i):
+    img = np.full((60, 80, 3), 40, np.uint8)
+    img[10:20, i % 60:i % 60 + 10] = 255        # a moving block
+    return img
+
+@pytest.mark.noreport
+def test_ring_roundtrip_is_lossless_and_bounded():
+    ring = DeltaFrameRing(max_frames=10, group_size=4)
+    src = [_frame(i) for i in range(30)]
+    for i, f in enumerate(src):
+        ring.push(i * 0.25, f)
+    assert ring.push(30 * 0.25, src[-1]) == 0       # unchanged frame costs nothing
+    out = list(ring.frames())
+    assert 10 <= len(out) <= 14                     # whole groups are evicted
+    for t, f in out:
+        assert np.array_equal(f, (src + [src[-1]])[int(round(t / 0.25))])
+    assert ring.nbytes < sum(f.nbytes for _, f in out) / 4
+
+@pytest.mark.noreport
+def test_write_clip_apng(tmp_path):
+    frames = [(i * 0.25, _frame(i)) for i in range(5)]
+    path = write_clip(frames, tmp_path / "clip.png", fps=4)
+    with Image.open(path) as im:
+        assert getattr(im, "n_frames", 1) == 5
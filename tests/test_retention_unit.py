@@ -0,0 +1,81 @@
+import os
+import time
+import pytest
+from simpad_automation.core.retention import RetentionManager, RetentionPolicy
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"x" * 4000
+
+def _run(base, tag, age_days, image=PNG):
+    """One synthetic session: tagged report + events, a step screenshot; all dated age_days ago."""
+    t = time.time() - age_days * 86400
+    files = [base / "reports" / f"report_{tag}.html", base / "reports" / f"events_{tag}.jsonl",
+             base / "artifacts" / f"step_{tag}" / "screen.png"]
+    for f in files:
+        f.parent.mkdir(parents=True, exist_ok=True)
+        f.write_bytes(image if f.suffix == ".png" else b"{}" * 500)
+        os.utime(f, (t, t))
+    return t
+
+def _tag(days_ago):
+    return time.strftime("%Y%m%d_%H%M%S", time.localtime(time.time() - days_ago * 86400))
+
+@pytest.mark.noreport
+def test_policy_parse():
+    assert RetentionPolicy.parse("off") is None
+    assert RetentionPolicy.parse("") is None                  # opt-in: unset means off
+    assert RetentionPolicy.parse("on") == RetentionPolicy()
+    pol = RetentionPolicy.parse("days=7, size=500M, runs=none")
+    assert (pol.days, pol.runs, pol.size, pol.loose) == (7, None, 500 << 20, 3)
+    with pytest.raises(ValueError):
+        RetentionPolicy.parse("weeks=2")
+
+@pytest.mark.noreport
+def test_compacts_old_runs_dedupes_images_and_restores(tmp_path):
+    tags = [_tag(d) for d in (5, 4, 3, 2)]
+    for d, tag in zip((5, 4, 3, 2), tags):
+        _run(tmp_path, tag, d)
+    res = RetentionManager(tmp_path).apply(RetentionPolicy(days=30, runs=10, size=None, loose=1), grace_s=0)
+    assert sorted(res["compacted"]) == sorted(tags[:3]) and not res["deleted"]
+    assert not (tmp_path / "reports" / f"report_{tags[0]}.html").exists()
+    assert not (tmp_path / "artifacts" / f"step_{tags[0]}").exists()        # emptied dirs removed
+    assert (tmp_path / "reports" / f"report_{tags[3]}.html").exists()       # newest stays loose
+    blobs = list((tmp_path / "artifacts" / "archive" / "blobs").rglob("*.png"))
+    assert len(blobs) == 1                                                  # same screenshot stored once
+    mgr = RetentionManager(tmp_path)
+    out = mgr.restore(tags[0], tmp_path / "restored")
+    assert (out / "artifacts" / f"step_{tags[0]}" / "screen.png").read_bytes() == PNG
+    assert (out / "reports" / f"events_{tags[0]}.jsonl").exists()
+
+@pytest.mark.noreport
+def test_deletes_by_age_count_and_size_and_rescans_incrementally(tmp_path):
+    tags = [_tag(d) for d in (40, 6, 5, 4, 3)]
+    for i, (d, tag) in enumerate(zip((40, 6, 5, 4, 3), tags)):
+        _run(tmp_path, tag, d, image=PNG + bytes([i]))
+    mgr = RetentionManager(tmp_path)
+    res = mgr.apply(RetentionPolicy(days=30, runs=3, size=None, loose=5), grace_s=0)
+    assert sorted(res["deleted"]) == sorted(tags[:2])                       # too old, then beyond 3 runs
+    res = mgr.apply(RetentionPolicy(days=30, runs=3, size=13000, loose=5), grace_s=0)
+    assert res["deleted"] == [tags[2]] and res["total"] <= 13000            # oldest goes first
+    mgr.scan()                                                              # picks up the removed dirs
+    assert mgr.scan() == 0 and mgr.listed == 0                              # nothing changed: nothing listed
+
+@pytest.mark.noreport
+def test_delete_keeps_files_rewritten_in_place_by_a_later_run(tmp_path):
+    old = _tag(5)
+    _run(tmp_path, old, 5)
+    step = tmp_path / "artifacts" / "test_x" / "step_01.png"
+    step.parent.mkdir(parents=True)
+    step.write_bytes(PNG)
+    t = time.time() - 5 * 86400
+    os.utime(step, (t, t)); os.utime(step.parent, (t, t))
+    mgr = RetentionManager(tmp_path)
+    mgr.scan()
+    assert mgr.files["artifacts/test_x/step_01.png"][2] == old
+    mtime_dir = os.stat(step.parent).st_mtime_ns
+    step.write_bytes(PNG + b"new")                                          # overwritten by this run
+    os.utime(step.parent, ns=(mtime_dir, mtime_dir))                        # dir mtime unchanged
+    res = mgr.apply(RetentionPolicy(days=2, runs=None, size=None, loose=5), grace_s=0)
+    assert res["deleted"] == [old]
+    assert not (tmp_path / "reports" / f"report_{old}.html").exists()
+    assert step.read_bytes() == PNG + b"new"
+    assert mgr.files["artifacts/test_x/step_01.png"][2] != old
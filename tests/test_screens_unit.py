@@ -0,0 +1,75 @@
+from types import SimpleNamespace
+import numpy as np
+import pytest
+from simpad_automation.core import screens
+from simpad_automation.core.reporter import step
+from simpad_automation.core.screens import ScreenLibrary, fingerprint
+
+
+def _screen(seed, h=640, w=480):
+    rnd = np.random.default_rng(seed)
+    img = np.zeros((h, w, 3), np.uint8)
+    for _ in range(6):  # a few flat panels/buttons per screen
+        x, y = rnd.integers(0, w - 80), rnd.integers(0, h - 80)
+        img[y:y + 80, x:x + 120] = rnd.integers(40, 255, size=3)
+    return img
+
+
+@pytest.mark.noreport
+def test_identify_picks_recorded_screen_with_margin(tmp_path):
+    lib = ScreenLibrary()
+    for i, name in enumerate(["home", "hr_slider", "volume"]):
+        lib.add(name, _screen(i))
+    # brightness shift + noise must not change the answer
+    probe = np.clip(_screen(1).astype(int) + 20 + np.random.default_rng(9).integers(-8, 8, (640, 480, 3)), 0, 255)
+    m = lib.identify(probe.astype(np.uint8))
+    assert m.name == "hr_slider"
+    assert m.margin > 0.2
+
+    lib2 = ScreenLibrary.load(lib.save(tmp_path / "screens.npz"))
+    assert lib2.identify(_screen(2)).name == "volume"
+
+
+@pytest.mark.noreport
+def test_unknown_screen_returns_none():
+    lib = ScreenLibrary()
+    lib.add("home", _screen(0))
+    assert lib.identify(_screen(5), max_distance=0.3).name is None
+    assert fingerprint(_screen(0)).shape == (32 * 32,)
+
+
+@pytest.mark.noreport
+def test_expect_screen_skips_unrecorded_unless_strict_and_records_on_request(tmp_path, monkeypatch):
+    lib = ScreenLibrary(path=tmp_path / "screens.npz")
+    monkeypatch.setattr(screens, "default_library", lambda: lib)
+    monkeypatch.setattr(screens, "capture_client_bgr", lambda hwnd: _screen(3))
+    monkeypatch.delenv("PYTEST_XDIST_WORKER", raising=False)
+    request = SimpleNamespace(node=SimpleNamespace(nodeid="t::x"))
+    monkeypatch.delenv("SIMPAD_SCREENS", raising=False)
+    with step(request, "Open HR slider", hwnd=1, expect_screen="hr_slider"):
+        pass
+    assert request.node._steps[0]["screen"] == "hr_slider (not in the screen library, not checked)"
+    monkeypatch.setenv("SIMPAD_SCREENS", "strict")
+    with pytest.raises(AssertionError, match="not in the screen library"):
+        with step(request, "Open HR slider", hwnd=1, expect_screen="hr_slider"):
+            pass
+    assert request.node._steps[1]["status"] == "failed"
+
+    monkeypatch.setenv("SIMPAD_SCREENS", "record")
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw1")               # not the recording worker
+    with step(request, "Open HR slider", hwnd=1, expect_screen="hr_slider"):
+        pass
+    assert not (tmp_path / "screens.npz").exists()
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw0")
+    with step(request, "Open HR slider", hwnd=1, expect_screen="hr_slider"):
+        pass
+    assert ScreenLibrary.load(tmp_path / "screens.npz").screens() == ["hr_slider"]
+    assert [p.name for p in tmp_path.iterdir()] == ["screens.npz"]   # no temp file left
+    assert not screens.record_screen(1, "hr_slider", lib)          # same screen again: nothing added
+    with pytest.raises(AssertionError, match="shows the recorded screen 'hr_slider'"):
+        screens.record_screen(1, "volume", lib)                     # wrong navigation: refused
+
+    monkeypatch.setenv("SIMPAD_SCREENS", "check")
+    with step(request, "Open HR slider", hwnd=1, expect_screen="hr_slider"):
+        pass
+    assert request.node._steps[-1]["screen"].startswith("hr_slider (d=0.000")
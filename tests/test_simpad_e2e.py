@@ -9,13 +9,13 @@ if sys.platform != "win32":
     pytest.skip("Windows desktop required for UI tests", allow_module_level=True)
 
 import time
-from pathlib import Path
 import win32gui
 
 from simpad_automation.core.window import click_relative, drag_relative, ensure_focus, get_client_rect
 from simpad_automation.core.input import type_text
 from simpad_automation.core.ocr import read_hr_value
 from simpad_automation.core.reporter import step
+from simpad_automation.core.workers import artifacts_root
 from simpad_automation.ui import controls as ui
 
 
@@ -29,18 +29,18 @@ def test_full_simpad_e2e_with_verification(app_ctx, request):
     process, hwnd = app_ctx  # launched by fixture
     print("[DEBUG] HWND:", hwnd, "| Title:", win32gui.GetWindowText(hwnd))
 
-    artifacts = Path("artifacts") / "test_full_simpad_e2e_with_verification"
+    artifacts = artifacts_root() / "test_full_simpad_e2e_with_verification"
     artifacts.mkdir(parents=True, exist_ok=True)
     rect = get_client_rect(hwnd)
 
     # ---------------------- BASIC NAVIGATION ----------------------
-    with step(request, "Open Manual Mode", hwnd, artifacts):
+    with step(request, "Open Manual Mode", hwnd, artifacts, expect_screen="manual_mode"):
         click_relative(hwnd, *ui.MANUAL_MODE); time.sleep(0.3)
 
-    with step(request, "Open Standardized Patient", hwnd, artifacts):
+    with step(request, "Open Standardized Patient", hwnd, artifacts, expect_screen="patient_list"):
         click_relative(hwnd, *ui.STANDARDIZED_PATIENT); time.sleep(3.0)
 
-    with step(request, "Select Healthy", hwnd, artifacts):
+    with step(request, "Select Healthy", hwnd, artifacts, expect_screen="session_form"):
         click_relative(hwnd, *ui.HEALTHY); time.sleep(0.3)
 
     # ---------------------- NAME SESSION --------------------------
@@ -54,7 +54,7 @@ def test_full_simpad_e2e_with_verification(app_ctx, request):
         ensure_focus(hwnd, *ui.OVERLAY_FOCUS); time.sleep(0.15)
 
     with step(request, "Type session name", hwnd, artifacts):
-        type_text("Test Automation session", interval=0.03); time.sleep(0.25)
+        type_text("Test Automation session", interval=0.03, hwnd=hwnd); time.sleep(0.25)
 
     with step(request, "Confirm name (OK small)", hwnd, artifacts):
         click_relative(hwnd, *ui.OK_BUTTON_SMALL); time.sleep(0.5)
@@ -70,7 +70,7 @@ def test_full_simpad_e2e_with_verification(app_ctx, request):
         ensure_focus(hwnd, *ui.OVERLAY_FOCUS); time.sleep(0.15)
 
     with step(request, "Type instructor", hwnd, artifacts):
-        type_text("test_instructor", interval=0.03); time.sleep(0.25)
+        type_text("test_instructor", interval=0.03, hwnd=hwnd); time.sleep(0.25)
 
     with step(request, "Confirm instructor (OK small)", hwnd, artifacts):
         click_relative(hwnd, *ui.OK_BUTTON_SMALL); time.sleep(0.4)
@@ -86,43 +86,43 @@ def test_full_simpad_e2e_with_verification(app_ctx, request):
         ensure_focus(hwnd, *ui.OVERLAY_FOCUS); time.sleep(0.15)
 
     with step(request, "Type participant #1", hwnd, artifacts):
-        type_text("test_participant", interval=0.03); time.sleep(0.25)
+        type_text("test_participant", interval=0.03, hwnd=hwnd); time.sleep(0.25)
 
     with step(request, "Confirm participant (OK small)", hwnd, artifacts):
         click_relative(hwnd, *ui.OK_BUTTON_SMALL); time.sleep(0.6)
 
     # ---------------------- SESSION OK / START --------------------
-    with step(request, "Confirm Session (OK large)", hwnd, artifacts):
+    with step(request, "Confirm Session (OK large)", hwnd, artifacts, expect_screen="session_ready"):
         click_relative(hwnd, *ui.OK_BUTTON_LARGE); time.sleep(0.4)
 
-    with step(request, "Press START", hwnd, artifacts):
+    with step(request, "Press START", hwnd, artifacts, expect_screen="main"):
         click_relative(hwnd, *ui.START_BUTTON); time.sleep(0.4)
 
     # ---------------------- HR VERIFY BEFORE ----------------------
     with step(request, "Verify HR baseline == 80", hwnd, artifacts):
-        hr_before = read_hr_value(hwnd, retries=4)
+        hr_before = read_hr_value(hwnd, retries=4, budget_ms=2000)
         print(f"[ASSERT] HR before = {hr_before}")
         assert hr_before == 80, f"Expected HR before == 80, got {hr_before}"
 
     # ---------------------- HR SCREEN (ADJUST) --------------------
-    with step(request, "Open HR slider", hwnd, artifacts):
+    with step(request, "Open HR slider", hwnd, artifacts, expect_screen="hr_slider"):
         click_relative(hwnd, *ui.HR_VALUE); time.sleep(0.3)
 
     with step(request, "Drag HR slider", hwnd, artifacts):
         drag_relative(hwnd, *ui.HR_SLIDER_START, *ui.HR_SLIDER_END, steps=10, duration=0.7)
         time.sleep(0.2)
 
-    with step(request, "Activate HR change", hwnd, artifacts):
+    with step(request, "Activate HR change", hwnd, artifacts, expect_screen="main"):
         click_relative(hwnd, *ui.ACTIVATE_BUTTON); time.sleep(0.6)
 
     # ---------------------- HR VERIFY AFTER -----------------------
     with step(request, "Verify HR after == 100", hwnd, artifacts):
-        hr_after = read_hr_value(hwnd, retries=4)
+        hr_after = read_hr_value(hwnd, retries=4, budget_ms=2000)
         print(f"[ASSERT] HR after = {hr_after}")
         assert hr_after == 100, f"Expected HR after == 100, got {hr_after}"
 
     # ---------------------- VOLUME SCREEN -------------------------
-    with step(request, "Open Volume screen", hwnd, artifacts):
+    with step(request, "Open Volume screen", hwnd, artifacts, expect_screen="volume"):
         click_relative(hwnd, *ui.VOLUME_BUTTON); time.sleep(0.5)
 
     for i in range(1, 10):
@@ -133,23 +133,23 @@ def test_full_simpad_e2e_with_verification(app_ctx, request):
             time.sleep(0.2)
 
     # ---------------------- MESSAGE SCREEN ------------------------
-    with step(request, "Go back from Volume", hwnd, artifacts):
+    with step(request, "Go back from Volume", hwnd, artifacts, expect_screen="main"):
         click_relative(hwnd, *ui.BACK_BUTTON); time.sleep(0.3)
 
-    with step(request, "Open Message screen", hwnd, artifacts):
+    with step(request, "Open Message screen", hwnd, artifacts, expect_screen="message"):
         click_relative(hwnd, *ui.MESSAGE_BUTTON); time.sleep(0.5)
 
     with step(request, "Select 'Coughing' message", hwnd, artifacts):
         click_relative(hwnd, *ui.COUGHING_BUTTON); time.sleep(0.3)
 
-    with step(request, "Back from Message screen", hwnd, artifacts):
+    with step(request, "Back from Message screen", hwnd, artifacts, expect_screen="main"):
         click_relative(hwnd, *ui.BACK_BUTTON); time.sleep(0.3)
 
     # ---------------------- END / QUIT ----------------------------
-    with step(request, "Open End menu", hwnd, artifacts):
+    with step(request, "Open End menu", hwnd, artifacts, expect_screen="end_menu"):
         click_relative(hwnd, *ui.END_BUTTON); time.sleep(0.4)
 
-    with step(request, "Quit session", hwnd, artifacts):
+    with step(request, "Quit session", hwnd, artifacts, expect_screen="home"):
         click_relative(hwnd, *ui.QUIT_BUTTON); time.sleep(0.4)
 
     print("[TEST DONE] SimPad full E2E scenario completed successfully.")
\ No newline at end of file
@@ -0,0 +1,53 @@
+import pytest
+from simpad_automation.core.slider import SliderControl, fit_line
+
+class _FakeSlider:
+    """Vertical track: 80 at y=0.584, 100 at y=0.519 (like the HR screen), integer steps, 30..200."""
+
+    def __init__(self, knob=0.584, gain=1.0):
+        self.y = knob
+        self.gain = gain          # != 1: the real track is not quite linear / the knob overshoots
+        self.drags = []
+
+    def value(self):
+        v = 80 + (0.584 - self.y) * (20 / 0.065)
+        v = 80 + (v - 80) * self.gain if v > 80 else v
+        return int(min(200, max(30, round(v))))
+
+    def drag(self, y0, y1):
+        self.drags.append((y0, y1))
+        self.y = y1
+
+def _control(sim, name):
+    ctl = SliderControl(name, sim.drag, sim.value, knob=0.584, probe=0.519)
+    ctl.reset()
+    return ctl
+
+@pytest.mark.noreport
+def test_first_use_probes_then_hits_target():
+    sim = _FakeSlider()
+    ctl = _control(sim, "t-linear")
+    res = ctl.set(137)
+    assert res.ok and sim.value() == 137
+    assert sim.drags[0] == (0.584, 0.519)          # the probe (old fixed drag)
+    assert res.drags <= 3 and res.moves[0][1] == 100
+
+@pytest.mark.noreport
+def test_sweep_reuses_mapping_and_corrects_nonlinear_track():
+    sim = _FakeSlider(gain=1.15)
+    ctl = _control(sim, "t-sweep")
+    for target in (60, 95, 120, 150, 180, 72):
+        res = SliderControl("t-sweep", sim.drag, sim.value, knob=0.584, probe=0.519).set(target)
+        assert res.ok, res.describe()
+        assert res.drags <= 1 + 3                  # one predicted drag + at most 3 corrections
+    assert len(sim.drags) < 6 * 2                  # mostly one drag per value once learned
+    assert ctl.set(72).drags == 0                  # already there: read only
+
+@pytest.mark.noreport
+def test_fit_line_and_unreachable_value():
+    a, b = fit_line([(0.584, 80), (0.519, 100)])
+    assert a + b * 0.5515 == pytest.approx(90)
+    assert fit_line([(0.5, 80), (0.5, 81)]) is None
+    sim = _FakeSlider()
+    res = _control(sim, "t-limit").set(260)        # above the slider's maximum
+    assert not res.ok and res.value == 200
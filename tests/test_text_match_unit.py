@@ -1,5 +1,6 @@
 import pytest
-from simpad_automation.core.verify import normalize_text, compare_tokens
+from difflib import SequenceMatcher
+from simpad_automation.core.verify import normalize_text, compare_tokens, _sim
 
 @pytest.mark.noreport
 def test_normalize_basic():
@@ -10,4 +11,29 @@ def test_normalize_basic():
 def test_compare_tokens_fuzzy_ok():
     target = "Unable to retrieve technical information"
     ocr = "Unable te retrieve technicalinformation"
-    assert compare_tokens(target, ocr, ok_ratio=0.7) is True
\ No newline at end of file
+    assert compare_tokens(target, ocr, ok_ratio=0.7) is True
+
+
+@pytest.mark.noreport
+def test_compare_tokens_rejects_missing_and_reordered_words():
+    target = "Please connect the device"
+    assert compare_tokens(target, "Please connect the devce", ok_ratio=0.8) is True
+    assert compare_tokens(target, "Please the device connect", ok_ratio=0.7) is False
+    assert compare_tokens("Heart rate", "Heart", ok_ratio=0.7) is False
+    assert compare_tokens("Heart rate", "Heartrate", ok_ratio=0.8) is True
+
+@pytest.mark.noreport
+def test_compare_tokens_recovers_from_noise_and_broken_words():
+    target = "Unable to retrieve technical information"
+    assert compare_tokens(target, "x Unable to retrieve technical information", ok_ratio=0.8) is True
+    assert compare_tokens(target, "Unable to re trieve technical information", ok_ratio=0.8) is True
+
+@pytest.mark.noreport
+def test_sim_loosens_only_transpositions_not_unrelated_words():
+    pairs = [("ndtot", "ndoit"), ("retreive", "retrieve"), ("devce", "device"),
+             ("battery", "network"), ("heart", "rate"), ("manual", "failed")]
+    for a, b in pairs:
+        assert _sim(a, b) >= SequenceMatcher(None, a, b).ratio()
+    assert SequenceMatcher(None, "ndtot", "ndoit").ratio() == 0.6 and _sim("ndtot", "ndoit") == 0.8
+    assert compare_tokens("Network mode", "Ntework mode", ok_ratio=0.8) is True     # swapped letters
+    assert all(_sim(a, b) < 0.62 for a, b in pairs[3:])                         # unrelated stay out
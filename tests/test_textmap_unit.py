@@ -0,0 +1,28 @@
+import pytest
+from simpad_automation.core.textmap import TextMap, Word, _words_from_data
+
+
+def _map(texts):
+    words = [Word(t, t, (0.1 * i, 0.3, 0.08, 0.04), 90.0, (1, 1, 1)) for i, t in enumerate(texts)]
+    return TextMap(words)
+
+
+@pytest.mark.noreport
+def test_text_map_answers_many_queries():
+    tm = _map(["Unable", "to", "retrieve", "technical", "information", "Error:", "-1", "OK"])
+    assert tm.contains_phrase("Unable to retrieve technical information")
+    assert tm.contains_phrase("OK")
+    assert not tm.contains_phrase("Battery low")
+    assert tm.contains_text("Error: -1")
+    box = tm.locate("retrieve technical")
+    assert box == pytest.approx((0.2, 0.3, 0.18, 0.04))
+
+
+@pytest.mark.noreport
+def test_words_from_data_maps_boxes_to_client_fractions():
+    data = {"text": ["", "Error"], "conf": [-1, 91], "left": [0, 36], "top": [0, 72],
+            "width": [0, 72], "height": [0, 36], "block_num": [1, 1], "par_num": [1, 1], "line_num": [1, 1]}
+    words = _words_from_data(data, (0.5, 0.25, 0.2, 0.1), (100, 200), scale=3.6)
+    assert len(words) == 1
+    assert words[0].norm == "Error"
+    assert words[0].box == pytest.approx((0.6, 0.35, 0.2, 0.05))
@@ -0,0 +1,24 @@
+import pytest
+from simpad_automation.core.timeseries import TimeSeriesRing
+
+@pytest.mark.noreport
+def test_ring_wraps_in_chronological_order():
+    ring = TimeSeriesRing(capacity=3)
+    for i in range(5):
+        ring.append(float(i), 80 + i, 90.0)
+    snap = ring.snapshot()
+    assert len(ring) == 3
+    assert list(snap["t"]) == [2.0, 3.0, 4.0]
+    assert list(snap["value"]) == [82, 83, 84]
+
+@pytest.mark.noreport
+def test_assert_reaches_and_monotonic():
+    ring = TimeSeriesRing()
+    for t, v in [(0.0, 80), (0.5, None), (1.0, 90), (1.5, 100), (2.5, 100)]:
+        ring.append(t, v)
+    assert ring.assert_reaches(100, within_s=2.0, since=0.0) == pytest.approx(1.5)
+    ring.assert_monotonic(since=0.0)
+    with pytest.raises(AssertionError):
+        ring.assert_reaches(100, within_s=1.0, since=0.0)
+    with pytest.raises(AssertionError):
+        ring.assert_monotonic(since=0.0, increasing=False)
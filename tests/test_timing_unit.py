@@ -0,0 +1,60 @@
+import time
+from pathlib import Path
+import numpy as np
+import pytest
+from simpad_automation.core import timing
+
+@pytest.mark.noreport
+def test_measure_response_latency_and_settle():
+    t = {}
+    def act():
+        t["act"] = time.perf_counter()
+    def grab():
+        if "act" not in t:
+            return np.zeros((40, 40), np.uint8)
+        dt = time.perf_counter() - t["act"]
+        img = np.zeros((40, 40), np.uint8)
+        if dt > 0.05:
+            img[:20] = 200                    # screen changes after ~50 ms ...
+        if dt > 0.10:
+            img[20:] = 200                    # ... and settles after ~100 ms
+        time.sleep(0.005)
+        return img
+    lat, settle = timing.measure_response(act, grab)
+    assert 0.04 < lat < 0.09 and 0.03 < settle < 0.09
+    assert timing.measure_response(lambda: None, lambda: np.zeros((8, 8), np.uint8), timeout=0.05) is None
+
+@pytest.mark.noreport
+def test_derive_profile_is_clamped_between_fast_and_safe():
+    quick = timing.derive_profile([0.001] * 5, [0.0] * 5)
+    assert quick.settle == timing.FAST.settle and quick.after_click == timing.FAST.after_click
+    mid = timing.derive_profile([0.12] * 5, [0.04] * 5, grab_s=0.02)
+    assert mid.after_click == pytest.approx(1.25 * 0.18, abs=1e-3) and mid.settle == 0.06
+    slow = timing.derive_profile([0.3] * 5, [0.3] * 5, grab_s=0.03)
+    assert slow.settle == timing.SAFE.settle                      # pre-click pacing never above safe
+    assert slow.after_click == pytest.approx(3 * timing.SAFE.after_click)
+    assert slow.name == "calibrated"
+
+@pytest.mark.noreport
+def test_profile_persistence_and_selection(tmp_path, monkeypatch):
+    monkeypatch.setenv("SIMPAD_TIMING_DIR", str(tmp_path))
+    monkeypatch.setattr(timing, "_current", None)
+    monkeypatch.setenv("SIMPAD_TIMING", "auto")
+    assert timing.current_timing() is timing.SAFE            # nothing calibrated yet
+    prof = timing.derive_profile([0.05] * 3, [0.05] * 3)
+    path = timing.save_profile(prof, {"samples": 3})
+    assert path.parent == tmp_path and timing.load_profile() == prof
+    monkeypatch.setattr(timing, "_current", None)
+    assert timing.current_timing() == prof
+    assert timing.use_timing("fast") is timing.FAST and timing.current_timing() is timing.FAST
+    with pytest.raises(ValueError):
+        timing.use_timing("turbo")
+
+@pytest.mark.noreport
+def test_profiles_default_to_the_user_folder_not_the_package(tmp_path, monkeypatch):
+    monkeypatch.delenv("SIMPAD_TIMING_DIR", raising=False)
+    monkeypatch.setenv("LOCALAPPDATA", str(tmp_path))
+    path = timing.host_profile_path("Bench-01")
+    assert path == tmp_path / "simpad_automation" / "timing" / "bench-01.json"
+    package = Path(timing.__file__).resolve().parents[1]
+    assert package not in path.resolve().parents
@@ -0,0 +1,23 @@
+import numpy as np
+import pytest
+from simpad_automation.core.vitals import _assign_rows, _stack_rows
+
+@pytest.mark.noreport
+def test_stack_rows_pads_to_widest_and_reports_spans():
+    a = np.full((10, 30), 255, np.uint8)
+    b = np.full((6, 50), 255, np.uint8)
+    canvas, spans = _stack_rows([a, b], gap=4, margin=2)
+    assert canvas.shape == (2 + 10 + 4 + 6 + 2, 2 + 50 + 2)
+    assert spans == [(2, 12), (16, 22)]
+    assert canvas[2:12, 2:32].min() == 255 and canvas[2:12, 32:].max() == 0   # black padding
+    assert canvas[12:16].max() == 0                                          # black gap
+
+@pytest.mark.noreport
+def test_assign_rows_groups_words_by_row_center():
+    spans = [(2, 12), (16, 22)]
+    data = {"text": ["1", "20", "7", "x", "5"],
+            "conf": [90, 70, "-1", 99, 80],
+            "top":  [2, 3, 15, 4, 40],
+            "height": [9, 8, 6, 6, 5]}
+    # row 0: "1" + "20" -> 120 (mean conf); row 1: "7" (conf -1 -> 0); "x" has no digit; "5" is below every row
+    assert _assign_rows(data, spans) == {0: (120, 80.0), 1: (7, 0.0)}
@@ -0,0 +1,43 @@
+import cv2
+import numpy as np
+import pytest
+from simpad_automation.core import wordseg
+from simpad_automation.core.inkbox import tighten
+
+def _roi(lines, scale=1.2, w=700, line_h=50):
+    img = np.full((line_h * len(lines) + 20, w, 3), 30, np.uint8)
+    for i, text in enumerate(lines):
+        cv2.putText(img, text, (30, 40 + i * line_h), cv2.FONT_HERSHEY_SIMPLEX, scale, (255, 255, 255), 2)
+    return tighten(img)[0]
+
+def _segment(img):
+    enhanced = wordseg.enhance(img)
+    return wordseg.segment_words(wordseg.text_mask(enhanced), enhanced)
+
+@pytest.mark.noreport
+@pytest.mark.parametrize("scale", [0.9, 1.2])
+def test_one_box_per_word_left_to_right(scale):
+    img = _roi(["Unable to retrieve technical information"], scale)
+    boxes = _segment(img)
+    assert len(boxes) == 5
+    assert [b.x for b in boxes] == sorted(b.x for b in boxes)
+    H, W = img.shape[:2]
+    assert all(0 <= b.x and b.x + b.w <= W and 0 <= b.y and b.y + b.h <= H for b in boxes)
+    crop = wordseg.word_crop(wordseg.enhance(img), boxes[0])
+    assert crop.shape[0] == pytest.approx(boxes[0].h * 3.8 * 1.8, abs=2)
+
+@pytest.mark.noreport
+def test_lines_in_reading_order_and_blank_roi():
+    boxes = _segment(_roi(["Heart rate", "alarm limit"]))
+    assert len(boxes) == 4
+    assert max(boxes[0].y + boxes[0].h, boxes[1].y + boxes[1].h) < min(boxes[2].y, boxes[3].y)
+    assert boxes[0].x < boxes[1].x and boxes[2].x < boxes[3].x
+    assert _segment(np.full((40, 200, 3), 30, np.uint8)) == []
+
+@pytest.mark.noreport
+def test_subpixel_gap_from_profile():
+    profile = np.array([0, 255, 255, 220, 0, 0, 0, 150, 255, 0], np.uint8)
+    runs = wordseg._runs(profile >= wordseg.THRESH)
+    assert runs.tolist() == [[1, 4], [8, 9]]
+    # threshold crossings: 35/220 px after column 3, 70/105 px before column 8
+    assert wordseg._subpixel_gaps(runs, profile)[0] == pytest.approx((8 - 70 / 105) - (3 + 35 / 220))
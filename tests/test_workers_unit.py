@@ -0,0 +1,33 @@
+import json
+import pytest
+from simpad_automation.core import workers
+
+
+@pytest.mark.noreport
+def test_artifacts_root_is_worker_scoped(monkeypatch):
+    monkeypatch.delenv("PYTEST_XDIST_WORKER", raising=False)
+    assert workers.artifacts_root().as_posix() == "artifacts"
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw3")
+    assert workers.artifacts_root().as_posix() == "artifacts/gw3"
+    assert workers.worker_index() == 3
+
+
+@pytest.mark.noreport
+def test_fragments_are_merged(tmp_path):
+    workers.write_fragment(workers.fragment_path(tmp_path, "T1", "gw0"),
+                           [{"nodeid": "b", "outcome": "passed", "duration": 2.0, "worker": "gw0"}])
+    workers.write_fragment(workers.fragment_path(tmp_path, "T1", "gw1"),
+                           [{"nodeid": "a", "outcome": "failed", "duration": 1.0, "worker": "gw1"}])
+    summary = json.loads(workers.merge_fragments(tmp_path, "T1").read_text(encoding="utf-8"))
+    assert [t["nodeid"] for t in summary["tests"]] == ["a", "b"]
+    assert summary["failed"] == 1
+    assert summary["workers"]["gw0"]["tests"] == 1
+
+
+@pytest.mark.noreport
+def test_tile_origin_does_not_overlap():
+    assert workers.tile_origin(0, 480, 700, 1920, 1080) == (0, 0)
+    assert workers.tile_origin(1, 480, 700, 1920, 1080) == (488, 0)
+    assert workers.tile_origin(2, 480, 700, 1920, 1080) == (976, 0)
+    with pytest.raises(RuntimeError, match="no free tile"):
+        workers.tile_origin(3, 480, 700, 1920, 1080)            # 3 columns, 1 row -> full